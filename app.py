@@ -3,8 +3,9 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_generator import get_latest_data, get_historical_data
-from utils.anomaly_detection import get_anomaly_status
+from utils.data_source import get_latest_data, get_historical_data
+from utils.downsample import downsample
+from utils.anomaly_detection import get_anomaly_status_batch
 
 # Set page configuration
 st.set_page_config(
@@ -28,11 +29,15 @@ st.sidebar.markdown("Use the sidebar to navigate between different sections of t
 # Get latest data for overview
 latest_data = get_latest_data()
 
+# Evaluate every system's status in one pass
+systems = ['electricity', 'water', 'sewage', 'banking']
+anomaly_status = dict(zip(systems, get_anomaly_status_batch(latest_data, systems)[:, -1]))
+
 # Create metrics row
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    electricity_anomaly = get_anomaly_status('electricity', latest_data)
+    electricity_anomaly = anomaly_status['electricity']
     electricity_color = "🟢" if electricity_anomaly == "Normal" else "🔴"
     st.metric(
         label=f"{electricity_color} Electricity System",
@@ -41,7 +46,7 @@ with col1:
     )
     
 with col2:
-    water_anomaly = get_anomaly_status('water', latest_data)
+    water_anomaly = anomaly_status['water']
     water_color = "🟢" if water_anomaly == "Normal" else "🔴"
     st.metric(
         label=f"{water_color} Water System",
@@ -50,7 +55,7 @@ with col2:
     )
     
 with col3:
-    sewage_anomaly = get_anomaly_status('sewage', latest_data)
+    sewage_anomaly = anomaly_status['sewage']
     sewage_color = "🟢" if sewage_anomaly == "Normal" else "🔴"
     st.metric(
         label=f"{sewage_color} Sewage System",
@@ -59,7 +64,7 @@ with col3:
     )
     
 with col4:
-    banking_anomaly = get_anomaly_status('banking', latest_data)
+    banking_anomaly = anomaly_status['banking']
     banking_color = "🟢" if banking_anomaly == "Normal" else "🔴"
     st.metric(
         label=f"{banking_color} Banking System",
@@ -81,6 +86,7 @@ health_scores = pd.DataFrame({
     'Sewage Health': historical_data['sewage']['health_score'],
     'Banking Health': historical_data['banking']['health_score']
 })
+health_scores = downsample(health_scores, ['Electricity Health', 'Water Health', 'Sewage Health', 'Banking Health'])
 
 health_scores_melted = pd.melt(
     health_scores, 
@@ -120,6 +126,7 @@ with col1:
         'load': historical_data['electricity']['load'],
         'anomaly': historical_data['electricity']['anomaly']
     })
+    electricity_anomalies = downsample(electricity_anomalies, 'load', keep='anomaly')
     
     fig_elec = px.scatter(
         electricity_anomalies,
@@ -152,6 +159,7 @@ with col2:
         'flow': historical_data['water']['flow'],
         'anomaly': historical_data['water']['anomaly']
     })
+    water_anomalies = downsample(water_anomalies, 'flow', keep='anomaly')
     
     fig_water = px.scatter(
         water_anomalies,
@@ -184,17 +192,17 @@ st.subheader("System Status Summary")
 status_data = {
     'System': ['Electricity', 'Water', 'Sewage', 'Banking'],
     'Status': [
-        get_anomaly_status('electricity', latest_data),
-        get_anomaly_status('water', latest_data),
-        get_anomaly_status('sewage', latest_data),
-        get_anomaly_status('banking', latest_data)
+        anomaly_status['electricity'],
+        anomaly_status['water'],
+        anomaly_status['sewage'],
+        anomaly_status['banking']
     ],
     'Quantum Encryption': ['Active', 'Active', 'Active', 'Active'],
     'Self-Healing': [
-        'Monitoring' if get_anomaly_status('electricity', latest_data) == 'Normal' else 'Active',
-        'Monitoring' if get_anomaly_status('water', latest_data) == 'Normal' else 'Active',
-        'Monitoring' if get_anomaly_status('sewage', latest_data) == 'Normal' else 'Active',
-        'Monitoring' if get_anomaly_status('banking', latest_data) == 'Normal' else 'Active'
+        'Monitoring' if anomaly_status['electricity'] == 'Normal' else 'Active',
+        'Monitoring' if anomaly_status['water'] == 'Normal' else 'Active',
+        'Monitoring' if anomaly_status['sewage'] == 'Normal' else 'Active',
+        'Monitoring' if anomaly_status['banking'] == 'Normal' else 'Active'
     ],
     'Last Update': ['Just now', 'Just now', 'Just now', 'Just now']
 }
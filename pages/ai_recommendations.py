@@ -3,8 +3,10 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_generator import get_latest_data, get_historical_data, get_detailed_data
-from utils.anomaly_detection import detect_anomalies, analyze_system_health
+from utils.data_source import get_latest_data, get_historical_data, get_detailed_data, get_training_reservoir
+from utils.anomaly_detection import ANOMALY_THRESHOLDS, score_anomalies, explain_anomalies, analyze_system_health
+from utils.forecasting import FORECAST_METHODS, forecast_all_systems, range_probability
+from utils.downsample import downsample
 
 st.set_page_config(
     page_title="QEAIMS - AI Recommendations",
@@ -35,9 +37,9 @@ with col1:
     # Time range selection
     time_range = st.selectbox(
         "Analysis Time Range:",
-        [6, 12, 24, 48],
+        [6, 12, 24, 48, 24 * 7, 24 * 30],
         index=2,
-        format_func=lambda x: f"Last {x} hours"
+        format_func=lambda x: f"Last {x} hours" if x <= 48 else f"Last {x // 24} days"
     )
     
     # Analysis depth
@@ -49,6 +51,19 @@ with col1:
         help="Higher values provide more detailed analysis but may take longer"
     )
     
+    # Methods used to explain anomalies and to forecast
+    attribution = st.radio(
+        "Anomaly Attribution:",
+        ["robust_z", "tree_path"],
+        format_func={"robust_z": "Robust z-score", "tree_path": "Isolation forest paths"}.get
+    )
+    
+    forecast_method = st.selectbox(
+        "Forecast Method:",
+        FORECAST_METHODS,
+        format_func=lambda method: method.replace("_", " ").title()
+    )
+    
     # Run analysis button
     run_analysis = st.button("Run AI Analysis")
     
@@ -91,6 +106,7 @@ with col2:
         with st.spinner(f"Running AI analysis on {system} system..."):
             # Get detailed data for the selected system
             detailed_data = get_detailed_data(system, hours=time_range)
+            reservoir = get_training_reservoir(system, hours=time_range)
             
             # Run anomaly detection
             if system == "electricity":
@@ -102,11 +118,12 @@ with col2:
             elif system == "banking":
                 anomaly_columns = ["transactions_per_second", "response_time_ms", "success_rate", "error_rate"]
             
-            # Detect anomalies
-            anomalies = detect_anomalies(detailed_data, columns=anomaly_columns)
+            # Score and detect anomalies
+            anomaly_scores = score_anomalies(detailed_data, columns=anomaly_columns, system=system, reservoir=reservoir)
+            anomalies = anomaly_scores.flags()
             
             # Analyze system health
-            health_analysis = analyze_system_health(detailed_data, system)
+            health_analysis = analyze_system_health(detailed_data, system, reservoir=reservoir)
             
             # Display analysis results
             st.subheader("AI Analysis Results")
@@ -238,18 +255,22 @@ with col2:
                 # Display anomaly count
                 st.warning(f"Detected {anomaly_count} anomalous data points out of {len(detailed_data)}")
                 
-                # Show example anomalies
-                st.dataframe(anomalous_data.head(5))
+                # Show the most anomalous events, ranked by score
+                worst_events = anomaly_scores.top_k(20)
+                st.write(f"**Worst {len(worst_events)} events**")
+                st.dataframe(detailed_data.loc[worst_events.index].assign(anomaly_score=worst_events.to_numpy()))
                 
                 # Generate time series plot with anomalies highlighted
                 primary_metric = anomaly_columns[0]  # Use the first metric as primary for visualization
+                chart_data = downsample(detailed_data.assign(detected=np.asarray(anomalies, dtype=bool)), primary_metric, keep='detected')
+                chart_anomalies = chart_data['detected'].to_numpy()
                 
                 fig = go.Figure()
                 
                 # Add normal data points
                 fig.add_trace(go.Scatter(
-                    x=detailed_data.loc[~anomalies, "timestamp"],
-                    y=detailed_data.loc[~anomalies, primary_metric],
+                    x=chart_data.loc[~chart_anomalies, "timestamp"],
+                    y=chart_data.loc[~chart_anomalies, primary_metric],
                     mode="lines",
                     name="Normal Data",
                     line=dict(color="blue")
@@ -257,8 +278,8 @@ with col2:
                 
                 # Add anomalous points
                 fig.add_trace(go.Scatter(
-                    x=detailed_data.loc[anomalies, "timestamp"],
-                    y=detailed_data.loc[anomalies, primary_metric],
+                    x=chart_data.loc[chart_anomalies, "timestamp"],
+                    y=chart_data.loc[chart_anomalies, primary_metric],
                     mode="markers",
                     name="Anomalies",
                     marker=dict(color="red", size=10)
@@ -277,18 +298,10 @@ with col2:
                 # Show contributing factors
                 st.subheader("Contributing Factors")
                 
-                # Determine which features are most associated with anomalies
-                feature_importance = {}
-                
-                for col in anomaly_columns:
-                    # Calculate the difference between anomalous and normal values
-                    normal_mean = detailed_data.loc[~anomalies, col].mean()
-                    anomaly_mean = detailed_data.loc[anomalies, col].mean()
-                    
-                    # Calculate the percentage difference
-                    pct_diff = abs((anomaly_mean - normal_mean) / normal_mean * 100)
-                    
-                    feature_importance[col] = pct_diff
+                # Attribute every anomalous point to its features at once and average the shares
+                contributions = explain_anomalies(detailed_data, anomaly_columns, anomalies, attribution=attribution, system=system,
+                                                  reservoir=reservoir)
+                feature_importance = (contributions.mean() * 100).to_dict()
                 
                 # Create a dataframe for the feature importance
                 importance_df = pd.DataFrame({
@@ -317,24 +330,55 @@ with col2:
             # Predictive insights section
             st.subheader("Predictive Insights")
             
-            # Simulate predictive analytics
+            # Forecast every system with the baseline models and show the selected one
             prediction_hours = 6
-            confidence_high = 90 - np.random.randint(0, 10)
-            confidence_med = 75 - np.random.randint(0, 15)
+            forecasts = forecast_all_systems(horizon_hours=prediction_hours)
+            primary_metric = anomaly_columns[0]
+            system_forecast = forecasts.get(system, pd.DataFrame(columns=["timestamp", "metric", "method", "forecast", "lower", "upper"]))
+            metric_forecast = system_forecast[(system_forecast["method"] == forecast_method) & (system_forecast["metric"] == primary_metric)]
             
-            # Generate forecast messages based on system status
-            if health_analysis["status"] == "Critical":
-                forecast = f"System conditions predicted to worsen in the next {prediction_hours} hours without intervention."
-                proba = np.random.randint(75, 96)
-                st.error(f"⚠️ {forecast} (Confidence: {proba}%)")
-            elif health_analysis["status"] == "Warning":
-                forecast = f"Conditions may stabilize within {prediction_hours} hours if recommended actions are taken."
-                proba = np.random.randint(60, 86)
-                st.warning(f"⚠️ {forecast} (Confidence: {proba}%)")
+            if not metric_forecast.empty:
+                recent = detailed_data.tail(96)
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(x=recent["timestamp"], y=recent[primary_metric], mode="lines", name="Observed", line=dict(color="blue")))
+                fig.add_trace(go.Scatter(
+                    x=np.concatenate([metric_forecast["timestamp"], metric_forecast["timestamp"][::-1]]),
+                    y=np.concatenate([metric_forecast["upper"], metric_forecast["lower"][::-1]]),
+                    fill="toself", fillcolor="rgba(255, 165, 0, 0.2)", line=dict(width=0), name="95% interval"
+                ))
+                fig.add_trace(go.Scatter(x=metric_forecast["timestamp"], y=metric_forecast["forecast"], mode="lines", name="Forecast", line=dict(color="orange", dash="dash")))
+                fig.update_layout(
+                    title=f"{primary_metric.replace('_', ' ').title()} - {prediction_hours} Hour Forecast",
+                    xaxis_title="Time",
+                    yaxis_title=primary_metric.replace('_', ' ').title()
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                
+                # Probability of the primary metric staying within its acceptable range over the horizon
+                low, high = ANOMALY_THRESHOLDS[system]["range"]
+                in_range = range_probability(metric_forecast, low, high)
+                # Slots without history (e.g. less than a day of data) have no forecast and no probability
+                known = np.isfinite(in_range)
+                worst = int(np.argmin(np.where(known, in_range, np.inf))) if known.any() else None
+                proba = int(round(in_range[worst] * 100)) if worst is not None else None
+                
+                if worst is None:
+                    st.info(f"ℹ️ Not enough history to estimate the {prediction_hours} hour outlook with this forecast method.")
+                elif in_range[worst] < 0.5:
+                    breach_time = pd.Timestamp(metric_forecast["timestamp"].iloc[worst]).strftime("%H:%M")
+                    forecast = f"{primary_metric.replace('_', ' ').title()} predicted to leave its acceptable range ({low}-{high}) around {breach_time}."
+                    st.error(f"⚠️ {forecast} (Probability of staying in range: {proba}%)")
+                elif health_analysis["status"] == "Critical":
+                    forecast = f"System conditions predicted to worsen in the next {prediction_hours} hours without intervention."
+                    st.error(f"⚠️ {forecast} (Probability of staying in range: {proba}%)")
+                elif in_range[worst] < 0.9:
+                    forecast = f"{primary_metric.replace('_', ' ').title()} may approach the limits of its acceptable range within {prediction_hours} hours."
+                    st.warning(f"⚠️ {forecast} (Probability of staying in range: {proba}%)")
+                else:
+                    forecast = f"System predicted to maintain normal operations for the next {prediction_hours} hours."
+                    st.info(f"ℹ️ {forecast} (Probability of staying in range: {proba}%)")
             else:
-                forecast = f"System predicted to maintain normal operations for the next {prediction_hours} hours."
-                proba = np.random.randint(85, 99)
-                st.info(f"ℹ️ {forecast} (Confidence: {proba}%)")
+                st.info("Not enough history to forecast this system")
             
             # Display completion message
             st.success("AI analysis complete!")
@@ -2,8 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_generator import get_detailed_data
+from utils.data_source import get_detailed_data, get_rollup_data, get_training_reservoir
 from utils.anomaly_detection import analyze_system_health
+from utils.downsample import downsample
+from utils.visualization import create_health_timeline_chart
 
 st.set_page_config(
     page_title="QEAIMS - Banking System",
@@ -31,6 +33,10 @@ else:
 
 # Get detailed banking data
 banking_data = get_detailed_data('banking', hours=hours)
+banking_reservoir = get_training_reservoir('banking', hours=hours)
+
+# Time-series charts read pre-aggregated rollups sized to the chart width
+chart_data = get_rollup_data('banking', hours=hours)
 
 # Create system health metrics at the top
 col1, col2, col3, col4 = st.columns(4)
@@ -81,7 +87,7 @@ with col4:
 st.subheader("System Health Analysis")
 
 # Run the health analysis
-health_analysis = analyze_system_health(banking_data, 'banking')
+health_analysis = analyze_system_health(banking_data, 'banking', reservoir=banking_reservoir)
 
 # Create columns for health score and status
 col1, col2 = st.columns(2)
@@ -116,6 +122,10 @@ with col2:
     for recommendation in health_analysis['recommendations']:
         st.write(f"- {recommendation}")
 
+# Health timeline heat strip, one cell per hour
+st.subheader("Health Timeline")
+st.plotly_chart(create_health_timeline_chart(banking_data, 'banking', reservoir=banking_reservoir), use_container_width=True)
+
 # Create tabs for different visualizations
 tab1, tab2, tab3 = st.tabs(["Transaction Monitoring", "Performance Metrics", "Anomaly Detection"])
 
@@ -123,7 +133,7 @@ with tab1:
     st.subheader("Transactions Per Second Over Time")
     
     fig = px.line(
-        banking_data, 
+        downsample(chart_data, 'transactions_per_second'), 
         x='timestamp', 
         y='transactions_per_second',
         title='Transaction Volume (TPS)',
@@ -190,7 +200,7 @@ with tab2:
     with col1:
         # Response time trend
         fig = px.line(
-            banking_data,
+            downsample(chart_data, 'response_time_ms'),
             x='timestamp',
             y='response_time_ms',
             title='Response Time Trend',
@@ -217,7 +227,7 @@ with tab2:
     with col2:
         # Success rate trend
         fig = px.line(
-            banking_data,
+            downsample(chart_data, 'success_rate'),
             x='timestamp',
             y='success_rate',
             title='Transaction Success Rate',
@@ -250,7 +260,7 @@ with tab2:
     with col1:
         # Error rate trend
         fig = px.line(
-            banking_data,
+            downsample(chart_data, 'error_rate'),
             x='timestamp',
             y='error_rate',
             title='Transaction Error Rate',
@@ -277,7 +287,7 @@ with tab2:
     with col2:
         # Security index trend
         fig = px.line(
-            banking_data,
+            downsample(chart_data, 'security_index'),
             x='timestamp',
             y='security_index',
             title='Security Index',
@@ -306,10 +316,11 @@ with tab3:
     
     # Create a combined view of metrics with anomalies highlighted
     anomaly_data = banking_data[banking_data['anomaly']]
+    anomaly_view = downsample(banking_data, ['transactions_per_second', 'response_time_ms'], keep='anomaly')
     
     # Transactions with anomalies highlighted
     fig = px.scatter(
-        banking_data,
+        anomaly_view,
         x='timestamp',
         y='transactions_per_second',
         color='anomaly',
@@ -319,7 +330,7 @@ with tab3:
     )
     
     # Add line connecting non-anomalous points
-    normal_data = banking_data[~banking_data['anomaly']]
+    normal_data = anomaly_view[~anomaly_view['anomaly']]
     fig.add_trace(
         go.Scatter(
             x=normal_data['timestamp'],
@@ -334,7 +345,7 @@ with tab3:
     
     # Response time with anomalies
     fig = px.scatter(
-        banking_data,
+        anomaly_view,
         x='timestamp',
         y='response_time_ms',
         color='anomaly',
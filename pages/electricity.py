@@ -2,8 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_generator import get_detailed_data
+from utils.data_source import get_detailed_data, get_rollup_data, get_training_reservoir
 from utils.anomaly_detection import analyze_system_health
+from utils.downsample import downsample
+from utils.visualization import create_health_timeline_chart
 
 st.set_page_config(
     page_title="QEAIMS - Electricity System",
@@ -31,6 +33,10 @@ else:
 
 # Get detailed electricity data
 electricity_data = get_detailed_data('electricity', hours=hours)
+electricity_reservoir = get_training_reservoir('electricity', hours=hours)
+
+# Time-series charts read pre-aggregated rollups sized to the chart width
+chart_data = get_rollup_data('electricity', hours=hours)
 
 # Create system health metrics at the top
 col1, col2, col3, col4 = st.columns(4)
@@ -79,7 +85,7 @@ with col4:
 st.subheader("System Health Analysis")
 
 # Run the health analysis
-health_analysis = analyze_system_health(electricity_data, 'electricity')
+health_analysis = analyze_system_health(electricity_data, 'electricity', reservoir=electricity_reservoir)
 
 # Create columns for health score and status
 col1, col2 = st.columns(2)
@@ -114,6 +120,10 @@ with col2:
     for recommendation in health_analysis['recommendations']:
         st.write(f"- {recommendation}")
 
+# Health timeline heat strip, one cell per hour
+st.subheader("Health Timeline")
+st.plotly_chart(create_health_timeline_chart(electricity_data, 'electricity', reservoir=electricity_reservoir), use_container_width=True)
+
 # Create tabs for different visualizations
 tab1, tab2, tab3 = st.tabs(["Load Monitoring", "Grid Stability Metrics", "Anomaly Detection"])
 
@@ -121,7 +131,7 @@ with tab1:
     st.subheader("Power Load Over Time")
     
     fig = px.line(
-        electricity_data, 
+        downsample(chart_data, 'load_mw'), 
         x='timestamp', 
         y='load_mw',
         title='Power Load (MW)',
@@ -188,7 +198,7 @@ with tab2:
     with col1:
         # Voltage trend
         fig = px.line(
-            electricity_data,
+            downsample(chart_data, 'voltage'),
             x='timestamp',
             y='voltage',
             title='Voltage Trend',
@@ -213,7 +223,7 @@ with tab2:
     with col2:
         # Frequency trend
         fig = px.line(
-            electricity_data,
+            downsample(chart_data, 'frequency'),
             x='timestamp',
             y='frequency',
             title='Frequency Trend',
@@ -237,7 +247,7 @@ with tab2:
     
     # Power factor trend
     fig = px.line(
-        electricity_data,
+        downsample(chart_data, 'power_factor'),
         x='timestamp',
         y='power_factor',
         title='Power Factor Trend',
@@ -263,7 +273,7 @@ with tab2:
     
     # Grid stability index
     fig = px.line(
-        electricity_data,
+        downsample(chart_data, 'grid_stability'),
         x='timestamp',
         y='grid_stability',
         title='Grid Stability Index',
@@ -277,10 +287,11 @@ with tab3:
     
     # Create a combined view of metrics with anomalies highlighted
     anomaly_data = electricity_data[electricity_data['anomaly']]
+    anomaly_view = downsample(electricity_data, 'load_mw', keep='anomaly')
     
     # Load with anomalies highlighted
     fig = px.scatter(
-        electricity_data,
+        anomaly_view,
         x='timestamp',
         y='load_mw',
         color='anomaly',
@@ -290,7 +301,7 @@ with tab3:
     )
     
     # Add line connecting non-anomalous points
-    normal_data = electricity_data[~electricity_data['anomaly']]
+    normal_data = anomaly_view[~anomaly_view['anomaly']]
     fig.add_trace(
         go.Scatter(
             x=normal_data['timestamp'],
@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import time
 from utils.data_generator import get_fault_simulation_data
+from utils.anomaly_detection import measure_recoveries
 from utils.network_graph import create_system_graph, simulate_fault, create_network_visualization
 
 st.set_page_config(
@@ -56,6 +57,9 @@ with col1:
         st.session_state.simulation_end_time = time.time() + (sim_duration * 60)
         st.session_state.fault_type = fault_type
         st.session_state.enable_healing = enable_healing
+        # Recovery durations measured once per run on the affected systems' health history
+        affected = fault_data['scenarios'][fault_type].get('affected_systems', [])
+        st.session_state.measured_recoveries = measure_recoveries(affected).dropna(subset=['recovery'])
         st.rerun()
 
 with col2:
@@ -458,6 +462,14 @@ if 'simulation_running' in st.session_state:
             # Add estimated time to recovery
             remaining_time = max(0, st.session_state.simulation_end_time - current_time)
             st.info(f"Estimated time to full recovery: {int(remaining_time/60)} minutes, {int(remaining_time%60)} seconds")
+            
+            # Recovery durations measured on the affected systems' health history when the run started
+            measured = st.session_state.measured_recoveries
+            if len(measured):
+                st.caption(f"Measured over the last 90 days: median recovery {measured['duration'].median()} "
+                           f"across {len(measured)} fault episodes of the affected systems")
+            else:
+                st.caption("No completed fault episodes of the affected systems in the last 90 days")
         else:
             st.warning("Self-healing capabilities are disabled. Manual intervention required for recovery.")
             st.button("Enable Self-Healing", on_click=lambda: st.session_state.update(enable_healing=True))
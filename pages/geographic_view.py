@@ -3,7 +3,8 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_generator import get_latest_data, get_fault_simulation_data
+from utils.data_generator import get_fault_simulation_data
+from utils.data_source import get_latest_data
 from utils.network_graph import simulate_fault
 
 st.set_page_config(
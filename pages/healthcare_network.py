@@ -4,7 +4,8 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import datetime
-from utils.data_generator import get_latest_data, get_historical_data
+from utils.data_source import get_latest_data, get_historical_data
+from utils.random_source import RandomSource
 
 st.set_page_config(
     page_title="QEAIMS - Healthcare Network",
@@ -15,8 +16,16 @@ st.set_page_config(
 st.title("Healthcare Network Monitoring")
 st.markdown("Track hospital operations, patient visitation, and road network performance for emergency services")
 
+# Root of the page's random streams, split into one named stream per consumer.
+# Within the hospital and road streams each date draws from its own child
+# (keyed by the date's ordinal), so a given day always shows the same values
+# without touching the global np.random state.
+DATA_SOURCE = RandomSource(20230101)
+STREAMS = DATA_SOURCE.spawn(['hospitals', 'roads', 'interactive'])
+rng = STREAMS['interactive'].generator()
+
 # Generate simulated healthcare data
-def generate_healthcare_data(days=7, hospitals=5):
+def generate_healthcare_data(days=7, hospitals=5, source=STREAMS['hospitals']):
     """Generate simulated healthcare data for demonstration."""
     today = datetime.datetime.now().date()
     dates = [(today - datetime.timedelta(days=i)) for i in range(days)]
@@ -30,44 +39,40 @@ def generate_healthcare_data(days=7, hospitals=5):
         "Community Medical Center"
     ][:hospitals]
 
-    data = []
-    for date in dates:
-        for hospital in hospital_names:
-            # Generate consistent but variable data
-            seed_val = int(f"{date.year}{date.month:02d}{date.day:02d}{hospital_names.index(hospital)}")
-            np.random.seed(seed_val)
-            
-            # Base metrics with daily variation
-            patient_visits = np.random.randint(100, 300)
-            emergency_visits = np.random.randint(30, 80)
-            avg_wait_time = np.random.randint(15, 90)
-            power_usage = np.random.randint(80, 120)
-            water_usage = np.random.randint(70, 130)
-            occupancy_rate = np.random.randint(60, 95)
-            ambulance_trips = np.random.randint(10, 35)
-            
-            # Weekend adjustment (fewer scheduled visits, similar emergency visits)
-            if date.weekday() >= 5:  # Weekend
-                patient_visits = int(patient_visits * 0.7)
-            
-            # Add to dataset
-            data.append({
-                "date": date,
-                "hospital": hospital,
-                "patient_visits": patient_visits,
-                "emergency_visits": emergency_visits,
-                "avg_wait_time": avg_wait_time,
-                "power_usage": power_usage,
-                "water_usage": water_usage,
-                "occupancy_rate": occupancy_rate,
-                "ambulance_trips": ambulance_trips,
-                "day_of_week": date.strftime("%A")
-            })
-    
-    return pd.DataFrame(data)
+    # Metric ranges as [low, high)
+    metrics = {
+        "patient_visits": (100, 300),
+        "emergency_visits": (30, 80),
+        "avg_wait_time": (15, 90),
+        "power_usage": (80, 120),
+        "water_usage": (70, 130),
+        "occupancy_rate": (60, 95),
+        "ambulance_trips": (10, 35)
+    }
+    low = np.array([bounds[0] for bounds in metrics.values()])[:, None]
+    high = np.array([bounds[1] for bounds in metrics.values()])[:, None]
+
+    # Generate consistent but variable data: one draw per date covers every metric of every hospital
+    values = np.stack([
+        source.child(date.toordinal()).generator().integers(low, high, size=(len(metrics), len(hospital_names)))
+        for date in dates
+    ])
+
+    # Weekend adjustment (fewer scheduled visits, similar emergency visits)
+    weekend = np.array([date.weekday() >= 5 for date in dates])
+    values[weekend, 0] = (values[weekend, 0] * 0.7).astype(int)
+
+    data = pd.DataFrame({
+        "date": np.repeat(dates, len(hospital_names)),
+        "hospital": np.tile(hospital_names, len(dates)),
+        **{metric: values[:, i].ravel() for i, metric in enumerate(metrics)},
+        "day_of_week": np.repeat([date.strftime("%A") for date in dates], len(hospital_names))
+    })
+
+    return data
 
 # Generate road network data
-def generate_road_network_data(days=7, routes=8):
+def generate_road_network_data(days=7, routes=8, source=STREAMS['roads']):
     """Generate simulated road network data for emergency routes."""
     today = datetime.datetime.now().date()
     dates = [(today - datetime.timedelta(days=i)) for i in range(days)]
@@ -84,50 +89,58 @@ def generate_road_network_data(days=7, routes=8):
         "Route 8: Hospital to Airport"
     ][:routes]
 
-    data = []
+    # Time (minutes), traffic metrics and weather adjustments as [low, high)
+    ranges = {
+        "travel_time": (10, 45),
+        "traffic_density": (20, 95),
+        "emergency_response_time": (5, 25),
+        "incidents": (0, 5),
+        "road_condition": (70, 100),
+        "rain_condition_drop": (5, 15),
+        "severe_condition_drop": (15, 30),
+        "severe_incidents": (1, 3)
+    }
+    low = np.array([bounds[0] for bounds in ranges.values()])[:, None]
+    high = np.array([bounds[1] for bounds in ranges.values()])[:, None]
+
+    # Generate consistent but variable data, one stream per date
+    draws = []
+    weather_draws = []
     for date in dates:
-        for route in route_names:
-            # Generate consistent but variable data
-            seed_val = int(f"{date.year}{date.month:02d}{date.day:02d}{route_names.index(route)}")
-            np.random.seed(seed_val)
-            
-            # Time (minutes) and traffic metrics
-            travel_time = np.random.randint(10, 45)
-            traffic_density = np.random.randint(20, 95)
-            emergency_response_time = np.random.randint(5, 25)
-            incidents = np.random.randint(0, 5)
-            road_condition = np.random.randint(70, 100)
-            
-            # Rush hour adjustment
-            if date.weekday() < 5:  # Weekday
-                # Add rush hour pattern for weekdays
-                travel_time = int(travel_time * 1.3)
-                traffic_density = int(min(traffic_density * 1.4, 100))
-            
-            # Weather effect (random for demonstration)
-            weather_impact = np.random.choice([0, 0, 0, 1, 2])  # 0=normal, 1=rain, 2=severe
-            if weather_impact == 1:  # Rain
-                travel_time = int(travel_time * 1.2)
-                road_condition -= np.random.randint(5, 15)
-            elif weather_impact == 2:  # Severe weather
-                travel_time = int(travel_time * 1.5)
-                road_condition -= np.random.randint(15, 30)
-                incidents += np.random.randint(1, 3)
-            
-            # Add to dataset
-            data.append({
-                "date": date,
-                "route": route,
-                "travel_time": travel_time,
-                "traffic_density": traffic_density,
-                "emergency_response_time": emergency_response_time,
-                "incidents": incidents,
-                "road_condition": road_condition,
-                "weather_impact": ["Normal", "Rain", "Severe"][weather_impact],
-                "day_of_week": date.strftime("%A")
-            })
-    
-    return pd.DataFrame(data)
+        date_rng = source.child(date.toordinal()).generator()
+        draws.append(date_rng.integers(low, high, size=(len(ranges), len(route_names))))
+        weather_draws.append(date_rng.choice([0, 0, 0, 1, 2], size=len(route_names)))  # 0=normal, 1=rain, 2=severe
+    draws = np.stack(draws)
+    weather_impact = np.stack(weather_draws)
+    travel_time, traffic_density, emergency_response_time, incidents, road_condition = draws[:, :5].transpose(1, 0, 2)
+    rain_drop, severe_drop, severe_incidents = draws[:, 5:].transpose(1, 0, 2)
+
+    # Rush hour adjustment for weekdays
+    weekday = np.array([date.weekday() < 5 for date in dates])[:, None]
+    travel_time = np.where(weekday, (travel_time * 1.3).astype(int), travel_time)
+    traffic_density = np.where(weekday, np.minimum(traffic_density * 1.4, 100).astype(int), traffic_density)
+
+    # Weather effect (random for demonstration)
+    rain = weather_impact == 1
+    severe = weather_impact == 2
+    travel_time = np.where(rain, (travel_time * 1.2).astype(int), travel_time)
+    travel_time = np.where(severe, (travel_time * 1.5).astype(int), travel_time)
+    road_condition = road_condition - np.where(rain, rain_drop, 0) - np.where(severe, severe_drop, 0)
+    incidents = incidents + np.where(severe, severe_incidents, 0)
+
+    data = pd.DataFrame({
+        "date": np.repeat(dates, len(route_names)),
+        "route": np.tile(route_names, len(dates)),
+        "travel_time": travel_time.ravel(),
+        "traffic_density": traffic_density.ravel(),
+        "emergency_response_time": emergency_response_time.ravel(),
+        "incidents": incidents.ravel(),
+        "road_condition": road_condition.ravel(),
+        "weather_impact": np.array(["Normal", "Rain", "Severe"])[weather_impact.ravel()],
+        "day_of_week": np.repeat([date.strftime("%A") for date in dates], len(route_names))
+    })
+
+    return data
 
 # Generate data
 healthcare_df = generate_healthcare_data(days=14)
@@ -179,7 +192,7 @@ with tab1:
         st.metric("Water Supply", water_status)
         
         # Backup system status
-        backup_power = np.random.randint(92, 101)
+        backup_power = rng.integers(92, 101)
         st.metric("Backup Power Capacity", f"{backup_power}%")
         
         st.markdown("---")
@@ -488,7 +501,7 @@ with tab3:
         
         if simulate_button:
             # Basic simulation logic
-            base_time = np.random.randint(8, 15)  # Base minutes
+            base_time = rng.integers(8, 15)  # Base minutes
             
             # Time of day factor
             tod_factors = {
@@ -521,8 +534,8 @@ with tab3:
                 
                 # Suggest alternatives if available
                 if len(selected_routes) > 1:
-                    alt_route = np.random.choice([r for r in selected_routes if r != selected_route])
-                    alt_time = round(sim_time * np.random.uniform(0.6, 0.9), 1)
+                    alt_route = rng.choice([r for r in selected_routes if r != selected_route])
+                    alt_time = round(sim_time * rng.uniform(0.6, 0.9), 1)
                     st.info(f"🔄 Suggested Alternative: {alt_route} ({alt_time} minutes)")
     
     with col2:
@@ -3,8 +3,8 @@ import pandas as pd
 import numpy as np
 import networkx as nx
 import plotly.graph_objects as go
-from utils.data_generator import get_latest_data
-from utils.anomaly_detection import get_anomaly_status
+from utils.data_source import get_latest_data
+from utils.anomaly_detection import get_anomaly_status_batch
 from utils.network_graph import create_system_graph, update_graph_status, create_network_visualization
 
 st.set_page_config(
@@ -19,13 +19,9 @@ st.markdown("Interactive visualization of the QEAIMS integrated utility network"
 # Get latest data and anomaly status
 latest_data = get_latest_data()
 
-# Create anomaly status dictionary
-anomaly_status = {
-    'electricity': get_anomaly_status('electricity', latest_data),
-    'water': get_anomaly_status('water', latest_data),
-    'sewage': get_anomaly_status('sewage', latest_data),
-    'banking': get_anomaly_status('banking', latest_data)
-}
+# Create anomaly status dictionary, evaluating every system in one pass
+systems = ['electricity', 'water', 'sewage', 'banking']
+anomaly_status = dict(zip(systems, get_anomaly_status_batch(latest_data, systems)[:, -1]))
 
 # Create network graph
 system_graph = create_system_graph()
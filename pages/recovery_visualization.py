@@ -5,6 +5,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import time
 from utils.data_generator import get_fault_simulation_data
+from utils.anomaly_detection import CHANGE_POINT_METHODS, measure_recoveries
 from utils.network_graph import create_system_graph, simulate_fault, create_network_visualization
 
 st.set_page_config(
@@ -93,6 +94,26 @@ with col2:
     # Recovery timeline chart
     timeline_chart = st.empty()
     
+    # Fault episodes measured on the health score history by change-point detection
+    with st.expander("Measured Recovery History (last 90 days)"):
+        change_point_method = st.selectbox(
+            "Change-point method:",
+            CHANGE_POINT_METHODS,
+            format_func=lambda method: {"cusum": "CUSUM", "page_hinkley": "Page-Hinkley", "pelt": "PELT (offline)"}[method]
+        )
+        episodes = measure_recoveries(method=change_point_method)
+        if len(episodes):
+            summary = episodes.groupby('system').agg(
+                episodes=('onset', 'size'),
+                median_recovery=('duration', 'median'),
+                longest_recovery=('duration', 'max'),
+                mean_depth=('depth', 'mean')
+            )
+            st.dataframe(summary)
+            st.dataframe(episodes.sort_values('onset', ascending=False))
+        else:
+            st.info("No fault episodes detected in the health score history")
+    
     # Recovery details
     recovery_details = st.expander("Recovery Process Details")
     with recovery_details:
@@ -2,8 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_generator import get_detailed_data
+from utils.data_source import get_detailed_data, get_rollup_data, get_training_reservoir
 from utils.anomaly_detection import analyze_system_health
+from utils.downsample import downsample
+from utils.visualization import create_health_timeline_chart
 
 st.set_page_config(
     page_title="QEAIMS - Sewage System",
@@ -31,6 +33,10 @@ else:
 
 # Get detailed sewage data
 sewage_data = get_detailed_data('sewage', hours=hours)
+sewage_reservoir = get_training_reservoir('sewage', hours=hours)
+
+# Time-series charts read pre-aggregated rollups sized to the chart width
+chart_data = get_rollup_data('sewage', hours=hours)
 
 # Create system health metrics at the top
 col1, col2, col3, col4 = st.columns(4)
@@ -80,7 +86,7 @@ with col4:
 st.subheader("System Health Analysis")
 
 # Run the health analysis
-health_analysis = analyze_system_health(sewage_data, 'sewage')
+health_analysis = analyze_system_health(sewage_data, 'sewage', reservoir=sewage_reservoir)
 
 # Create columns for health score and status
 col1, col2 = st.columns(2)
@@ -115,6 +121,10 @@ with col2:
     for recommendation in health_analysis['recommendations']:
         st.write(f"- {recommendation}")
 
+# Health timeline heat strip, one cell per hour
+st.subheader("Health Timeline")
+st.plotly_chart(create_health_timeline_chart(sewage_data, 'sewage', reservoir=sewage_reservoir), use_container_width=True)
+
 # Create tabs for different visualizations
 tab1, tab2, tab3 = st.tabs(["Flow Monitoring", "Treatment Metrics", "Anomaly Detection"])
 
@@ -122,7 +132,7 @@ with tab1:
     st.subheader("Sewage Flow Over Time")
     
     fig = px.line(
-        sewage_data, 
+        downsample(chart_data, 'flow_kl_h'), 
         x='timestamp', 
         y='flow_kl_h',
         title='Sewage Flow (kL/h)',
@@ -189,7 +199,7 @@ with tab2:
     with col1:
         # Treatment efficiency trend
         fig = px.line(
-            sewage_data,
+            downsample(chart_data, 'treatment_efficiency'),
             x='timestamp',
             y='treatment_efficiency',
             title='Treatment Efficiency Trend',
@@ -216,7 +226,7 @@ with tab2:
     with col2:
         # Contaminant level trend
         fig = px.line(
-            sewage_data,
+            downsample(chart_data, 'contaminant_level'),
             x='timestamp',
             y='contaminant_level',
             title='Contaminant Level Trend',
@@ -249,7 +259,7 @@ with tab2:
     with col1:
         # Dissolved oxygen trend
         fig = px.line(
-            sewage_data,
+            downsample(chart_data, 'dissolved_oxygen'),
             x='timestamp',
             y='dissolved_oxygen',
             title='Dissolved Oxygen Levels',
@@ -276,7 +286,7 @@ with tab2:
     with col2:
         # Methane level trend
         fig = px.line(
-            sewage_data,
+            downsample(chart_data, 'methane_level'),
             x='timestamp',
             y='methane_level',
             title='Methane Levels',
@@ -305,10 +315,11 @@ with tab3:
     
     # Create a combined view of metrics with anomalies highlighted
     anomaly_data = sewage_data[sewage_data['anomaly']]
+    anomaly_view = downsample(sewage_data, ['flow_kl_h', 'treatment_efficiency'], keep='anomaly')
     
     # Flow with anomalies highlighted
     fig = px.scatter(
-        sewage_data,
+        anomaly_view,
         x='timestamp',
         y='flow_kl_h',
         color='anomaly',
@@ -318,7 +329,7 @@ with tab3:
     )
     
     # Add line connecting non-anomalous points
-    normal_data = sewage_data[~sewage_data['anomaly']]
+    normal_data = anomaly_view[~anomaly_view['anomaly']]
     fig.add_trace(
         go.Scatter(
             x=normal_data['timestamp'],
@@ -333,7 +344,7 @@ with tab3:
     
     # Treatment efficiency with anomalies
     fig = px.scatter(
-        sewage_data,
+        anomaly_view,
         x='timestamp',
         y='treatment_efficiency',
         color='anomaly',
@@ -2,8 +2,10 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_generator import get_detailed_data
+from utils.data_source import get_detailed_data, get_rollup_data, get_training_reservoir
 from utils.anomaly_detection import analyze_system_health
+from utils.downsample import downsample
+from utils.visualization import create_health_timeline_chart
 
 st.set_page_config(
     page_title="QEAIMS - Water System",
@@ -31,6 +33,10 @@ else:
 
 # Get detailed water data
 water_data = get_detailed_data('water', hours=hours)
+water_reservoir = get_training_reservoir('water', hours=hours)
+
+# Time-series charts read pre-aggregated rollups sized to the chart width
+chart_data = get_rollup_data('water', hours=hours)
 
 # Create system health metrics at the top
 col1, col2, col3, col4 = st.columns(4)
@@ -79,7 +85,7 @@ with col4:
 st.subheader("System Health Analysis")
 
 # Run the health analysis
-health_analysis = analyze_system_health(water_data, 'water')
+health_analysis = analyze_system_health(water_data, 'water', reservoir=water_reservoir)
 
 # Create columns for health score and status
 col1, col2 = st.columns(2)
@@ -114,6 +120,10 @@ with col2:
     for recommendation in health_analysis['recommendations']:
         st.write(f"- {recommendation}")
 
+# Health timeline heat strip, one cell per hour
+st.subheader("Health Timeline")
+st.plotly_chart(create_health_timeline_chart(water_data, 'water', reservoir=water_reservoir), use_container_width=True)
+
 # Create tabs for different visualizations
 tab1, tab2, tab3 = st.tabs(["Flow Monitoring", "Water Quality Metrics", "Anomaly Detection"])
 
@@ -121,7 +131,7 @@ with tab1:
     st.subheader("Water Flow Over Time")
     
     fig = px.line(
-        water_data, 
+        downsample(chart_data, 'flow_kl_h'), 
         x='timestamp', 
         y='flow_kl_h',
         title='Water Flow (kL/h)',
@@ -183,7 +193,7 @@ with tab1:
     st.subheader("Pressure Monitoring")
     
     fig = px.line(
-        water_data,
+        downsample(chart_data, 'pressure_bar'),
         x='timestamp',
         y='pressure_bar',
         title='Water Pressure (bar)',
@@ -214,7 +224,7 @@ with tab2:
     with col1:
         # pH level trend
         fig = px.line(
-            water_data,
+            downsample(chart_data, 'ph_level'),
             x='timestamp',
             y='ph_level',
             title='pH Level Trend',
@@ -239,7 +249,7 @@ with tab2:
     with col2:
         # Turbidity trend
         fig = px.line(
-            water_data,
+            downsample(chart_data, 'turbidity_ntu'),
             x='timestamp',
             y='turbidity_ntu',
             title='Turbidity Trend',
@@ -267,7 +277,7 @@ with tab2:
     st.subheader("Chlorine Levels")
     
     fig = px.line(
-        water_data,
+        downsample(chart_data, 'chlorine_ppm'),
         x='timestamp',
         y='chlorine_ppm',
         title='Chlorine Levels (ppm)',
@@ -294,10 +304,11 @@ with tab3:
     
     # Create a combined view of metrics with anomalies highlighted
     anomaly_data = water_data[water_data['anomaly']]
+    anomaly_view = downsample(water_data, 'flow_kl_h', keep='anomaly')
     
     # Flow with anomalies highlighted
     fig = px.scatter(
-        water_data,
+        anomaly_view,
         x='timestamp',
         y='flow_kl_h',
         color='anomaly',
@@ -307,7 +318,7 @@ with tab3:
     )
     
     # Add line connecting non-anomalous points
-    normal_data = water_data[~water_data['anomaly']]
+    normal_data = anomaly_view[~anomaly_view['anomaly']]
     fig.add_trace(
         go.Scatter(
             x=normal_data['timestamp'],
@@ -1,7 +1,79 @@
+import hashlib
+import math
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from sklearn.ensemble import IsolationForest
 import pandas as pd
 
+from utils.half_space_trees import HalfSpaceTrees
+from utils.health_rules import COMPILED_RULES, compile_rules
+from utils.model_registry import MODEL_REGISTRY
+from utils.streaming_detector import MAD_SCALE
+from utils.telemetry_cache import TelemetryCache
+from utils.training_sample import DEFAULT_SAMPLE_SIZE, training_sample
+from utils.data_source import STREAM_FLAGS, get_detailed_data, get_training_reservoir
+
+# Threshold table per system: primary metric field with its acceptable range, and minimum health score
+ANOMALY_THRESHOLDS = {
+    'electricity': {'metric': 'load', 'range': (350, 550), 'health_score': 80},      # Load in MW
+    'water': {'metric': 'flow', 'range': (900, 1500), 'health_score': 75},           # Flow in kL/h
+    'sewage': {'metric': 'flow', 'range': (700, 1200), 'health_score': 70},          # Flow in kL/h
+    'banking': {'metric': 'transactions', 'range': (1500, 3500), 'health_score': 85} # Transactions per second
+}
+
+# Status labels, indexed by the codes of the status matrix
+ANOMALY_STATUSES = np.array(['Unknown', 'Normal', 'Anomaly Detected'])
+
+def get_anomaly_status_batch(data, systems=None):
+    """
+    Determine the anomaly status of many systems over many timestamps at once.
+
+    The threshold table is applied to a (systems x timestamps) block in one
+    NumPy pass, so e.g. a whole history gets its status matrix from a single
+    call instead of one call per system and timestamp.
+
+    Args:
+        data (dict): System name to dict of field -> value or array of values, e.g. the
+            latest snapshot or historical data (missing fields count as 0); arrays of all
+            systems must have the same length
+        systems (list): Systems (rows) to evaluate, defaults to every system in ANOMALY_THRESHOLDS
+
+    Returns:
+        np.ndarray: (systems, timestamps) array of 'Normal', 'Anomaly Detected' or 'Unknown'
+    """
+    systems = list(ANOMALY_THRESHOLDS) if systems is None else list(systems)
+    known = np.array([bool(data.get(system)) and system in ANOMALY_THRESHOLDS for system in systems])
+    length = max((np.size(data[system].get(ANOMALY_THRESHOLDS[system]['metric'], 0))
+                  for system, ok in zip(systems, known) if ok), default=1)
+
+    # Stack every system's fields into (systems, timestamps) blocks and the table into columns
+    values = np.zeros((len(systems), length))
+    health = np.zeros((len(systems), length))
+    alarm = np.zeros((len(systems), length), dtype=bool)
+    bounds = np.zeros((len(systems), 3))
+    for row, system in enumerate(systems):
+        if not known[row]:
+            continue
+        table = ANOMALY_THRESHOLDS[system]
+        system_data = data[system]
+        fields = {field: np.asarray(system_data.get(field, default))
+                  for field, default in [(table['metric'], 0), ('health_score', 0), *((flag, False) for flag in STREAM_FLAGS)]}
+        # Scalars apply to every timestamp; arrays must cover all of them
+        for field, field_values in fields.items():
+            if field_values.ndim and field_values.shape != (length,):
+                raise ValueError(f"{system} {field} has {field_values.size} values, expected {length} (or a scalar)")
+        values[row] = fields[table['metric']]
+        health[row] = fields['health_score']
+        # Alarms raised by the source's streaming and online detectors
+        for flag in STREAM_FLAGS:
+            alarm[row] |= fields[flag].astype(bool)
+        bounds[row] = (*table['range'], table['health_score'])
+
+    anomalous = (values < bounds[:, [0]]) | (values > bounds[:, [1]]) | (health < bounds[:, [2]]) | alarm
+    codes = np.where(known[:, None], np.where(anomalous, 2, 1), 0)
+    return ANOMALY_STATUSES[codes]
+
 def get_anomaly_status(system, latest_data):
     """
     Determine if the current system state is anomalous.
@@ -11,78 +83,164 @@ def get_anomaly_status(system, latest_data):
         latest_data (dict): Dictionary containing the latest data from all systems
         
     Returns:
-        str: 'Normal' or 'Anomaly Detected'
+        str: 'Normal', 'Anomaly Detected' or 'Unknown'
     """
-    # Extract system-specific data from latest_data
-    system_data = latest_data.get(system, {})
-    
-    # Define thresholds for each system
-    thresholds = {
-        'electricity': {
-            'load': (350, 550),  # Min and max acceptable load in MW
-            'health_score': 80   # Minimum acceptable health score
-        },
-        'water': {
-            'flow': (900, 1500), # Min and max acceptable flow in kL/h
-            'health_score': 75   # Minimum acceptable health score
-        },
-        'sewage': {
-            'flow': (700, 1200), # Min and max acceptable flow in kL/h
-            'health_score': 70   # Minimum acceptable health score
-        },
-        'banking': {
-            'transactions': (1500, 3500),  # Min and max transactions per second
-            'health_score': 85   # Minimum acceptable health score
-        }
-    }
-    
-    # Get thresholds for the specific system
-    system_thresholds = thresholds.get(system, {})
-    
-    # Check if system exists in our data
-    if not system_data or not system_thresholds:
-        return "Unknown"
-    
-    # Check main metric for each system
-    if system == 'electricity':
-        load = system_data.get('load', 0)
-        if load < system_thresholds['load'][0] or load > system_thresholds['load'][1]:
-            return "Anomaly Detected"
-    
-    elif system == 'water':
-        flow = system_data.get('flow', 0)
-        if flow < system_thresholds['flow'][0] or flow > system_thresholds['flow'][1]:
-            return "Anomaly Detected"
-    
-    elif system == 'sewage':
-        flow = system_data.get('flow', 0)
-        if flow < system_thresholds['flow'][0] or flow > system_thresholds['flow'][1]:
-            return "Anomaly Detected"
-    
-    elif system == 'banking':
-        transactions = system_data.get('transactions', 0)
-        if transactions < system_thresholds['transactions'][0] or transactions > system_thresholds['transactions'][1]:
-            return "Anomaly Detected"
-    
-    # Check health score for all systems
-    health_score = system_data.get('health_score', 0)
-    if health_score < system_thresholds.get('health_score', 0):
-        return "Anomaly Detected"
-    
-    # If we passed all checks, the system is normal
-    return "Normal"
+    return str(get_anomaly_status_batch(latest_data, [system])[0, -1])
 
-def detect_anomalies(data, columns=None, contamination=0.05):
+def training_window(data):
     """
-    Detect anomalies in the provided data using Isolation Forest algorithm.
-    
+    Describe the window a frame covers, for keying fitted models.
+
+    Args:
+        data (pd.DataFrame): Data with an optional 'timestamp' column
+
+    Returns:
+        tuple: (span in whole hours, sampling interval in minutes), or ('rows', n) without timestamps
+    """
+    if 'timestamp' not in data.columns or len(data) < 2:
+        return ('rows', len(data))
+    timestamps = data['timestamp']
+    span_hours = round((timestamps.iloc[-1] - timestamps.iloc[0]) / pd.Timedelta(hours=1))
+    interval_minutes = round((timestamps.iloc[1] - timestamps.iloc[0]) / pd.Timedelta(minutes=1))
+    return (span_hours, interval_minutes)
+
+# Anomaly models usable by detect_anomalies, as factories taking the contamination
+ANOMALY_MODELS = {
+    'isolation_forest': lambda contamination: IsolationForest(contamination=contamination, random_state=42),
+    'half_space_trees': lambda contamination: HalfSpaceTrees(contamination=contamination, random_state=42)
+}
+
+# Rows scored per model call, bounding the memory of scoring long histories
+SCORE_CHUNK_ROWS = 65536
+
+# Anomaly scores per (model key, data version), kept as long as the models they came from
+SCORE_CACHE = TelemetryCache(max_entries=128, ttl_seconds=MODEL_REGISTRY.max_age_seconds)
+
+def data_version(features):
+    """
+    Fingerprint a feature matrix, so cached scores follow the data they were computed on.
+
+    Args:
+        features (np.ndarray): Feature matrix
+
+    Returns:
+        tuple: (shape, digest of the values)
+    """
+    features = np.ascontiguousarray(features)
+    return features.shape, hashlib.blake2b(features.view(np.uint8), digest_size=16).hexdigest()
+
+class AnomalyScores:
+    """
+    Anomaly scores of the rows of a frame, higher meaning more anomalous.
+
+    Scores are the negated decision function of the model, so rows scoring
+    above 0 are the ones the model classifies as anomalies. Top-k queries use
+    a partial sort (argpartition) and only fully sort the k selected rows.
+    """
+
+    def __init__(self, scores, index):
+        """
+        Args:
+            scores (np.ndarray): Score per row
+            index (pd.Index): Index of the scored rows
+        """
+        self.scores = scores
+        self.index = index
+
+    def __len__(self):
+        return len(self.scores)
+
+    def series(self):
+        """Scores as a Series aligned with the scored frame."""
+        return pd.Series(self.scores, index=self.index)
+
+    def flags(self, threshold=0.0):
+        """Boolean Series of rows scoring above the threshold."""
+        return pd.Series(self.scores > threshold, index=self.index)
+
+    def top_k(self, k):
+        """
+        Get the k most anomalous rows.
+
+        Args:
+            k (int): Number of rows
+
+        Returns:
+            pd.Series: Scores of the k highest-scoring rows, highest first
+        """
+        k = min(k, len(self.scores))
+        if k <= 0:
+            return pd.Series(dtype=np.float64)
+        selected = np.argpartition(self.scores, len(self.scores) - k)[len(self.scores) - k:]
+        selected = selected[np.argsort(self.scores[selected])[::-1]]
+        return pd.Series(self.scores[selected], index=self.index[selected])
+
+    def above(self, threshold=0.0):
+        """
+        Get the rows scoring above a threshold.
+
+        Args:
+            threshold (float): Minimum score (exclusive)
+
+        Returns:
+            pd.Series: Scores of the selected rows, highest first
+        """
+        selected = np.flatnonzero(self.scores > threshold)
+        selected = selected[np.argsort(self.scores[selected])[::-1]]
+        return pd.Series(self.scores[selected], index=self.index[selected])
+
+def _model_getter(data, features, columns, contamination, system, window, registry, method, sample_size, reservoir=None):
+    """Registry key of the model for the features, and a function returning the fitted model."""
+    key = (system, tuple(columns), contamination, window or training_window(data), method, sample_size)
+
+    def fit():
+        # Fit on the data's streaming reservoir when it has seen this data, else on a
+        # bounded sample of the data, both stratified by time of day
+        timestamps = data['timestamp'].to_numpy() if 'timestamp' in data.columns else None
+        sample = None
+        if reservoir is not None and timestamps is not None:
+            sample = reservoir.sample(columns, timestamps, sample_size)
+        if sample is None or len(sample) < 2:
+            sample = training_sample(features, timestamps, sample_size)
+        return ANOMALY_MODELS[method](contamination).fit(sample)
+
+    def get_model():
+        return fit() if system is None else registry.get_or_fit(key, fit)
+
+    return key, get_model
+
+def score_anomalies(data, columns=None, contamination=0.05, system=None, window=None, registry=MODEL_REGISTRY,
+                    method='isolation_forest', cache=SCORE_CACHE, sample_size=DEFAULT_SAMPLE_SIZE, reservoir=None):
+    """
+    Score how anomalous each row of the data is.
+
+    When a system is given, the fitted model is taken from the model registry,
+    keyed by (system, columns, contamination, training window, method, sample
+    size), and only scoring runs on each call. Without a system a model is
+    fitted on the data. Models are fitted on at most sample_size rows,
+    stratified by time of day: the reservoir of the data's stream when given
+    and it has seen the data (see get_training_reservoir), else a sample of
+    the data itself,
+    so fit time stays bounded however long the horizon. Every row is still
+    scored, in chunks. The 'half_space_trees' method uses the online
+    HalfSpaceTrees model, which can later absorb new data without a refit.
+    Scores are cached per model key and data version, so scoring the same
+    data again is free.
+
     Args:
         data (pd.DataFrame): DataFrame containing the data to analyze
         columns (list): List of column names to use for anomaly detection
         contamination (float): Expected proportion of anomalies in the data
-        
+        system (str): System the data belongs to, enables model reuse
+        window (tuple): Training window of the model, defaults to training_window(data)
+        registry (ModelRegistry): Registry holding fitted models
+        method (str): Model to use, a key of ANOMALY_MODELS
+        cache (TelemetryCache): Cache of computed scores
+        sample_size (int): Maximum rows the model is fitted on
+        reservoir (StreamReservoir): Training reservoir of the stream the data was read from
+
     Returns:
-        pd.Series: Boolean series indicating anomalies (True for anomalies)
+        AnomalyScores: Score per row (above 0 for anomalies)
     """
     if not isinstance(data, pd.DataFrame):
         raise ValueError("Input data must be a pandas DataFrame")
@@ -93,38 +251,182 @@ def detect_anomalies(data, columns=None, contamination=0.05):
     
     # Make sure we have data to work with
     if len(columns) == 0 or data.empty:
-        return pd.Series([False] * len(data))
+        return AnomalyScores(np.full(len(data), -np.inf), data.index)
     
-    # Create and fit the model
-    model = IsolationForest(contamination=contamination, random_state=42)
-    
-    # Predict anomalies
-    predictions = model.fit_predict(data[columns])
-    
-    # Convert predictions to boolean (Isolation Forest returns -1 for anomalies, 1 for normal)
-    return pd.Series(predictions == -1, index=data.index)
+    features = data[columns].to_numpy()
+    key, get_model = _model_getter(data, features, columns, contamination, system, window, registry, method, sample_size,
+                                   reservoir)
+
+    def score():
+        model = get_model()
+        scores = np.empty(len(features))
+        for start in range(0, len(features), SCORE_CHUNK_ROWS):
+            chunk = slice(start, start + SCORE_CHUNK_ROWS)
+            scores[chunk] = -model.decision_function(features[chunk])
+        scores.setflags(write=False)
+        return scores
+
+    return AnomalyScores(cache.get_or_compute(('anomaly_scores', key, data_version(features)), score), data.index)
+
+def detect_anomalies(data, columns=None, contamination=0.05, system=None, window=None, registry=MODEL_REGISTRY,
+                     method='isolation_forest', reservoir=None):
+    """
+    Detect anomalies in the provided data using Isolation Forest algorithm.
+
+    Rows are scored with score_anomalies (see there for model reuse and
+    caching) and flagged where the model classifies them as anomalies.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data to analyze
+        columns (list): List of column names to use for anomaly detection
+        contamination (float): Expected proportion of anomalies in the data
+        system (str): System the data belongs to, enables model reuse
+        window (tuple): Training window of the model, defaults to training_window(data)
+        registry (ModelRegistry): Registry holding fitted models
+        method (str): Model to use, a key of ANOMALY_MODELS
+        reservoir (StreamReservoir): Training reservoir of the stream the data was read from
 
-def analyze_system_health(data, system):
+    Returns:
+        pd.Series: Boolean series indicating anomalies (True for anomalies)
+    """
+    return score_anomalies(data, columns, contamination, system, window, registry, method, reservoir=reservoir).flags()
+
+def _robust_z_contributions(features, flagged):
+    # Distance of each flagged row from the median of the unflagged rows, in robust standard deviations
+    reference = features[~flagged] if (~flagged).any() else features
+    median = np.median(reference, axis=0)
+    spread = MAD_SCALE * np.median(np.abs(reference - median), axis=0)
+    spread = np.where(spread > 0, spread, np.finfo(np.float64).eps)
+    return np.abs(features[flagged] - median) / spread
+
+def _tree_parents(tree):
+    # Parent and depth of every node, walking the tree one level at a time
+    left, right = tree.children_left, tree.children_right
+    parent = np.full(tree.node_count, -1)
+    depth = np.zeros(tree.node_count, dtype=np.int64)
+    level = np.array([0])
+    while len(level):
+        split = level[left[level] >= 0]
+        children = np.concatenate([left[split], right[split]])
+        parent[children] = np.tile(split, 2)
+        depth[children] = depth[split[0]] + 1 if len(split) else 0
+        level = children
+    return parent, depth
+
+def _tree_path_contributions(model, features):
+    # In every tree, the feature of the split that separated a row into its leaf gets the credit,
+    # weighted by 1 / leaf depth so trees that isolate the row early count most
+    if not hasattr(model, 'estimators_'):
+        raise ValueError("Tree-path attribution needs an isolation forest model")
+    contributions = np.zeros(features.shape)
+    flat = contributions.reshape(-1)
+    offsets = np.arange(len(features)) * features.shape[1]
+    for estimator, tree_features in zip(model.estimators_, model.estimators_features_):
+        tree = estimator.tree_
+        parent, depth = _tree_parents(tree)
+        leaves = estimator.apply(features[:, tree_features].astype(np.float32))
+        # A tree that is a single leaf has no split to credit
+        split = depth[leaves] > 0
+        columns = tree_features[tree.feature[parent[leaves[split]]]]
+        flat += np.bincount(offsets[split] + columns, weights=1 / depth[leaves[split]], minlength=flat.size)
+    return contributions
+
+ATTRIBUTIONS = ['robust_z', 'tree_path']
+
+def explain_anomalies(data, columns=None, flags=None, attribution='robust_z', contamination=0.05, system=None,
+                      window=None, registry=MODEL_REGISTRY, method='isolation_forest', sample_size=DEFAULT_SAMPLE_SIZE,
+                      reservoir=None):
+    """
+    Attribute each flagged row's anomaly to the features that caused it.
+
+    Contributions of all flagged rows are computed as one matrix:
+    'robust_z' measures how far each value lies from the median of the
+    unflagged rows in robust (MAD-based) standard deviations; 'tree_path'
+    credits, in every tree of the fitted isolation forest (taken from the
+    model registry like score_anomalies does), the feature of the split that
+    isolated the row into its leaf, weighted by 1 / leaf depth. Each row's contributions are normalized to sum to 1.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing the data to analyze
+        columns (list): List of column names to use for anomaly detection
+        flags (array-like): Boolean flag per row; detected with detect_anomalies if None
+        attribution (str): 'robust_z' or 'tree_path'
+        contamination (float): Expected proportion of anomalies in the data
+        system (str): System the data belongs to, enables model reuse
+        window (tuple): Training window of the model, defaults to training_window(data)
+        registry (ModelRegistry): Registry holding fitted models
+        method (str): Model to use, a key of ANOMALY_MODELS
+        sample_size (int): Maximum rows the model is fitted on
+        reservoir (StreamReservoir): Training reservoir of the stream the data was read from
+
+    Returns:
+        pd.DataFrame: Share of each feature (columns) in the anomaly of each flagged row (index)
+    """
+    if attribution not in ATTRIBUTIONS:
+        raise ValueError(f"Unknown attribution: {attribution}")
+    if columns is None:
+        columns = data.select_dtypes(include=np.number).columns.tolist()
+    if flags is None:
+        flags = score_anomalies(data, columns, contamination, system, window, registry, method,
+                                sample_size=sample_size, reservoir=reservoir).flags()
+    flagged = np.asarray(flags, dtype=bool)
+    features = data[columns].to_numpy(dtype=np.float64)
+
+    if not flagged.any():
+        contributions = np.zeros((0, len(columns)))
+    elif attribution == 'robust_z':
+        contributions = _robust_z_contributions(features, flagged)
+    else:
+        _, get_model = _model_getter(data, data[columns].to_numpy(), columns, contamination, system, window, registry,
+                                     method, sample_size, reservoir)
+        contributions = _tree_path_contributions(get_model(), features[flagged])
+
+    totals = contributions.sum(axis=1, keepdims=True)
+    contributions = np.divide(contributions, totals, out=np.zeros_like(contributions), where=totals > 0)
+    return pd.DataFrame(contributions, index=data.index[flagged], columns=columns)
+
+# Key metrics used for anomaly detection in each system
+SYSTEM_METRICS = {
+    'electricity': ['load_mw', 'voltage', 'frequency', 'power_factor'],
+    'water': ['flow_kl_h', 'pressure_bar', 'turbidity_ntu', 'ph_level'],
+    'sewage': ['flow_kl_h', 'treatment_efficiency', 'contaminant_level', 'dissolved_oxygen'],
+    'banking': ['transactions_per_second', 'response_time_ms', 'success_rate', 'error_rate']
+}
+
+# Minimum health score of each status, best first; lower scores are 'Critical'
+HEALTH_STATUS_THRESHOLDS = [(90, 'Excellent'), (80, 'Good'), (70, 'Fair'), (60, 'Concerning')]
+
+def health_status(health_score):
+    """
+    Map health scores to statuses.
+
+    Args:
+        health_score (float | np.ndarray): Health score or array of scores
+
+    Returns:
+        np.ndarray: Status per score (a 0-d array for a scalar)
+    """
+    health_score = np.asarray(health_score, dtype=np.float64)
+    return np.select(
+        [health_score >= threshold for threshold, _ in HEALTH_STATUS_THRESHOLDS],
+        [status for _, status in HEALTH_STATUS_THRESHOLDS],
+        default='Critical'
+    )
+
+def analyze_system_health(data, system, reservoir=None):
     """
     Analyze system health and identify potential issues.
     
     Args:
         data (pd.DataFrame): DataFrame containing system-specific data
         system (str): System name ('electricity', 'water', 'sewage', 'banking')
+        reservoir (StreamReservoir): Training reservoir of the stream the data was read from
         
     Returns:
         dict: Analysis results including health status and recommendations
     """
-    # Define key metrics for each system
-    metrics = {
-        'electricity': ['load_mw', 'voltage', 'frequency', 'power_factor'],
-        'water': ['flow_kl_h', 'pressure_bar', 'turbidity_ntu', 'ph_level'],
-        'sewage': ['flow_kl_h', 'treatment_efficiency', 'contaminant_level', 'dissolved_oxygen'],
-        'banking': ['transactions_per_second', 'response_time_ms', 'success_rate', 'error_rate']
-    }
-    
     # Get relevant metrics for the system
-    system_metrics = metrics.get(system, [])
+    system_metrics = SYSTEM_METRICS.get(system, [])
     
     # Check if we have the required data
     if not all(metric in data.columns for metric in system_metrics):
@@ -135,108 +437,23 @@ def analyze_system_health(data, system):
         }
     
     # Run anomaly detection on the data
-    anomalies = detect_anomalies(data, columns=system_metrics)
+    anomalies = detect_anomalies(data, columns=system_metrics, system=system, reservoir=reservoir)
     
     # Calculate summary statistics
     anomaly_rate = anomalies.mean()
     health_score = data.get('health_score', pd.Series([0] * len(data))).mean()
     
     # Define health status
-    if health_score >= 90:
-        status = 'Excellent'
-    elif health_score >= 80:
-        status = 'Good'
-    elif health_score >= 70:
-        status = 'Fair'
-    elif health_score >= 60:
-        status = 'Concerning'
-    else:
-        status = 'Critical'
-    
-    # Identify specific issues
-    issues = []
-    
-    # System-specific checks
-    if system == 'electricity':
-        if data['frequency'].mean() < 49.5 or data['frequency'].mean() > 50.5:
-            issues.append('Frequency instability detected')
-        if data['voltage'].mean() < 220 or data['voltage'].mean() > 240:
-            issues.append('Voltage outside acceptable range')
-        if data['power_factor'].mean() < 0.9:
-            issues.append('Low power factor')
-    
-    elif system == 'water':
-        if data['pressure_bar'].mean() < 4.5:
-            issues.append('Low water pressure')
-        if data['turbidity_ntu'].mean() > 1.0:
-            issues.append('High water turbidity')
-        if data['ph_level'].mean() < 6.5 or data['ph_level'].mean() > 8.5:
-            issues.append('pH level outside acceptable range')
-    
-    elif system == 'sewage':
-        if data['treatment_efficiency'].mean() < 85:
-            issues.append('Treatment efficiency below target')
-        if data['contaminant_level'].mean() > 10:
-            issues.append('High contaminant levels')
-        if data['dissolved_oxygen'].mean() < 5:
-            issues.append('Low dissolved oxygen levels')
+    status = str(health_status(health_score))
     
-    elif system == 'banking':
-        if data['response_time_ms'].mean() > 300:
-            issues.append('High response times')
-        if data['success_rate'].mean() < 99:
-            issues.append('Transaction success rate below target')
-        if data['error_rate'].mean() > 1:
-            issues.append('High error rate')
-    
-    # Add general issues based on anomaly detection
-    if anomaly_rate > 0.1:
-        issues.append(f'High rate of anomalies detected ({anomaly_rate*100:.1f}%)')
+    # Evaluate the system's compiled rules in one aggregation pass
+    rules = COMPILED_RULES.get(system) or compile_rules(system)
+    issues, recommendations = rules.evaluate(data, detected=anomalies)
     
     # If no specific issues found, note that
     if not issues:
         issues.append('No specific issues detected')
     
-    # Generate recommendations
-    recommendations = []
-    
-    # System-specific recommendations
-    if system == 'electricity':
-        if 'Frequency instability detected' in issues:
-            recommendations.append('Check grid balancing systems')
-        if 'Voltage outside acceptable range' in issues:
-            recommendations.append('Inspect voltage regulators and transformers')
-        if 'Low power factor' in issues:
-            recommendations.append('Consider installing power factor correction capacitors')
-    
-    elif system == 'water':
-        if 'Low water pressure' in issues:
-            recommendations.append('Check pump operations and inspect for leaks')
-        if 'High water turbidity' in issues:
-            recommendations.append('Optimize filtration systems')
-        if 'pH level outside acceptable range' in issues:
-            recommendations.append('Adjust chemical treatment processes')
-    
-    elif system == 'sewage':
-        if 'Treatment efficiency below target' in issues:
-            recommendations.append('Review treatment process and chemical dosing')
-        if 'High contaminant levels' in issues:
-            recommendations.append('Investigate potential industrial discharge events')
-        if 'Low dissolved oxygen levels' in issues:
-            recommendations.append('Check aeration systems')
-    
-    elif system == 'banking':
-        if 'High response times' in issues:
-            recommendations.append('Optimize database queries and increase server capacity')
-        if 'Transaction success rate below target' in issues:
-            recommendations.append('Investigate failed transactions and implement retry mechanisms')
-        if 'High error rate' in issues:
-            recommendations.append('Review error logs and address common failure points')
-    
-    # Add general recommendations based on anomaly detection
-    if anomaly_rate > 0.1:
-        recommendations.append('Conduct comprehensive system diagnostic')
-    
     # If no specific recommendations, add a general one
     if not recommendations:
         recommendations.append('Continue regular monitoring and maintenance')
@@ -248,3 +465,398 @@ def analyze_system_health(data, system):
         'issues': issues,
         'recommendations': recommendations
     }
+
+def analyze_health_timeline(data, system, window='1h', reservoir=None):
+    """
+    Analyze system health for every time window of a history in one pass.
+
+    Anomalies are detected once over the whole history. The system's
+    compiled rules, the health score and the anomaly rate are then
+    aggregated per window with one reduceat each, instead of running
+    analyze_system_health once per window.
+
+    Args:
+        data (pd.DataFrame): System data with a 'timestamp' column, sorted by time
+        system (str): System name ('electricity', 'water', 'sewage', 'banking')
+        window (str): Window length as a pandas frequency, e.g. '1h' or '1D'
+        reservoir (StreamReservoir): Training reservoir of the stream the data was read from
+
+    Returns:
+        pd.DataFrame: One row per non-empty window with timestamp (window start),
+            health_score, anomaly_rate, status and issues (list of issue texts)
+    """
+    rules = COMPILED_RULES.get(system) or compile_rules(system)
+    metrics = [metric for metric in rules.metrics if metric != 'detected']
+    if data.empty or not all(metric in data.columns for metric in metrics):
+        return pd.DataFrame(columns=['timestamp', 'health_score', 'anomaly_rate', 'status', 'issues'])
+
+    anomalies = detect_anomalies(data, columns=SYSTEM_METRICS.get(system, metrics), system=system,
+                                 reservoir=reservoir).to_numpy(dtype=np.float64)
+    health = data['health_score'].to_numpy(dtype=np.float64) if 'health_score' in data.columns else np.zeros(len(data))
+
+    # Windows are runs of samples sharing the same floored timestamp
+    buckets = data['timestamp'].dt.floor(window).to_numpy()
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, len(data)])
+
+    values = rules.aggregate_groups(data, starts, detected=anomalies)
+    fired = rules.fired(values)
+    health_score = np.add.reduceat(health, starts) / counts
+
+    issues = [
+        [rules.issues[rule].format(value=values[row, rule]) for rule in np.flatnonzero(fired[row])]
+        for row in range(len(starts))
+    ]
+    return pd.DataFrame({
+        'timestamp': buckets[starts],
+        'health_score': health_score,
+        'anomaly_rate': np.add.reduceat(anomalies, starts) / counts,
+        'status': health_status(health_score),
+        'issues': issues
+    })
+
+# Health statuses from best to worst, used to combine per-system results
+HEALTH_STATUSES = ['Excellent', 'Good', 'Fair', 'Concerning', 'Critical', 'Unknown']
+
+def analyze_all_systems(systems=('electricity', 'water', 'sewage', 'banking'), hours=24, data=None, max_workers=None,
+                        reservoirs=None):
+    """
+    Analyze the health of several systems concurrently.
+
+    The data of every system is fetched once up front and shared with a
+    thread pool that runs analyze_system_health per system. Model scoring
+    releases the GIL, so the wall-clock time approaches that of the slowest
+    system rather than the sum.
+
+    Args:
+        systems (iterable): Systems to analyze
+        hours (int): Hours of history to analyze when data is not given
+        data (dict): System name to detailed DataFrame; fetched from the data source if None
+        max_workers (int): Pool size, defaults to one thread per system
+        reservoirs (dict): System name to training reservoir of its data; taken from the data source
+            with the data when data is None
+
+    Returns:
+        dict: 'systems' (system name to analyze_system_health result), overall 'status'
+            (worst system status), mean 'health_score' and mean 'anomaly_rate'
+    """
+    systems = list(systems)
+    if not systems:
+        return {'systems': {}, 'status': 'Unknown', 'health_score': np.nan, 'anomaly_rate': np.nan}
+    if data is None:
+        data = {system: get_detailed_data(system, hours=hours) for system in systems}
+        if reservoirs is None:
+            reservoirs = {system: get_training_reservoir(system, hours=hours) for system in systems}
+    reservoirs = reservoirs or {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(systems)) as pool:
+        results = dict(zip(systems, pool.map(
+            lambda system: analyze_system_health(data[system], system, reservoirs.get(system)), systems
+        )))
+
+    statuses = [result['status'] for result in results.values()]
+    return {
+        'systems': results,
+        'status': max(statuses, key=HEALTH_STATUSES.index) if statuses else 'Unknown',
+        'health_score': float(np.mean([result.get('health_score', np.nan) for result in results.values()])),
+        'anomaly_rate': float(np.mean([result.get('anomaly_rate', np.nan) for result in results.values()]))
+    }
+
+CHANGE_POINT_METHODS = ['cusum', 'page_hinkley', 'pelt']
+
+class ChangePointDetector:
+    """
+    Streaming detector of fault onset and return to baseline in one series.
+
+    Values are standardized by a scale learned from the first warmup samples
+    (or given). With 'cusum' a lower CUSUM against a fixed baseline
+    accumulates evidence of a drop; when it exceeds the threshold a fault is
+    open, dated from the sample where the CUSUM last left zero. While a fault
+    is open, an upper CUSUM accumulates evidence that values are back within
+    the drift of the baseline, and closes the fault from the sample where it
+    last left zero.
+
+    With 'page_hinkley' the Page-Hinkley statistic
+    m_T = sum(x_t - mean_t + drift) is tracked with its running maximum M_T,
+    where mean_t is the running mean of the in-control samples before x_t.
+    A fault opens when M_T - m_T exceeds the threshold, dated from the sample
+    after the maximum; slow drifts are absorbed into the running mean rather
+    than reported as faults. Fault samples are kept out of the mean, and the
+    mirrored statistic sum(x_t - mean + drift) against the pre-fault mean
+    closes the fault when it rises the threshold above its running minimum,
+    dated from the sample after the minimum. Each sample costs O(1).
+    """
+
+    def __init__(self, method='cusum', drift=2.0, threshold=2.0, baseline=None, scale=None, warmup=96, min_scale=1e-9):
+        """
+        Args:
+            method (str): 'cusum' (fixed baseline) or 'page_hinkley' (running mean of the in-control samples)
+            drift (float): Allowed shift, in baseline standard deviations, before evidence accumulates
+                (delta of the Page-Hinkley test)
+            threshold (float): Accumulated evidence, in baseline standard deviations, that opens or closes
+                a fault (lambda of the Page-Hinkley test)
+            baseline (float): Baseline mean, learned from the warmup samples if None
+            scale (float): Baseline standard deviation, learned from the warmup samples if None
+            warmup (int): Samples used to learn the baseline
+            min_scale (float): Lower bound of the scale, avoiding division by zero
+        """
+        if method not in ('cusum', 'page_hinkley'):
+            raise ValueError(f"Unknown streaming change-point method: {method}")
+        self.method = method
+        self.drift = drift
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_scale = min_scale
+        self.baseline = baseline
+        self.scale = scale
+        # Running mean and sum of squared deviations of the warmup, then of the in-control samples
+        self.count = 0
+        self.mean = 0.0
+        self.squares = 0.0
+        self.in_fault = False
+        # CUSUM statistics and the samples they last left zero at
+        self.low = 0.0
+        self.high = 0.0
+        self.low_start = None
+        self.high_start = None
+        # Page-Hinkley statistic, its running extreme and the sample after the extreme
+        self.cumulative = 0.0
+        self.extreme = 0.0
+        self.extreme_start = None
+
+    def _absorb(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squares += delta * (value - self.mean)
+
+    def update(self, index, value):
+        """
+        Absorb one sample.
+
+        Args:
+            index: Position or timestamp of the sample, used to date events
+            value (float): Sample value; NaN is ignored
+
+        Returns:
+            tuple: ('onset' or 'recovery', index of the change), or None
+        """
+        if math.isnan(value):
+            return None
+
+        if self.baseline is None or self.scale is None:
+            self._absorb(value)
+            if self.count >= self.warmup:
+                self.baseline = self.mean if self.baseline is None else self.baseline
+                self.scale = (self.squares / (self.count - 1)) ** 0.5 if self.scale is None else self.scale
+            return None
+
+        if self.method == 'page_hinkley':
+            return self._update_page_hinkley(index, value)
+
+        z = (value - self.baseline) / max(self.scale, self.min_scale)
+        if not self.in_fault:
+            if self.low == 0.0:
+                self.low_start = index
+            self.low = max(0.0, self.low - z - self.drift)
+            if self.low > self.threshold:
+                self.in_fault = True
+                self.high = 0.0
+                return ('onset', self.low_start)
+            return None
+
+        if self.high == 0.0:
+            self.high_start = index
+        self.high = max(0.0, self.high + z + self.drift)
+        if self.high > self.threshold:
+            self.in_fault = False
+            self.low = 0.0
+            return ('recovery', self.high_start)
+        return None
+
+    def _update_page_hinkley(self, index, value):
+        if self.extreme_start is None:
+            self.extreme_start = index
+        scale = max(self.scale, self.min_scale)
+        if not self.in_fault:
+            # Drops pull m_T below its running maximum
+            self.cumulative += (value - self.mean) / scale + self.drift
+            if self.extreme - self.cumulative > self.threshold:
+                self.in_fault = True
+                self.baseline = self.mean
+                self.cumulative = self.extreme = 0.0
+                start, self.extreme_start = self.extreme_start, None
+                return ('onset', start)
+            if self.cumulative >= self.extreme:
+                self.extreme = self.cumulative
+                self.extreme_start = None
+            self._absorb(value)
+            return None
+
+        # Returns toward the pre-fault mean push m_T above its running minimum
+        self.cumulative += (value - self.baseline) / scale + self.drift
+        if self.cumulative - self.extreme > self.threshold:
+            self.in_fault = False
+            self.cumulative = self.extreme = 0.0
+            start, self.extreme_start = self.extreme_start, None
+            return ('recovery', start)
+        if self.cumulative <= self.extreme:
+            self.extreme = self.cumulative
+            self.extreme_start = None
+        return None
+
+def pelt_change_points(values, penalty=None, min_size=2, max_points=2000):
+    """
+    Find the change points of the mean of a series with PELT.
+
+    Minimizes the within-segment squared error plus a penalty per change;
+    each step is vectorized over the surviving candidates. Pruning keeps the
+    candidate set small when the series changes often, but on a series with
+    few changes most candidates survive and the cost grows quadratically. A
+    series longer than max_points is therefore segmented as the means of
+    equal blocks of samples, bounding the cost; change points are then
+    reported at block boundaries.
+
+    Args:
+        values (np.ndarray): Series values (NaN-free)
+        penalty (float): Cost of a change, defaults to 2 log(n) times the robust variance
+        min_size (int): Minimum samples (or blocks, for a long series) per segment
+        max_points (int): Longest series segmented sample by sample
+
+    Returns:
+        np.ndarray: Start index of every segment after the first
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n < 2 * min_size:
+        return np.array([], dtype=np.int64)
+    if penalty is None:
+        variance = (MAD_SCALE * np.median(np.abs(np.diff(values))) / np.sqrt(2)) ** 2
+        penalty = 2 * np.log(n) * max(variance, np.finfo(np.float64).eps)
+
+    block = -(-n // max_points)
+    if block > 1:
+        # The squared error of block means is about 1 / block of that of the samples
+        starts = np.arange(0, n, block)
+        values = np.add.reduceat(values, starts) / np.diff(np.r_[starts, n])
+        penalty /= block
+        n = len(values)
+        if n < 2 * min_size:
+            return np.array([], dtype=np.int64)
+
+    sums = np.concatenate([[0.0], np.cumsum(values)])
+    squares = np.concatenate([[0.0], np.cumsum(values ** 2)])
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([0], dtype=np.int64)
+
+    for end in range(min_size, n + 1):
+        length = end - candidates
+        segment = squares[end] - squares[candidates] - (sums[end] - sums[candidates]) ** 2 / length
+        total = best[candidates] + segment + penalty
+        choice = np.argmin(total)
+        best[end] = total[choice]
+        previous[end] = candidates[choice]
+        # Candidates that can no longer start an optimal last segment are pruned
+        candidates = np.append(candidates[total - penalty <= best[end]], end - min_size + 1)
+
+    changes = []
+    end = n
+    while end > 0:
+        end = previous[end]
+        if end > 0:
+            changes.append(end)
+    return np.array(changes[::-1], dtype=np.int64) * block
+
+def detect_fault_episodes(data, column='health_score', method='cusum', drift=2.0, threshold=2.0, warmup=96):
+    """
+    Date the fault onsets and returns to baseline of a series.
+
+    'cusum' and 'page_hinkley' run a ChangePointDetector over the series in
+    one pass. 'pelt' segments the series offline and reports runs of segments
+    whose mean lies more than drift robust standard deviations below the
+    median as faults.
+
+    Args:
+        data (pd.DataFrame): Data with a 'timestamp' column and the series column
+        column (str): Series to analyze, e.g. 'health_score'
+        method (str): 'cusum', 'page_hinkley' or 'pelt'
+        drift (float): Shift, in baseline standard deviations, that counts as a fault
+        threshold (float): Accumulated evidence that opens or closes a fault (streaming methods)
+        warmup (int): Samples used to learn the baseline (streaming methods)
+
+    Returns:
+        pd.DataFrame: onset, recovery (NaT while ongoing), duration and depth (largest drop below the
+            baseline) of every fault episode
+    """
+    if method not in CHANGE_POINT_METHODS:
+        raise ValueError(f"Unknown change-point method: {method}")
+    values = data[column].to_numpy(dtype=np.float64)
+    timestamps = data['timestamp'].to_numpy()
+
+    if method == 'pelt':
+        finite = np.flatnonzero(np.isfinite(values))
+        series = values[finite]
+        baseline = np.median(series) if len(series) else np.nan
+        scale = MAD_SCALE * np.median(np.abs(series - baseline)) if len(series) else np.nan
+        starts = np.r_[0, pelt_change_points(series)]
+        means = np.add.reduceat(series, starts) / np.diff(np.r_[starts, len(series)]) if len(series) else np.array([])
+        low = means < baseline - drift * max(scale, np.finfo(np.float64).eps)
+        # Runs of low segments: onset at the first, recovery at the next normal segment
+        edges = np.diff(np.r_[False, low, False].astype(np.int8))
+        onsets, stops = starts[edges[:-1] == 1], np.flatnonzero(edges == -1)
+        recoveries = [starts[stop] if stop < len(starts) else None for stop in stops]
+        events = [(finite[onset], None if recovery is None else finite[recovery]) for onset, recovery in zip(onsets, recoveries)]
+    else:
+        detector = ChangePointDetector(method, drift, threshold, warmup=warmup)
+        baseline = None
+        events = []
+        for index, value in enumerate(values.tolist()):
+            event = detector.update(index, value)
+            if event is None:
+                continue
+            if event[0] == 'onset':
+                events.append((event[1], None))
+                baseline = detector.baseline
+            else:
+                events[-1] = (events[-1][0], event[1])
+        baseline = detector.baseline if baseline is None else baseline
+
+    onsets = np.array([onset for onset, _ in events], dtype=np.int64)
+    recoveries = np.array([len(values) if recovery is None else recovery for _, recovery in events], dtype=np.int64)
+    depth = np.array([baseline - np.nanmin(values[onset:max(recovery, onset + 1)])
+                      for onset, recovery in zip(onsets, recoveries)], dtype=np.float64)
+    onset_times = pd.to_datetime(timestamps[onsets]) if len(onsets) else pd.DatetimeIndex([])
+    recovery_times = pd.DatetimeIndex([
+        pd.Timestamp(timestamps[recovery]) if recovery < len(values) else pd.NaT for recovery in recoveries
+    ])
+    return pd.DataFrame({
+        'onset': onset_times,
+        'recovery': recovery_times,
+        'duration': recovery_times - onset_times,
+        'depth': depth
+    })
+
+def measure_recoveries(systems=('electricity', 'water', 'sewage', 'banking'), hours=24 * 90, interval_minutes=15,
+                       data=None, method='cusum'):
+    """
+    Measure the fault episodes and recovery durations of several systems' health scores.
+
+    Args:
+        systems (iterable): Systems to analyze
+        hours (int): Hours of history to analyze when data is not given
+        interval_minutes (int): Interval of the fetched history in minutes
+        data (dict): System name to detailed DataFrame; fetched from the data source if None
+        method (str): 'cusum', 'page_hinkley' or 'pelt'
+
+    Returns:
+        pd.DataFrame: One row per episode with system, onset, recovery, duration and depth
+    """
+    systems = list(systems)
+    if data is None:
+        data = {system: get_detailed_data(system, hours=hours, interval_minutes=interval_minutes,
+                                          columns=['health_score']) for system in systems}
+    episodes = [detect_fault_episodes(data[system], method=method).assign(system=system) for system in systems]
+    episodes = pd.concat(episodes, ignore_index=True) if episodes else pd.DataFrame()
+    return episodes[['system', 'onset', 'recovery', 'duration', 'depth']] if len(episodes.columns) else episodes
@@ -0,0 +1,289 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from utils.anomaly_detection import (
+    ANOMALY_THRESHOLDS, SCORE_CACHE, SYSTEM_METRICS, detect_anomalies, get_anomaly_status, get_anomaly_status_batch
+)
+from utils.data_generator import SYSTEM_PROFILES, generate_system_columns
+from utils.half_space_trees import HalfSpaceTrees
+from utils.joint_detection import detect_joint_anomalies
+from utils.model_registry import ModelRegistry
+from utils.streaming_detector import StreamingDetector
+
+# Fixed start of the benchmark histories, so runs on different days see identical data
+BENCHMARK_EPOCH = np.datetime64('2024-01-01T00:00')
+
+def make_datasets(hours=720, interval_minutes=5, anomaly_rate=0.01, seed=7, systems=None):
+    """
+    Generate a labelled history per system with a known share of injected anomalies.
+
+    Args:
+        hours (int): Hours of history per system
+        interval_minutes (int): Interval between data points in minutes
+        anomaly_rate (float): Share of points given an injected anomaly
+        seed (int): Seed of the generated data
+        systems (list): Systems to generate, defaults to every system in SYSTEM_METRICS
+
+    Returns:
+        dict: System name to detailed DataFrame; its 'anomaly' column is the ground truth
+    """
+    systems = list(SYSTEM_METRICS) if systems is None else list(systems)
+    points = hours * 60 // interval_minutes
+    timestamps = BENCHMARK_EPOCH + np.arange(points) * np.timedelta64(interval_minutes, 'm')
+    hours_of_day = (np.arange(points) * interval_minutes / 60) % 24
+    anomaly_count = max(1, int(round(points * anomaly_rate)))
+
+    datasets = {}
+    for offset, system in enumerate(systems):
+        columns = generate_system_columns(system, hours_of_day, detailed=True, seed=seed + offset,
+                                          anomaly_count=anomaly_count)
+        datasets[system] = pd.DataFrame({'timestamp': timestamps, **columns})
+    return datasets
+
+def accuracy(predicted, actual):
+    """
+    Compare predicted anomaly flags with the ground truth.
+
+    Args:
+        predicted (np.ndarray): Predicted flags
+        actual (np.ndarray): True flags
+
+    Returns:
+        dict: precision, recall and f1 (0 where undefined)
+    """
+    predicted = np.asarray(predicted, dtype=bool)
+    actual = np.asarray(actual, dtype=bool)
+    hits = np.count_nonzero(predicted & actual)
+    precision = hits / max(np.count_nonzero(predicted), 1)
+    recall = hits / max(np.count_nonzero(actual), 1)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'precision': precision, 'recall': recall, 'f1': f1}
+
+def _timed(call):
+    started = time.perf_counter()
+    result = call()
+    return result, time.perf_counter() - started
+
+# Benchmark cases. Each takes the datasets and returns (predicted flags, true flags,
+# latencies in seconds, samples processed); a latency covers one call, which is one
+# whole history for batch detectors and one sample for streaming ones.
+
+def _detect_anomalies_case(method):
+    def case(datasets):
+        predicted, actual, latencies = [], [], []
+        for system, data in datasets.items():
+            # A fresh registry and an empty score cache, so every call fits and scores
+            registry = ModelRegistry(None)
+            SCORE_CACHE.clear()
+            flags, elapsed = _timed(lambda: detect_anomalies(
+                data, columns=SYSTEM_METRICS[system], system=system, registry=registry, method=method
+            ))
+            predicted.append(flags.to_numpy())
+            actual.append(data['anomaly'].to_numpy())
+            latencies.append(elapsed)
+        return np.concatenate(predicted), np.concatenate(actual), latencies, sum(map(len, predicted))
+    return case
+
+def _snapshots(data, system):
+    metric = ANOMALY_THRESHOLDS[system]['metric']
+    values = data[SYSTEM_PROFILES[system]['detail_metric']].to_numpy()
+    health = data['health_score'].to_numpy()
+    return [{system: {metric: value, 'health_score': score}} for value, score in zip(values.tolist(), health.tolist())]
+
+def _anomaly_status_case(datasets):
+    predicted, actual, latencies = [], [], []
+    for system, data in datasets.items():
+        flags = np.zeros(len(data), dtype=bool)
+        for index, snapshot in enumerate(_snapshots(data, system)):
+            status, elapsed = _timed(lambda: get_anomaly_status(system, snapshot))
+            flags[index] = status == 'Anomaly Detected'
+            latencies.append(elapsed)
+        predicted.append(flags)
+        actual.append(data['anomaly'].to_numpy())
+    return np.concatenate(predicted), np.concatenate(actual), latencies, len(latencies)
+
+def _anomaly_status_batch_case(datasets):
+    history = {
+        system: {
+            ANOMALY_THRESHOLDS[system]['metric']: data[SYSTEM_PROFILES[system]['detail_metric']].to_numpy(),
+            'health_score': data['health_score'].to_numpy()
+        }
+        for system, data in datasets.items()
+    }
+    status, elapsed = _timed(lambda: get_anomaly_status_batch(history, list(datasets)))
+    actual = np.concatenate([data['anomaly'].to_numpy() for data in datasets.values()])
+    return (status == 'Anomaly Detected').ravel(), actual, [elapsed], len(actual)
+
+def _streaming_detector_case(datasets):
+    detector = StreamingDetector({system: SYSTEM_METRICS[system] for system in datasets})
+    predicted, actual, latencies = [], [], []
+    for system, data in datasets.items():
+        rows = data[SYSTEM_METRICS[system]].to_numpy(dtype=np.float64)
+        flags = np.zeros(len(rows), dtype=bool)
+        for index in range(len(rows)):
+            alarm, elapsed = _timed(lambda: detector.update(system, rows[index]))
+            flags[index] = alarm.any()
+            latencies.append(elapsed)
+        predicted.append(flags)
+        actual.append(data['anomaly'].to_numpy())
+    return np.concatenate(predicted), np.concatenate(actual), latencies, len(latencies)
+
+def _half_space_trees_stream_case(datasets, window_size=250):
+    predicted, actual, latencies = [], [], []
+    for system, data in datasets.items():
+        rows = data[SYSTEM_METRICS[system]].to_numpy(dtype=np.float64)
+        # Fit on the first window, then classify and absorb the rest one sample at a time
+        model = HalfSpaceTrees(window_size=window_size, random_state=42).fit(rows[:window_size])
+        flags = np.zeros(len(rows) - window_size, dtype=bool)
+        for index in range(window_size, len(rows)):
+            prediction, elapsed = _timed(lambda: model.score_partial_fit(rows[index:index + 1]))
+            flags[index - window_size] = prediction[0] == -1
+            latencies.append(elapsed)
+        predicted.append(flags)
+        actual.append(data['anomaly'].to_numpy()[window_size:])
+    return np.concatenate(predicted), np.concatenate(actual), latencies, len(latencies)
+
+def _joint_case(datasets):
+    # The joint model flags timestamps; a timestamp is truly anomalous if any system is
+    registry = ModelRegistry(None)
+    SCORE_CACHE.clear()
+    features, elapsed = _timed(lambda: detect_joint_anomalies(
+        datasets, metrics={system: SYSTEM_METRICS[system] for system in datasets}, registry=registry
+    ))
+    truth = np.zeros(len(next(iter(datasets.values()))), dtype=bool)
+    for data in datasets.values():
+        truth |= data['anomaly'].to_numpy()
+    rows = np.searchsorted(next(iter(datasets.values()))['timestamp'].to_numpy(), features['timestamp'].to_numpy())
+    return features['anomaly'].to_numpy(), truth[rows], [elapsed], len(features)
+
+BENCHMARKS = {
+    'detect_anomalies[isolation_forest]': _detect_anomalies_case('isolation_forest'),
+    'detect_anomalies[half_space_trees]': _detect_anomalies_case('half_space_trees'),
+    'get_anomaly_status': _anomaly_status_case,
+    'get_anomaly_status_batch': _anomaly_status_batch_case,
+    'streaming_detector': _streaming_detector_case,
+    'half_space_trees_stream': _half_space_trees_stream_case,
+    'joint_detection': _joint_case
+}
+
+def run_benchmark(name, datasets, repeats=3):
+    """
+    Run one benchmark case and measure its accuracy, speed and memory.
+
+    The case runs once under tracemalloc for the peak memory, then repeats
+    times untraced for the timings; the fastest repeat gives the throughput.
+
+    Args:
+        name (str): Key of BENCHMARKS
+        datasets (dict): Labelled histories from make_datasets
+        repeats (int): Timed runs
+
+    Returns:
+        dict: name, samples, precision, recall, f1, samples_per_second,
+            latency_p50_ms, latency_p99_ms and peak_memory_mb
+    """
+    case = BENCHMARKS[name]
+
+    tracemalloc.start()
+    try:
+        case(datasets)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    best = None
+    for _ in range(repeats):
+        (predicted, actual, latencies, samples), elapsed = _timed(lambda: case(datasets))
+        if best is None or elapsed < best[0]:
+            best = (elapsed, predicted, actual, latencies, samples)
+    elapsed, predicted, actual, latencies, samples = best
+
+    return {
+        'name': name,
+        'samples': samples,
+        **accuracy(predicted, actual),
+        'samples_per_second': samples / elapsed,
+        'latency_unit': 'batch' if len(latencies) < samples else 'sample',
+        'latency_p50_ms': float(np.percentile(latencies, 50) * 1e3),
+        'latency_p99_ms': float(np.percentile(latencies, 99) * 1e3),
+        'peak_memory_mb': peak / 2 ** 20
+    }
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(names=None, hours=720, interval_minutes=5, anomaly_rate=0.01, seed=7, repeats=3):
+    """
+    Run benchmark cases on freshly generated data.
+
+    Args:
+        names (list): Keys of BENCHMARKS to run, defaults to all
+        hours (int): Hours of history per system
+        interval_minutes (int): Interval between data points in minutes
+        anomaly_rate (float): Share of points given an injected anomaly
+        seed (int): Seed of the generated data
+        repeats (int): Timed runs per case
+
+    Returns:
+        dict: Environment, configuration and one result per case, ready to be saved as JSON
+    """
+    names = list(BENCHMARKS) if names is None else list(names)
+    datasets = make_datasets(hours, interval_minutes, anomaly_rate, seed)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'scikit-learn': sklearn.__version__,
+            'machine': platform.machine()
+        },
+        'config': {
+            'hours': hours,
+            'interval_minutes': interval_minutes,
+            'anomaly_rate': anomaly_rate,
+            'seed': seed,
+            'repeats': repeats
+        },
+        'results': [run_benchmark(name, datasets, repeats) for name in names]
+    }
+
+def main():
+    """Command line entry point: run the detector benchmarks and save the results as JSON."""
+    parser = argparse.ArgumentParser(description="QEAIMS anomaly detector accuracy and throughput benchmarks")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Cases to run (default: all)")
+    parser.add_argument('--hours', type=int, default=720, help="Hours of history per system")
+    parser.add_argument('--interval', type=int, default=5, help="Minutes between data points")
+    parser.add_argument('--anomaly-rate', type=float, default=0.01, help="Share of points with an injected anomaly")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--repeats', type=int, default=3, help="Timed runs per case")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON file to write")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.only, args.hours, args.interval, args.anomaly_rate, args.seed, args.repeats)
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+    print(f"{'case':<36} {'precision':>9} {'recall':>7} {'samples/s':>12} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8}")
+    for result in report['results']:
+        print(f"{result['name']:<36} {result['precision']:>9.3f} {result['recall']:>7.3f} "
+              f"{result['samples_per_second']:>12.0f} {result['latency_p50_ms']:>9.3f} "
+              f"{result['latency_p99_ms']:>9.3f} {result['peak_memory_mb']:>8.1f}")
+    print(f"Saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -1,50 +1,68 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from utils.random_source import as_random_source
+from utils.telemetry_cache import cached_telemetry
+from utils.telemetry_window import TelemetryWindow, hours_of_day
+import threading
 
-def get_latest_data():
+# Width of the cache bucket for latest snapshots, in seconds
+LATEST_BUCKET_SECONDS = 5
+
+def _interval_bucket(arguments):
+    """Cache history windows for one sampling interval, when a new point appears."""
+    return arguments['interval_minutes'] * 60
+
+@cached_telemetry(LATEST_BUCKET_SECONDS)
+def get_latest_data(seed=None):
     """
     Generate latest data for the utilities monitoring system.
     This simulates real-time data from sensors across different utility systems.
+    
+    Args:
+        seed (int | RandomSource | None): Seed for reproducible values; None draws fresh entropy
     """
     # Generate current timestamp
     now = datetime.now()
     
+    # One independent random stream per system
+    rngs = as_random_source(seed).generators(['electricity', 'water', 'sewage', 'banking'])
+    
     # Generate realistic values with some randomness to simulate real data
     # Electricity data
     electricity = {
-        'load': 450 + np.random.normal(0, 15),  # MW with some variation
-        'voltage': 230 + np.random.normal(0, 2),  # V
-        'frequency': 50 + np.random.normal(0, 0.1),  # Hz
-        'health_score': 95 + np.random.normal(0, 3),  # %
-        'load_change': np.random.normal(0, 5)  # MW change
+        'load': 450 + rngs['electricity'].normal(0, 15),  # MW with some variation
+        'voltage': 230 + rngs['electricity'].normal(0, 2),  # V
+        'frequency': 50 + rngs['electricity'].normal(0, 0.1),  # Hz
+        'health_score': 95 + rngs['electricity'].normal(0, 3),  # %
+        'load_change': rngs['electricity'].normal(0, 5)  # MW change
     }
     
     # Water data
     water = {
-        'flow': 1200 + np.random.normal(0, 50),  # kL/h
-        'pressure': 5 + np.random.normal(0, 0.2),  # bar
-        'quality': 98 + np.random.normal(0, 1),  # %
-        'health_score': 93 + np.random.normal(0, 3),  # %
-        'flow_change': np.random.normal(0, 20)  # kL/h change
+        'flow': 1200 + rngs['water'].normal(0, 50),  # kL/h
+        'pressure': 5 + rngs['water'].normal(0, 0.2),  # bar
+        'quality': 98 + rngs['water'].normal(0, 1),  # %
+        'health_score': 93 + rngs['water'].normal(0, 3),  # %
+        'flow_change': rngs['water'].normal(0, 20)  # kL/h change
     }
     
     # Sewage data
     sewage = {
-        'flow': 900 + np.random.normal(0, 40),  # kL/h
-        'treatment_efficiency': 92 + np.random.normal(0, 2),  # %
-        'contaminant_level': 5 + np.random.normal(0, 1),  # ppm
-        'health_score': 90 + np.random.normal(0, 4),  # %
-        'flow_change': np.random.normal(0, 15)  # kL/h change
+        'flow': 900 + rngs['sewage'].normal(0, 40),  # kL/h
+        'treatment_efficiency': 92 + rngs['sewage'].normal(0, 2),  # %
+        'contaminant_level': 5 + rngs['sewage'].normal(0, 1),  # ppm
+        'health_score': 90 + rngs['sewage'].normal(0, 4),  # %
+        'flow_change': rngs['sewage'].normal(0, 15)  # kL/h change
     }
     
     # Banking data
     banking = {
-        'transactions': 2500 + np.random.normal(0, 100),  # transactions per second
-        'response_time': 0.2 + np.random.normal(0, 0.05),  # seconds
-        'success_rate': 99.5 + np.random.normal(0, 0.3),  # %
-        'health_score': 97 + np.random.normal(0, 2),  # %
-        'transaction_change': np.random.normal(0, 50)  # tps change
+        'transactions': 2500 + rngs['banking'].normal(0, 100),  # transactions per second
+        'response_time': 0.2 + rngs['banking'].normal(0, 0.05),  # seconds
+        'success_rate': 99.5 + rngs['banking'].normal(0, 0.3),  # %
+        'health_score': 97 + rngs['banking'].normal(0, 2),  # %
+        'transaction_change': rngs['banking'].normal(0, 50)  # tps change
     }
     
     # Combine data
@@ -58,221 +76,327 @@ def get_latest_data():
     
     return latest_data
 
-def get_historical_data(hours=24, interval_minutes=15):
+# Per-system generation profiles. Each entry describes the primary metric
+# (daily-cycle base, noise, clipping and injected anomalies), how anomalies
+# depress the health score and the extra columns exposed by get_detailed_data
+# as (mean, standard deviation) pairs.
+SYSTEM_PROFILES = {
+    'electricity': {
+        'metric': 'load',
+        'detail_metric': 'load_mw',
+        'noise': 20,
+        'clip': (50, 800),
+        'anomaly_count': 1,
+        'anomaly': (100, 20),
+        'health': (95, 10),
+        'detail_columns': {
+            'voltage': (230, 2),
+            'frequency': (50, 0.1),
+            'power_factor': (0.95, 0.02),
+            'grid_stability': (95, 3)
+        }
+    },
+    'water': {
+        'metric': 'flow',
+        'detail_metric': 'flow_kl_h',
+        'noise': 50,
+        'clip': (500, 2000),
+        'anomaly_count': 2,
+        'anomaly': (200, 50),
+        'health': (93, 20),
+        'detail_columns': {
+            'pressure_bar': (5, 0.2),
+            'turbidity_ntu': (0.5, 0.1),
+            'ph_level': (7.2, 0.2),
+            'chlorine_ppm': (1.2, 0.1)
+        }
+    },
+    'sewage': {
+        'metric': 'flow',
+        'detail_metric': 'flow_kl_h',
+        'noise': 40,
+        'clip': (400, 1500),
+        'anomaly_count': 1,
+        'anomaly': (150, 30),
+        'health': (90, 15),
+        'detail_columns': {
+            'treatment_efficiency': (92, 2),
+            'contaminant_level': (5, 1),
+            'dissolved_oxygen': (6.5, 0.5),
+            'methane_level': (2.5, 0.3)
+        }
+    },
+    'banking': {
+        'metric': 'transactions',
+        'detail_metric': 'transactions_per_second',
+        'noise': 100,
+        'clip': (100, 4000),
+        'anomaly_count': 1,
+        'anomaly': (-500, 100),
+        'health': (97, 50),
+        'detail_columns': {
+            'response_time_ms': (200, 20),
+            'success_rate': (99.5, 0.3),
+            'error_rate': (0.5, 0.3),
+            'security_index': (98, 1)
+        }
+    }
+}
+
+def _generate_timestamps(hours, interval_minutes):
     """
-    Generate historical data for the utilities monitoring system.
+    Build the timestamp grid and fractional hour of day for a history window.
     
     Args:
         hours (int): Number of hours of historical data to generate
         interval_minutes (int): Interval between data points in minutes
         
     Returns:
-        dict: Historical data for all utility systems
+        tuple: (datetime64 array of timestamps, float array of hours of day)
     """
     # Calculate number of data points
     data_points = int((hours * 60) / interval_minutes)
     
-    # Generate timestamps
     now = datetime.now()
     start_time = now - timedelta(hours=hours)
-    timestamps = [start_time + timedelta(minutes=i*interval_minutes) for i in range(data_points)]
+    step = np.timedelta64(int(interval_minutes * 60 * 1_000_000), 'us')
+    timestamps = np.datetime64(start_time, 'us') + np.arange(data_points) * step
     
-    # Create base patterns with daily cycles
-    hours_of_day = [(t.hour + t.minute/60) for t in timestamps]
+    return timestamps, hours_of_day(timestamps)
+
+def _daily_base(system, hours_of_day):
+    """
+    Compute the daily-cycle base pattern of a system's primary metric.
     
-    # Electricity load follows typical daily pattern with peak in evening
-    electricity_base = [300 + 150 * np.sin((h - 18) * np.pi / 12) for h in hours_of_day]
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+        hours_of_day (np.ndarray): Fractional hour of day for each point
+        
+    Returns:
+        np.ndarray: Base values for each point
+    """
+    if system == 'electricity':
+        # Electricity load follows typical daily pattern with peak in evening
+        return 300 + 150 * np.sin((hours_of_day - 18) * np.pi / 12)
     
-    # Water follows morning and evening peaks
-    water_base = [1000 + 300 * (np.sin((h - 8) * np.pi / 12) + np.sin((h - 20) * np.pi / 12)) for h in hours_of_day]
+    elif system == 'water':
+        # Water follows morning and evening peaks
+        return 1000 + 300 * (np.sin((hours_of_day - 8) * np.pi / 12) + np.sin((hours_of_day - 20) * np.pi / 12))
     
-    # Sewage follows water with delay
-    sewage_base = [800 + 250 * (np.sin((h - 9) * np.pi / 12) + np.sin((h - 21) * np.pi / 12)) for h in hours_of_day]
+    elif system == 'sewage':
+        # Sewage follows water with delay
+        return 800 + 250 * (np.sin((hours_of_day - 9) * np.pi / 12) + np.sin((hours_of_day - 21) * np.pi / 12))
     
     # Banking transactions follow business hours
-    banking_base = [1500 + 1500 * np.sin((h - 13) * np.pi / 8) if 8 <= h <= 20 else 500 for h in hours_of_day]
-    
-    # Add noise and anomalies
-    electricity_load = []
-    electricity_anomaly = []
-    water_flow = []
-    water_anomaly = []
-    sewage_flow = []
-    sewage_anomaly = []
-    banking_transactions = []
-    banking_anomaly = []
-    
-    # Create health scores that generally follow the main metrics but can vary independently
-    electricity_health = []
-    water_health = []
-    sewage_health = []
-    banking_health = []
-    
-    # Generate random anomaly points
-    # For simplicity, we'll create a few random anomalies
-    anomaly_points = np.random.choice(range(data_points), size=5, replace=False)
-    
-    for i in range(data_points):
-        # Add normal variation
-        elec_noise = np.random.normal(0, 20)
-        water_noise = np.random.normal(0, 50)
-        sewage_noise = np.random.normal(0, 40)
-        banking_noise = np.random.normal(0, 100)
-        
-        # Check if this is an anomaly point
-        is_elec_anomaly = i in anomaly_points[:1]  # First anomaly for electricity
-        is_water_anomaly = i in anomaly_points[1:3]  # Next two for water
-        is_sewage_anomaly = i in anomaly_points[3:4]  # One for sewage
-        is_banking_anomaly = i in anomaly_points[4:5]  # One for banking
-        
-        # Add anomaly if needed
-        elec_anomaly_value = np.random.normal(100, 20) if is_elec_anomaly else 0
-        water_anomaly_value = np.random.normal(200, 50) if is_water_anomaly else 0
-        sewage_anomaly_value = np.random.normal(150, 30) if is_sewage_anomaly else 0
-        banking_anomaly_value = np.random.normal(-500, 100) if is_banking_anomaly else 0
-        
-        # Calculate final values
-        elec_value = electricity_base[i] + elec_noise + elec_anomaly_value
-        water_value = water_base[i] + water_noise + water_anomaly_value
-        sewage_value = sewage_base[i] + sewage_noise + sewage_anomaly_value
-        banking_value = banking_base[i] + banking_noise + banking_anomaly_value
-        
-        # Make sure values are realistic (especially for health scores)
-        elec_value = max(50, min(elec_value, 800))
-        water_value = max(500, min(water_value, 2000))
-        sewage_value = max(400, min(sewage_value, 1500))
-        banking_value = max(100, min(banking_value, 4000))
+    return np.where(
+        (hours_of_day >= 8) & (hours_of_day <= 20),
+        1500 + 1500 * np.sin((hours_of_day - 13) * np.pi / 8),
+        500
+    )
+
+def _normal(rng, mean, std, size, dtype):
+    """
+    Draw normally distributed values directly in the requested dtype.
+    
+    Args:
+        rng (np.random.Generator): Generator to draw from
+        mean (float): Mean of the distribution
+        std (float): Standard deviation of the distribution
+        size (int): Number of values to draw
+        dtype (np.dtype): np.float32 or np.float64
         
-        # Calculate health scores (inversely affected by anomalies)
-        elec_health = 95 - (abs(elec_anomaly_value) / 10) + np.random.normal(0, 2)
-        water_health_value = 93 - (abs(water_anomaly_value) / 20) + np.random.normal(0, 2)
-        sewage_health_value = 90 - (abs(sewage_anomaly_value) / 15) + np.random.normal(0, 2)
-        banking_health_value = 97 - (abs(banking_anomaly_value) / 50) + np.random.normal(0, 2)
+    Returns:
+        np.ndarray: Drawn values
+    """
+    values = rng.standard_normal(size, dtype=dtype)
+    values *= std
+    values += mean
+    return values
+
+def generate_system_columns(system, hours_of_day, detailed=False, dtype=np.float64, seed=None, anomaly_count=None):
+    """
+    Generate the columns of a single utility system as NumPy arrays.
+    
+    Only the requested system is synthesized, so callers interested in one
+    system do not pay for the other three. Every column draws from its own
+    child stream of seed, so the primary metric, anomalies and health score
+    are identical whether or not the detail columns are generated.
+    
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+        hours_of_day (np.ndarray): Fractional hour of day for each point
+        detailed (bool): Whether to also generate the system's detail columns
+        dtype (np.dtype): Floating point dtype of the generated metrics
+        seed (int | RandomSource | None): Seed for this system's streams
+        anomaly_count (int): Number of anomalies to inject, defaults to the profile's count
         
-        # Ensure health scores are between 0 and 100
-        elec_health = max(0, min(elec_health, 100))
-        water_health_value = max(0, min(water_health_value, 100))
-        sewage_health_value = max(0, min(sewage_health_value, 100))
-        banking_health_value = max(0, min(banking_health_value, 100))
+    Returns:
+        dict: Column name to array, keyed by the detail names when detailed is True
+    """
+    profile = SYSTEM_PROFILES[system]
+    data_points = len(hours_of_day)
+    if anomaly_count is None:
+        anomaly_count = profile['anomaly_count']
+    rngs = as_random_source(seed).generators(['value', 'anomaly', 'health_score'] + list(profile['detail_columns']))
+    
+    # Anomaly offsets are zero everywhere except at a few random points
+    anomaly_points = rngs['anomaly'].choice(data_points, size=min(anomaly_count, data_points), replace=False)
+    anomaly_value = np.zeros(data_points, dtype=dtype)
+    anomaly_value[anomaly_points] = rngs['anomaly'].normal(*profile['anomaly'], size=len(anomaly_points))
+    anomaly = np.zeros(data_points, dtype=bool)
+    anomaly[anomaly_points] = True
+    
+    # Add normal variation and anomalies, keeping values realistic
+    value = _normal(rngs['value'], 0, profile['noise'], data_points, dtype)
+    value += _daily_base(system, hours_of_day)
+    value += anomaly_value
+    np.clip(value, *profile['clip'], out=value)
+    
+    # Calculate health scores (inversely affected by anomalies) between 0 and 100
+    health_base, health_divisor = profile['health']
+    health_score = _normal(rngs['health_score'], health_base, 2, data_points, dtype)
+    np.abs(anomaly_value, out=anomaly_value)
+    anomaly_value /= health_divisor
+    health_score -= anomaly_value
+    np.clip(health_score, 0, 100, out=health_score)
+    
+    if not detailed:
+        return {
+            profile['metric']: value,
+            'anomaly': anomaly,
+            'health_score': health_score
+        }
+    
+    columns = {profile['detail_metric']: value}
+    for column, (mean, std) in profile['detail_columns'].items():
+        columns[column] = _normal(rngs[column], mean, std, data_points, dtype)
+    columns['anomaly'] = anomaly
+    columns['health_score'] = health_score
+    
+    return columns
+
+# Rolling history windows, one per (system, hours, interval)
+_WINDOWS = {}
+_WINDOWS_LOCK = threading.Lock()
+
+def get_telemetry_window(system, hours=24, interval_minutes=15):
+    """
+    Get the process-wide rolling history window of a system.
+    
+    The window holds the system's detailed columns and is refreshed
+    incrementally, generating only the samples due since the last refresh.
+    
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+        hours (int): Length of the window in hours
+        interval_minutes (int): Interval between data points in minutes
         
-        # Append values and anomaly flags
-        electricity_load.append(elec_value)
-        electricity_anomaly.append(is_elec_anomaly)
-        water_flow.append(water_value)
-        water_anomaly.append(is_water_anomaly)
-        sewage_flow.append(sewage_value)
-        sewage_anomaly.append(is_sewage_anomaly)
-        banking_transactions.append(banking_value)
-        banking_anomaly.append(is_banking_anomaly)
+    Returns:
+        TelemetryWindow: The system's window
+    """
+    key = (system, hours, interval_minutes)
+    with _WINDOWS_LOCK:
+        window = _WINDOWS.get(key)
+        if window is None:
+            window = TelemetryWindow(
+                lambda hours_of_day, anomaly_count, seed: generate_system_columns(
+                    system, hours_of_day, detailed=True, seed=seed, anomaly_count=anomaly_count
+                ),
+                hours=hours,
+                interval_minutes=interval_minutes,
+                anomaly_count=SYSTEM_PROFILES[system]['anomaly_count']
+            )
+            _WINDOWS[key] = window
+    return window
+
+@cached_telemetry(_interval_bucket)
+def get_historical_data(hours=24, interval_minutes=15, seed=None):
+    """
+    Generate historical data for the utilities monitoring system.
+    
+    Without a seed, data comes from the rolling per-system windows, which
+    only generate the points added since the previous call; the returned
+    arrays are copies taken under each window's lock. With a seed, the whole
+    history is generated in one vectorized pass per system: noise is drawn
+    once per metric, daily-cycle bases are computed from a datetime64 array
+    and anomalies are placed by fancy indexing.
+    
+    Args:
+        hours (int): Number of hours of historical data to generate
+        interval_minutes (int): Interval between data points in minutes
+        seed (int | RandomSource | None): Seed for reproducible data; None reads the rolling windows
         
-        # Append health scores
-        electricity_health.append(elec_health)
-        water_health.append(water_health_value)
-        sewage_health.append(sewage_health_value)
-        banking_health.append(banking_health_value)
+    Returns:
+        dict: Historical data for all utility systems
+    """
+    if seed is None:
+        now = datetime.now()
+        historical_data = {}
+        for system, profile in SYSTEM_PROFILES.items():
+            window = get_telemetry_window(system, hours, interval_minutes)
+            window.refresh(now)
+            snapshot = window.snapshot()
+            historical_data['timestamp'] = pd.DatetimeIndex(snapshot['timestamp'])
+            historical_data[system] = {
+                profile['metric']: snapshot[profile['detail_metric']],
+                'anomaly': snapshot['anomaly'],
+                'health_score': snapshot['health_score']
+            }
+        return historical_data
+    
+    timestamps, hours_of_day = _generate_timestamps(hours, interval_minutes)
+    sources = as_random_source(seed).spawn(SYSTEM_PROFILES)
     
     # Create historical data structure
-    historical_data = {
-        'timestamp': timestamps,
-        'electricity': {
-            'load': electricity_load,
-            'anomaly': electricity_anomaly,
-            'health_score': electricity_health
-        },
-        'water': {
-            'flow': water_flow,
-            'anomaly': water_anomaly,
-            'health_score': water_health
-        },
-        'sewage': {
-            'flow': sewage_flow,
-            'anomaly': sewage_anomaly,
-            'health_score': sewage_health
-        },
-        'banking': {
-            'transactions': banking_transactions,
-            'anomaly': banking_anomaly,
-            'health_score': banking_health
-        }
-    }
+    historical_data = {'timestamp': pd.DatetimeIndex(timestamps)}
+    for system in SYSTEM_PROFILES:
+        historical_data[system] = generate_system_columns(system, hours_of_day, seed=sources[system])
     
     return historical_data
 
-def get_detailed_data(system, hours=24):
+@cached_telemetry(_interval_bucket)
+def get_detailed_data(system, hours=24, interval_minutes=15, dtype=np.float64, seed=None):
     """
     Generate more detailed data for a specific utility system.
     
+    Only the requested system's columns are generated, directly into NumPy
+    arrays of the requested dtype. Without a seed, the data is read from the
+    system's rolling window and matches get_historical_data. With the same
+    seed and dtype, the primary metric, anomalies and health score match
+    those of a seeded get_historical_data.
+    
     Args:
         system (str): The utility system to generate data for ('electricity', 'water', 'sewage', 'banking')
         hours (int): Number of hours of historical data to generate
+        interval_minutes (int): Interval between data points in minutes
+        dtype (np.dtype): Floating point dtype of the metric columns (e.g. np.float32)
+        seed (int | RandomSource | None): Seed for reproducible data; None reads the rolling window
         
     Returns:
         pd.DataFrame: Detailed data for the specified system
     """
-    # Get base historical data
-    historical = get_historical_data(hours=hours)
-    timestamps = historical['timestamp']
+    if seed is None and system in SYSTEM_PROFILES:
+        window = get_telemetry_window(system, hours, interval_minutes)
+        window.refresh()
+        data = pd.DataFrame(window.snapshot())
+        metric_columns = data.columns.drop(['timestamp', 'anomaly'])
+        return data.astype(dict.fromkeys(metric_columns, dtype))
     
-    if system == 'electricity':
-        # Generate additional electricity metrics
-        data = {
-            'timestamp': timestamps,
-            'load_mw': historical['electricity']['load'],
-            'voltage': [230 + np.random.normal(0, 2) for _ in range(len(timestamps))],
-            'frequency': [50 + np.random.normal(0, 0.1) for _ in range(len(timestamps))],
-            'power_factor': [0.95 + np.random.normal(0, 0.02) for _ in range(len(timestamps))],
-            'grid_stability': [95 + np.random.normal(0, 3) for _ in range(len(timestamps))],
-            'anomaly': historical['electricity']['anomaly'],
-            'health_score': historical['electricity']['health_score']
-        }
+    timestamps, hours_of_day = _generate_timestamps(hours, interval_minutes)
+    data_points = len(timestamps)
+    sources = as_random_source(seed).spawn(list(SYSTEM_PROFILES) + ['default'])
     
-    elif system == 'water':
-        # Generate additional water metrics
-        data = {
-            'timestamp': timestamps,
-            'flow_kl_h': historical['water']['flow'],
-            'pressure_bar': [5 + np.random.normal(0, 0.2) for _ in range(len(timestamps))],
-            'turbidity_ntu': [0.5 + np.random.normal(0, 0.1) for _ in range(len(timestamps))],
-            'ph_level': [7.2 + np.random.normal(0, 0.2) for _ in range(len(timestamps))],
-            'chlorine_ppm': [1.2 + np.random.normal(0, 0.1) for _ in range(len(timestamps))],
-            'anomaly': historical['water']['anomaly'],
-            'health_score': historical['water']['health_score']
-        }
+    data = {'timestamp': timestamps}
     
-    elif system == 'sewage':
-        # Generate additional sewage metrics
-        data = {
-            'timestamp': timestamps,
-            'flow_kl_h': historical['sewage']['flow'],
-            'treatment_efficiency': [92 + np.random.normal(0, 2) for _ in range(len(timestamps))],
-            'contaminant_level': [5 + np.random.normal(0, 1) for _ in range(len(timestamps))],
-            'dissolved_oxygen': [6.5 + np.random.normal(0, 0.5) for _ in range(len(timestamps))],
-            'methane_level': [2.5 + np.random.normal(0, 0.3) for _ in range(len(timestamps))],
-            'anomaly': historical['sewage']['anomaly'],
-            'health_score': historical['sewage']['health_score']
-        }
-    
-    elif system == 'banking':
-        # Generate additional banking metrics
-        data = {
-            'timestamp': timestamps,
-            'transactions_per_second': historical['banking']['transactions'],
-            'response_time_ms': [200 + np.random.normal(0, 20) for _ in range(len(timestamps))],
-            'success_rate': [99.5 + np.random.normal(0, 0.3) for _ in range(len(timestamps))],
-            'error_rate': [0.5 + np.random.normal(0, 0.3) for _ in range(len(timestamps))],
-            'security_index': [98 + np.random.normal(0, 1) for _ in range(len(timestamps))],
-            'anomaly': historical['banking']['anomaly'],
-            'health_score': historical['banking']['health_score']
-        }
+    if system in SYSTEM_PROFILES:
+        data.update(generate_system_columns(system, hours_of_day, detailed=True, dtype=dtype, seed=sources[system]))
     
     else:
         # Default case with basic data
-        data = {
-            'timestamp': timestamps,
-            'value': [np.random.normal(100, 10) for _ in range(len(timestamps))],
-            'anomaly': [False for _ in range(len(timestamps))],
-            'health_score': [90 + np.random.normal(0, 3) for _ in range(len(timestamps))]
-        }
+        rngs = sources['default'].generators(['value', 'health_score'])
+        data['value'] = _normal(rngs['value'], 100, 10, data_points, dtype)
+        data['anomaly'] = np.zeros(data_points, dtype=bool)
+        data['health_score'] = _normal(rngs['health_score'], 90, 3, data_points, dtype)
     
     return pd.DataFrame(data)
 
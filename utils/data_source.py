@@ -0,0 +1,983 @@
+import argparse
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Protocol
+
+import numpy as np
+import pandas as pd
+
+from utils import data_generator
+from utils.data_generator import SYSTEM_PROFILES
+from utils.historical_store import HistoricalStore
+from utils.shared_state import SharedLatestState
+from utils.ring_buffer import RingBuffer
+from utils.rollups import DEFAULT_CHART_WIDTH, RollupSet
+from utils.streaming_detector import StreamingDetector
+from utils.half_space_trees import HalfSpaceTrees
+
+# Fields of the latest snapshot, as (record column, scale) per system
+LATEST_FIELDS = {
+    'electricity': {
+        'load': ('load_mw', 1),
+        'voltage': ('voltage', 1),
+        'frequency': ('frequency', 1),
+        'health_score': ('health_score', 1)
+    },
+    'water': {
+        'flow': ('flow_kl_h', 1),
+        'pressure': ('pressure_bar', 1),
+        'quality': ('quality', 1),
+        'health_score': ('health_score', 1)
+    },
+    'sewage': {
+        'flow': ('flow_kl_h', 1),
+        'treatment_efficiency': ('treatment_efficiency', 1),
+        'contaminant_level': ('contaminant_level', 1),
+        'health_score': ('health_score', 1)
+    },
+    'banking': {
+        'transactions': ('transactions_per_second', 1),
+        'response_time': ('response_time_ms', 0.001),
+        'success_rate': ('success_rate', 1),
+        'health_score': ('health_score', 1)
+    }
+}
+
+# Snapshot field holding the change of the primary metric since the previous sample
+CHANGE_FIELDS = {
+    'electricity': 'load_change',
+    'water': 'flow_change',
+    'sewage': 'flow_change',
+    'banking': 'transaction_change'
+}
+
+# Snapshot flags set by the streaming and online detectors every source runs on ingest
+STREAM_FLAGS = ['stream_alarm', 'online_anomaly']
+
+# Fixed (system, field) order of snapshot values in the shared latest-state ring
+LATEST_LAYOUT = [
+    (system, field)
+    for system, fields in LATEST_FIELDS.items()
+    for field in [*fields, CHANGE_FIELDS[system], *STREAM_FLAGS]
+]
+
+def detail_columns(system):
+    """
+    Get the metric columns of a system's detailed data.
+
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+
+    Returns:
+        list: Metric column names, primary metric first
+    """
+    profile = SYSTEM_PROFILES[system]
+    return [profile['detail_metric'], *profile['detail_columns']]
+
+def record_columns(system):
+    """
+    Get the columns of an ingested record of a system.
+
+    Records carry the detailed metrics, any snapshot-only fields (e.g. water
+    quality), the anomaly flag and the health score.
+
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+
+    Returns:
+        list: Record column names
+    """
+    columns = detail_columns(system)
+    columns += [column for column, _ in LATEST_FIELDS[system].values() if column not in columns and column != 'health_score']
+    return columns + ['anomaly', 'health_score']
+
+class DataSource(Protocol):
+    """
+    Interface every telemetry source implements.
+
+    The dashboard reads all telemetry through the active source, so synthetic,
+    replayed and live data go through the same code paths.
+    """
+
+    def latest(self):
+        """Return the latest snapshot of all systems (structure of get_latest_data)."""
+
+    def historical(self, hours=24, interval_minutes=15):
+        """Return the overview history of all systems (structure of get_historical_data)."""
+
+    def history(self, system, hours=24, interval_minutes=15, columns=None):
+        """Return the detailed history of one system (structure of get_detailed_data), optionally projected."""
+
+    def rollup(self, system, hours=24, width_px=DEFAULT_CHART_WIDTH):
+        """Return aggregated history of one system at the rollup tier fitting the chart width."""
+
+    def reservoir(self, system, hours=24, interval_minutes=15):
+        """Return the StreamReservoir fed with the records behind history(), or None if there is none."""
+
+def _project(frame, columns):
+    """Keep the timestamp and the requested columns of a history frame; None keeps all."""
+    if columns is None:
+        return frame
+    return frame[['timestamp', *[column for column in columns if column != 'timestamp']]]
+
+class IngestScorer:
+    """
+    Streaming and online anomaly scoring of ingested records, per system.
+
+    Every record is scored by a StreamingDetector and, once a window of
+    complete records has arrived, by an online HalfSpaceTrees model fitted on
+    that window. flags() reports their verdicts on the newest record under
+    the names in STREAM_FLAGS.
+    """
+
+    def __init__(self, online_window=1000):
+        """
+        Args:
+            online_window (int): Records per mass window of the online model, also used to fit it
+        """
+        self.online_window = online_window
+        self.detector = StreamingDetector({system: detail_columns(system) for system in SYSTEM_PROFILES})
+        self.online_models = dict.fromkeys(SYSTEM_PROFILES)
+        self._online_anomaly = dict.fromkeys(SYSTEM_PROFILES, False)
+        self._pending = {system: [] for system in SYSTEM_PROFILES}
+
+    def score(self, system, features):
+        """
+        Score a batch of records of one system, in ingest order.
+
+        Args:
+            system (str): The utility system the records belong to
+            features (np.ndarray): (records, detail columns) values; NaN marks a missing value
+        """
+        self.detector.update_batch(system, features)
+        complete = features[np.isfinite(features).all(axis=1)]
+        model = self.online_models[system]
+        if model is None:
+            # Fit the online model once a first window of complete records has arrived
+            pending = self._pending[system]
+            pending.append(complete)
+            history = np.concatenate(pending)[-self.online_window:]
+            self._pending[system] = [history]
+            if len(history) >= self.online_window:
+                self.online_models[system] = HalfSpaceTrees(window_size=self.online_window, random_state=42).fit(history)
+                self._pending[system] = []
+            return
+
+        if len(complete):
+            self._online_anomaly[system] = bool(model.score_partial_fit(complete)[-1] == -1)
+
+    def flags(self, system):
+        """
+        Get the detectors' verdicts on the newest record of a system.
+
+        Returns:
+            dict: Flag name (see STREAM_FLAGS) to bool
+        """
+        return {'stream_alarm': self.detector.alarming(system), 'online_anomaly': self._online_anomaly[system]}
+
+class SyntheticSource:
+    """
+    Data source backed by the synthetic generator in utils.data_generator.
+
+    The samples of each system's default history window are scored by an
+    IngestScorer as the window refreshes, so the latest snapshot carries the
+    same detector flags as the buffered sources.
+    """
+
+    def __init__(self, online_window=96):
+        """
+        Args:
+            online_window (int): Samples per mass window of the online model (96 is a day at 15 minutes)
+        """
+        self.scorer = IngestScorer(online_window)
+        self._scored = dict.fromkeys(SYSTEM_PROFILES)
+        self._lock = threading.Lock()
+
+    def _score_new_samples(self):
+        with self._lock:
+            for system in SYSTEM_PROFILES:
+                window = data_generator.get_telemetry_window(system)
+                window.refresh()
+                samples = window.snapshot()
+                if not samples:
+                    continue
+                timestamps = samples['timestamp']
+                newest = self._scored[system]
+                start = 0 if newest is None else np.searchsorted(timestamps, newest, side='right')
+                if start < len(timestamps):
+                    features = np.column_stack([samples[column][start:] for column in detail_columns(system)])
+                    self.scorer.score(system, features.astype(np.float64))
+                    self._scored[system] = timestamps[-1]
+
+    def latest(self):
+        self._score_new_samples()
+        latest_data = data_generator.get_latest_data()
+        # The generator's snapshot is shared through its cache, so the flags go into copies
+        return {
+            key: {**value, **self.scorer.flags(key)} if key in SYSTEM_PROFILES else value
+            for key, value in latest_data.items()
+        }
+
+    def historical(self, hours=24, interval_minutes=15):
+        return data_generator.get_historical_data(hours=hours, interval_minutes=interval_minutes)
+
+    def history(self, system, hours=24, interval_minutes=15, columns=None):
+        return _project(data_generator.get_detailed_data(system, hours=hours, interval_minutes=interval_minutes), columns)
+
+    def rollup(self, system, hours=24, width_px=DEFAULT_CHART_WIDTH):
+        # Same window as history() at the default interval, so charts match the raw data
+        window = data_generator.get_telemetry_window(system, hours)
+        window.refresh()
+        return window.rollup(width_px)
+
+    def reservoir(self, system, hours=24, interval_minutes=15):
+        return data_generator.get_telemetry_window(system, hours, interval_minutes).reservoir
+
+class BufferedSource:
+    """
+    Base class for sources that ingest records into per-system ring buffers.
+
+    Records are appended in batches into one RingBuffer per system, so ingest
+    costs O(batch) and readers slice the newest rows without scanning. History
+    windows are measured back from the newest record, not the wall clock, so a
+    replayed file looks the same whenever it is played. Every ingested record
+    is also scored by an IngestScorer, whose verdicts on the newest record
+    are reported in the latest snapshot (see STREAM_FLAGS).
+    """
+
+    def __init__(self, capacity=250_000, online_window=1000):
+        """
+        Args:
+            capacity (int): Number of records kept per system
+            online_window (int): Records per mass window of the online model, also used to fit it
+        """
+        self.capacity = capacity
+        self.scorer = IngestScorer(online_window)
+        self._buffers = {
+            system: RingBuffer(capacity, {'timestamp': 'datetime64[us]', **dict.fromkeys(record_columns(system), np.float64)})
+            for system in SYSTEM_PROFILES
+        }
+        self._rollups = {
+            system: RollupSet([*detail_columns(system), 'anomaly', 'health_score'])
+            for system in SYSTEM_PROFILES
+        }
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.samples_ingested = 0
+
+    def ingest(self, system, timestamps, values):
+        """
+        Append a batch of records of one system.
+
+        Args:
+            system (str): The utility system the records belong to
+            timestamps (array-like): Record timestamps, in ascending order
+            values (dict): Record column to array of values; missing columns are stored as NaN
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[us]')
+        count = len(timestamps)
+        columns = {'timestamp': timestamps}
+        for column in record_columns(system):
+            column_values = values.get(column)
+            columns[column] = np.full(count, np.nan) if column_values is None else np.asarray(column_values, dtype=np.float64)
+
+        with self._lock:
+            self._buffers[system].append(columns)
+            self._rollups[system].ingest(timestamps, {
+                column: np.nan_to_num(columns[column]) if column == 'anomaly' else columns[column]
+                for column in self._rollups[system].columns
+            })
+            self.scorer.score(system, np.column_stack([columns[column] for column in detail_columns(system)]))
+            self.samples_ingested += count
+
+    def throughput(self):
+        """
+        Get the average ingest rate since the source was created.
+
+        Returns:
+            float: Records ingested per second
+        """
+        return self.samples_ingested / max(time.perf_counter() - self._started, 1e-9)
+
+    def latest(self):
+        latest_data = {}
+        newest = []
+
+        with self._lock:
+            for system, fields in LATEST_FIELDS.items():
+                view = self._buffers[system].view()
+                primary = detail_columns(system)[0]
+                snapshot = {}
+                for field, (column, scale) in fields.items():
+                    snapshot[field] = float(view[column][-1]) * scale if len(view[column]) else np.nan
+                if len(view[primary]) >= 2:
+                    snapshot[CHANGE_FIELDS[system]] = float(view[primary][-1] - view[primary][-2])
+                else:
+                    snapshot[CHANGE_FIELDS[system]] = 0.0
+                snapshot.update(self.scorer.flags(system))
+                if len(view['timestamp']):
+                    newest.append(view['timestamp'][-1])
+                latest_data[system] = snapshot
+
+        latest_data['timestamp'] = pd.Timestamp(max(newest)).to_pydatetime() if newest else datetime.now()
+        return latest_data
+
+    def history(self, system, hours=24, interval_minutes=15, columns=None):
+        projection = columns
+        columns = detail_columns(system)
+
+        with self._lock:
+            view = self._buffers[system].view()
+            timestamps = view['timestamp']
+            start = 0
+            if len(timestamps):
+                start = np.searchsorted(timestamps, timestamps[-1] - np.timedelta64(int(hours * 3600), 's'), side='right')
+            frame = pd.DataFrame({name: view[name][start:].copy() for name in ['timestamp', *columns, 'anomaly', 'health_score']})
+
+        if interval_minutes and not frame.empty:
+            # Average onto the requested interval grid, flagging a bucket if any record in it was anomalous
+            frame = frame.set_index('timestamp').resample(f'{interval_minutes}min').agg(
+                {**dict.fromkeys([*columns, 'health_score'], 'mean'), 'anomaly': 'max'}
+            )
+            frame = frame.dropna(subset=[columns[0]]).reset_index()
+
+        frame['anomaly'] = frame['anomaly'].fillna(0) > 0
+        return _project(frame[['timestamp', *columns, 'anomaly', 'health_score']], projection)
+
+    def rollup(self, system, hours=24, width_px=DEFAULT_CHART_WIDTH):
+        with self._lock:
+            timestamps = self._buffers[system].view()['timestamp']
+            end = timestamps[-1] if len(timestamps) else np.datetime64(datetime.now(), 'us')
+            return self._rollups[system].query(end - np.timedelta64(int(hours * 3600), 's'), end, width_px)
+
+    def reservoir(self, system, hours=24, interval_minutes=15):
+        # history() resamples the records onto the interval grid, so a sample of raw records would not match it
+        return None
+
+    def historical(self, hours=24, interval_minutes=15):
+        frames = {system: self.history(system, hours, interval_minutes) for system in SYSTEM_PROFILES}
+
+        # Align every system onto one common timestamp axis
+        timestamps = pd.DatetimeIndex(sorted(set().union(*(frame['timestamp'] for frame in frames.values()))))
+        historical_data = {'timestamp': timestamps}
+        for system, frame in frames.items():
+            aligned = frame.set_index('timestamp').reindex(timestamps)
+            historical_data[system] = {
+                SYSTEM_PROFILES[system]['metric']: aligned[detail_columns(system)[0]].to_numpy(),
+                'anomaly': aligned['anomaly'].fillna(False).to_numpy(dtype=bool),
+                'health_score': aligned['health_score'].to_numpy()
+            }
+        return historical_data
+
+class FileReplaySource(BufferedSource):
+    """
+    Data source replaying recorded telemetry from a CSV or Parquet file.
+
+    The file holds one record per row with a 'timestamp' column, a 'system'
+    column and any record columns (see record_columns). Reading Parquet
+    requires pyarrow.
+    """
+
+    def __init__(self, path, speed=None, loop=False, capacity=250_000):
+        """
+        Args:
+            path (str): Path of a .csv or .parquet file
+            speed (float): Replay speed relative to real time; None ingests the whole file at once
+            loop (bool): Whether to restart from the beginning at the end of the file
+            capacity (int): Number of records kept per system
+        """
+        super().__init__(capacity)
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self._records = self._read(path)
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _read(path):
+        if str(path).endswith('.parquet'):
+            records = pd.read_parquet(path)
+        else:
+            records = pd.read_csv(path, parse_dates=['timestamp'])
+        records['timestamp'] = pd.to_datetime(records['timestamp']).astype('datetime64[us]')
+        return records.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+    def start(self):
+        """Start replaying the file."""
+        if self.speed is None:
+            self._ingest_rows(self._records)
+            return
+
+        self._thread = threading.Thread(target=self._replay, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop a running replay."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _ingest_rows(self, rows, offset=np.timedelta64(0, 'us')):
+        for system, group in rows.groupby('system', sort=False):
+            if system in SYSTEM_PROFILES:
+                self.ingest(
+                    system,
+                    group['timestamp'].to_numpy() + offset,
+                    {column: group[column].to_numpy() for column in record_columns(system) if column in group}
+                )
+
+    def _replay(self):
+        timestamps = self._records['timestamp'].to_numpy()
+        if len(timestamps) == 0:
+            return
+
+        span = timestamps[-1] - timestamps[0] + np.timedelta64(1, 's')
+        offset = np.timedelta64(0, 'us')
+        position = 0
+        started = time.perf_counter()
+
+        while not self._stop.is_set():
+            # Ingest every record whose file time has been reached
+            elapsed = np.timedelta64(int((time.perf_counter() - started) * self.speed * 1_000_000), 'us')
+            end = np.searchsorted(timestamps, timestamps[0] + elapsed, side='right')
+            if end > position:
+                self._ingest_rows(self._records.iloc[position:end], offset)
+                position = end
+
+            if position >= len(timestamps):
+                if not self.loop:
+                    return
+                # Shift the next pass past the previous one so timestamps keep increasing
+                offset += span
+                position = 0
+                started = time.perf_counter()
+
+            self._stop.wait(0.05)
+
+def parse_line_protocol(lines):
+    """
+    Parse telemetry lines into per-system column batches.
+
+    Each line reads `<system> <column>=<value>[,<column>=<value>...] [<timestamp>]`,
+    where the optional timestamp is in nanoseconds since the epoch of the
+    dashboard's naive local clock, e.g. `np.datetime64(datetime.now(), 'ns')`.
+    Lines for unknown systems and malformed lines are skipped.
+
+    Args:
+        lines (iterable): Lines as bytes
+
+    Returns:
+        dict: System to (timestamps array, dict of record column to array)
+    """
+    now = np.datetime64(datetime.now(), 'ns').astype(np.int64)
+    rows = {system: ([], []) for system in SYSTEM_PROFILES}
+
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        system_rows = rows.get(parts[0].decode(errors='replace'))
+        if system_rows is None:
+            continue
+        try:
+            fields = {key.decode(): float(value) for key, value in (field.split(b'=', 1) for field in parts[1].split(b','))}
+            timestamp = int(parts[2]) if len(parts) > 2 else now
+        except ValueError:
+            continue
+        system_rows[0].append(timestamp)
+        system_rows[1].append(fields)
+
+    batches = {}
+    for system, (timestamps, records) in rows.items():
+        if timestamps:
+            batches[system] = (
+                np.array(timestamps, dtype='datetime64[ns]'),
+                {column: np.array([record.get(column, np.nan) for record in records]) for column in record_columns(system)}
+            )
+    return batches
+
+class _LineDatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, source):
+        self.source = source
+
+    def datagram_received(self, data, addr):
+        self.source.ingest_lines(data.split(b'\n'))
+
+class SocketSource(BufferedSource):
+    """
+    Data source receiving line-protocol telemetry over TCP or UDP.
+
+    An asyncio server runs in a background thread. TCP connections are read
+    in large chunks and every complete line in a chunk is parsed and ingested
+    as one batch per system; each UDP datagram may carry several lines.
+    """
+
+    def __init__(self, host='127.0.0.1', port=9009, protocol='tcp', capacity=250_000):
+        """
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on; 0 picks a free port
+            protocol (str): 'tcp' or 'udp'
+            capacity (int): Number of records kept per system
+        """
+        super().__init__(capacity)
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self._loop = None
+        self._stopped = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start listening; returns once the socket is bound."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        """Stop listening and wait for the server thread to exit."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+            self._thread.join()
+
+    def ingest_lines(self, lines):
+        """
+        Parse and ingest a batch of telemetry lines.
+
+        Args:
+            lines (iterable): Lines as bytes
+        """
+        for system, (timestamps, values) in parse_line_protocol(lines).items():
+            self.ingest(system, timestamps, values)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._serve())
+        self._loop.close()
+
+    async def _serve(self):
+        self._stopped = asyncio.Event()
+
+        if self.protocol == 'udp':
+            transport, _ = await self._loop.create_datagram_endpoint(
+                lambda: _LineDatagramProtocol(self), local_addr=(self.host, self.port)
+            )
+            self.port = transport.get_extra_info('sockname')[1]
+            self._ready.set()
+            await self._stopped.wait()
+            transport.close()
+            return
+
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await self._stopped.wait()
+
+    async def _handle_connection(self, reader, writer):
+        pending = b''
+        while chunk := await reader.read(1 << 16):
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            self.ingest_lines(lines)
+        if pending:
+            self.ingest_lines([pending])
+        writer.close()
+
+class PersistentSource:
+    """
+    Data source persisting the history of another source in a HistoricalStore.
+
+    Every completed day of history is written to the store once, in one
+    batch per day. Later reads take stored days from disk, reading only the
+    requested columns and days, and only the current (still open) day and
+    days the store does not cover from the wrapped source.
+    """
+
+    def __init__(self, source, store):
+        """
+        Args:
+            source (DataSource): Source producing the history
+            store (HistoricalStore): Store to persist completed days in
+        """
+        self.source = source
+        self.store = store
+
+    def start(self):
+        if hasattr(self.source, 'start'):
+            self.source.start()
+
+    def stop(self):
+        if hasattr(self.source, 'stop'):
+            self.source.stop()
+
+    def latest(self):
+        return self.source.latest()
+
+    def historical(self, hours=24, interval_minutes=15):
+        return self.source.historical(hours=hours, interval_minutes=interval_minutes)
+
+    def rollup(self, system, hours=24, width_px=DEFAULT_CHART_WIDTH):
+        return self.source.rollup(system, hours=hours, width_px=width_px)
+
+    def reservoir(self, system, hours=24, interval_minutes=15):
+        return self.source.reservoir(system, hours=hours, interval_minutes=interval_minutes)
+
+    def history(self, system, hours=24, interval_minutes=15, columns=None):
+        frame = self.source.history(system, hours=hours, interval_minutes=interval_minutes)
+        stored = self.store.days(system, interval_minutes)
+
+        # Like the wrapped sources, measure the window back from the newest record
+        end = frame['timestamp'].iloc[-1].to_pydatetime() if not frame.empty else datetime.now()
+        start = end - timedelta(hours=hours)
+        today = end.date()
+
+        # Persist the days before today that the source covers from their first interval on
+        if not frame.empty:
+            first = frame['timestamp'].iloc[0]
+            first_complete = first.date()
+            if first - first.normalize() >= timedelta(minutes=interval_minutes):
+                first_complete += timedelta(days=1)
+            days = frame['timestamp'].dt.date
+            complete = (days >= first_complete) & (days < today) & ~days.isin(stored)
+            if complete.any():
+                self.store.write(system, interval_minutes, frame[complete])
+                stored = stored | set(days[complete])
+
+        # Stored days come from disk, everything else from the source
+        from_store = self.store.read(system, interval_minutes, start, end, columns)
+        from_source = _project(frame[~frame['timestamp'].dt.date.isin(stored)], columns)
+        if from_store.empty:
+            return from_source.reset_index(drop=True)
+        return pd.concat([from_store, from_source], ignore_index=True).sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+class SharedStateSource:
+    """
+    Data source reading the latest snapshot from a shared memory-mapped ring.
+
+    A single producer (see publish_latest) writes snapshots of one source
+    into a SharedLatestState file; every dashboard process reads them from
+    the mapping, so all processes agree on the current numbers. History is
+    still read from the wrapped source.
+    """
+
+    def __init__(self, source, path):
+        """
+        Args:
+            source (DataSource): Source for history, and for snapshots until the ring can be read
+            path (str): Path of the ring file
+        """
+        self.source = source
+        self.path = path
+        self._state = None
+
+    def start(self):
+        if hasattr(self.source, 'start'):
+            self.source.start()
+
+    def stop(self):
+        if hasattr(self.source, 'stop'):
+            self.source.stop()
+
+    def latest(self):
+        if self._state is not None and self._state.replaced():
+            # A restarted producer moved a new ring into place
+            self._state.close()
+            self._state = None
+        if self._state is None and SharedLatestState.exists(self.path):
+            try:
+                self._state = SharedLatestState(self.path, [f"{system}.{field}" for system, field in LATEST_LAYOUT])
+            except (OSError, ValueError):
+                # Not (fully) created yet; read the wrapped source and retry on the next call
+                pass
+
+        snapshot = self._state.read() if self._state is not None else None
+        if snapshot is None:
+            return self.source.latest()
+
+        _, timestamp, values = snapshot
+        latest_data = {'timestamp': timestamp.astype(datetime)}
+        for (system, field), value in zip(LATEST_LAYOUT, values):
+            latest_data.setdefault(system, {})[field] = bool(value) if field in STREAM_FLAGS else float(value)
+        return latest_data
+
+    def historical(self, hours=24, interval_minutes=15):
+        return self.source.historical(hours=hours, interval_minutes=interval_minutes)
+
+    def history(self, system, hours=24, interval_minutes=15, columns=None):
+        return self.source.history(system, hours=hours, interval_minutes=interval_minutes, columns=columns)
+
+    def rollup(self, system, hours=24, width_px=DEFAULT_CHART_WIDTH):
+        return self.source.rollup(system, hours=hours, width_px=width_px)
+
+    def reservoir(self, system, hours=24, interval_minutes=15):
+        return self.source.reservoir(system, hours=hours, interval_minutes=interval_minutes)
+
+def publish_latest(source, path, interval_seconds=1.0, iterations=None):
+    """
+    Run the single producer of a shared latest-state ring.
+
+    Args:
+        source (DataSource): Source to take snapshots from
+        path (str): Path of the ring file
+        interval_seconds (float): Time between snapshots
+        iterations (int): Number of snapshots to publish; None runs forever
+    """
+    state = SharedLatestState(path, [f"{system}.{field}" for system, field in LATEST_LAYOUT], writer=True)
+    try:
+        published = 0
+        while iterations is None or published < iterations:
+            latest_data = source.latest()
+            values = np.array([latest_data[system][field] for system, field in LATEST_LAYOUT], dtype=np.float64)
+            state.publish(values, np.datetime64(latest_data['timestamp'], 'us'))
+            published += 1
+            time.sleep(interval_seconds)
+    finally:
+        state.close()
+
+def data_source_from_url(url):
+    """
+    Create a data source from a URL-like description.
+
+    Supported forms are 'synthetic', 'replay:<path>[?speed=<x>][&loop=1]',
+    'tcp://<host>:<port>' and 'udp://<host>:<port>'.
+
+    Args:
+        url (str): Source description
+
+    Returns:
+        DataSource: The configured (not yet started) source
+    """
+    if url == 'synthetic':
+        return SyntheticSource()
+
+    if url.startswith('replay:'):
+        path, _, query = url[len('replay:'):].partition('?')
+        options = dict(option.split('=', 1) for option in query.split('&') if option)
+        speed = float(options['speed']) if 'speed' in options else None
+        return FileReplaySource(path, speed=speed, loop=options.get('loop') == '1')
+
+    for protocol in ('tcp', 'udp'):
+        if url.startswith(f'{protocol}://'):
+            host, _, port = url[len(protocol) + 3:].rpartition(':')
+            return SocketSource(host or '127.0.0.1', int(port), protocol=protocol)
+
+    raise ValueError(f"Unknown data source: {url}")
+
+_SOURCE = None
+_SOURCE_LOCK = threading.Lock()
+
+def get_data_source():
+    """
+    Get the process-wide data source.
+
+    On first use it is created from the QEAIMS_DATA_SOURCE environment
+    variable (default 'synthetic') and started. If QEAIMS_HISTORY_STORE
+    names a directory, history is persisted there (see PersistentSource).
+    If QEAIMS_SHARED_STATE names a ring file, latest snapshots are read from
+    it (see SharedStateSource).
+
+    Returns:
+        DataSource: The active source
+    """
+    global _SOURCE
+    with _SOURCE_LOCK:
+        if _SOURCE is None:
+            _SOURCE = data_source_from_url(os.environ.get('QEAIMS_DATA_SOURCE', 'synthetic'))
+            if os.environ.get('QEAIMS_HISTORY_STORE'):
+                _SOURCE = PersistentSource(_SOURCE, HistoricalStore(os.environ['QEAIMS_HISTORY_STORE']))
+            if os.environ.get('QEAIMS_SHARED_STATE'):
+                _SOURCE = SharedStateSource(_SOURCE, os.environ['QEAIMS_SHARED_STATE'])
+            if hasattr(_SOURCE, 'start'):
+                _SOURCE.start()
+        return _SOURCE
+
+def set_data_source(source):
+    """
+    Replace the process-wide data source.
+
+    Args:
+        source (DataSource): Started source to read from
+    """
+    global _SOURCE
+    with _SOURCE_LOCK:
+        _SOURCE = source
+
+def get_latest_data():
+    """
+    Get the latest snapshot of all utility systems from the active source.
+
+    Returns:
+        dict: Latest data for all utility systems
+    """
+    return get_data_source().latest()
+
+def get_historical_data(hours=24, interval_minutes=15):
+    """
+    Get the overview history of all utility systems from the active source.
+
+    Args:
+        hours (int): Number of hours of history
+        interval_minutes (int): Interval between data points in minutes
+
+    Returns:
+        dict: Historical data for all utility systems
+    """
+    return get_data_source().historical(hours=hours, interval_minutes=interval_minutes)
+
+def get_detailed_data(system, hours=24, interval_minutes=15, columns=None):
+    """
+    Get the detailed history of one utility system from the active source.
+
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+        hours (int): Number of hours of history
+        interval_minutes (int): Interval between data points in minutes
+        columns (list): Columns to return besides 'timestamp'; None returns all
+
+    Returns:
+        pd.DataFrame: Detailed data for the specified system
+    """
+    return get_data_source().history(system, hours=hours, interval_minutes=interval_minutes, columns=columns)
+
+def get_rollup_data(system, hours=24, width_px=DEFAULT_CHART_WIDTH):
+    """
+    Get chart-ready aggregated history of one utility system from the active source.
+
+    The finest rollup tier (1m, 15m, 1h or 1d) with at most width_px rows in
+    the range is used, so long ranges read a few hundred aggregated rows
+    instead of every raw point.
+
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+        hours (int): Number of hours of history
+        width_px (int): Chart width in points
+
+    Returns:
+        pd.DataFrame: timestamp, count, and per metric the mean (same name as in get_detailed_data),
+            '<metric>_min' and '<metric>_max'; 'anomaly' is set if any sample in the bucket was anomalous
+    """
+    return get_data_source().rollup(system, hours=hours, width_px=width_px)
+
+def _feeder_lines(seed=None):
+    """Pre-render one day of minute-resolution telemetry lines per system, without timestamps."""
+    lines = []
+    for system in SYSTEM_PROFILES:
+        frame = data_generator.get_detailed_data(system, hours=24, interval_minutes=1, seed=seed if seed is not None else 0)
+        frame = frame.drop(columns='timestamp').astype(float)
+        names = frame.columns
+        for row in frame.itertuples(index=False):
+            lines.append(f"{system} " + ",".join(f"{name}={value:.6g}" for name, value in zip(names, row)))
+    return lines
+
+async def run_feeder(host='127.0.0.1', port=9009, rate=1000, duration=10.0, protocol='tcp', seed=None):
+    """
+    Send synthetic line-protocol telemetry to a SocketSource at a fixed rate.
+
+    Args:
+        host (str): Receiver address
+        port (int): Receiver port
+        rate (float): Records per second across all systems
+        duration (float): Seconds to send for
+        protocol (str): 'tcp' or 'udp'
+        seed (int): Seed of the synthetic telemetry
+
+    Returns:
+        int: Number of records sent
+    """
+    templates = _feeder_lines(seed)
+    loop = asyncio.get_running_loop()
+
+    if protocol == 'udp':
+        transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol, remote_addr=(host, port))
+        send = transport.sendto
+    else:
+        _, writer = await asyncio.open_connection(host, port)
+        send = writer.write
+
+    tick = 0.01
+    sent = 0
+    started = loop.time()
+    while (elapsed := loop.time() - started) < duration:
+        due = int(min(elapsed + tick, duration) * rate) - sent
+        if due > 0:
+            timestamp = np.datetime64(datetime.now(), 'ns').astype(np.int64)
+            batch = [f"{templates[(sent + i) % len(templates)]} {timestamp}" for i in range(due)]
+            if protocol == 'udp':
+                # Stay well below the datagram size limit
+                for start in range(0, len(batch), 100):
+                    send(("\n".join(batch[start:start + 100]) + "\n").encode())
+            else:
+                send(("\n".join(batch) + "\n").encode())
+                await writer.drain()
+            sent += due
+        await asyncio.sleep(tick)
+
+    if protocol == 'udp':
+        transport.close()
+    else:
+        writer.close()
+        await writer.wait_closed()
+
+    return sent
+
+def main():
+    """Command line entry point: run a socket receiver, a test feeder or a shared-state producer."""
+    parser = argparse.ArgumentParser(description="QEAIMS telemetry socket receiver, test feeder and shared-state producer")
+    parser.add_argument('mode', choices=['serve', 'feed', 'produce'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9009)
+    parser.add_argument('--udp', action='store_true', help="Use UDP instead of TCP")
+    parser.add_argument('--rate', type=float, default=5000, help="Records per second to send (feed)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run for")
+    parser.add_argument('--state', default='qeaims_latest.ring', help="Latest-state ring file to write (produce)")
+    parser.add_argument('--source', default=os.environ.get('QEAIMS_DATA_SOURCE', 'synthetic'), help="Source to publish (produce)")
+    args = parser.parse_args()
+    protocol = 'udp' if args.udp else 'tcp'
+
+    if args.mode == 'produce':
+        source = data_source_from_url(args.source)
+        if hasattr(source, 'start'):
+            source.start()
+        publish_latest(source, args.state)
+        return
+
+    if args.mode == 'feed':
+        sent = asyncio.run(run_feeder(args.host, args.port, args.rate, args.duration, protocol))
+        print(f"Sent {sent} records in {args.duration:.1f} s")
+        return
+
+    source = SocketSource(args.host, args.port, protocol=protocol)
+    source.start()
+    previous = 0
+    for _ in range(int(args.duration)):
+        time.sleep(1)
+        received = source.samples_ingested
+        print(f"{received - previous} records/s ({received} total)")
+        previous = received
+    source.stop()
+
+if __name__ == '__main__':
+    main()
+
+def get_training_reservoir(system, hours=24, interval_minutes=15):
+    """
+    Get the training reservoir behind a system's detailed history, if the active source keeps one.
+
+    Pass it to the anomaly functions together with the matching get_detailed_data
+    result, so their models are fitted on a sample of that stream.
+
+    Args:
+        system (str): The utility system ('electricity', 'water', 'sewage', 'banking')
+        hours (int): Number of hours of history
+        interval_minutes (int): Interval between data points in minutes
+
+    Returns:
+        StreamReservoir: The reservoir, or None
+    """
+    return get_data_source().reservoir(system, hours=hours, interval_minutes=interval_minutes)
@@ -0,0 +1,102 @@
+import numpy as np
+
+# Points per series sent to the browser
+DEFAULT_THRESHOLD = 2000
+
+def _as_numeric(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[us]').astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+def lttb_indices(x, y, threshold=DEFAULT_THRESHOLD):
+    """
+    Select points with Largest-Triangle-Three-Buckets, vectorized.
+
+    The first and last points are always kept and the points in between are
+    split into threshold - 2 equal buckets. Each bucket keeps the point that
+    forms the largest triangle with the point kept in the previous bucket and
+    the average of the next bucket. Classic LTTB walks the buckets one by one;
+    here every bucket is scored at once, first against the previous bucket's
+    average and then against the point that pass selected, which keeps the
+    same peaks at the cost of two array passes.
+
+    Args:
+        x (np.ndarray): Ascending x values (numeric or datetime64)
+        y (np.ndarray): y values
+        threshold (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _as_numeric(x)
+    y = np.nan_to_num(_as_numeric(y))
+
+    # Bucket boundaries over the inner points 1 .. n-2
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    sizes = ends - starts
+    width = int(sizes.max())
+
+    # Pad buckets to a rectangle; padded slots repeat the bucket's first point
+    offsets = np.arange(width)
+    index = starts[:, None] + offsets[None, :]
+    valid = offsets[None, :] < sizes[:, None]
+    index = np.where(valid, index, starts[:, None])
+    bucket_x, bucket_y = x[index], y[index]
+
+    sums_x = np.add.reduceat(x[:-1], starts)
+    sums_y = np.add.reduceat(y[:-1], starts)
+    mean_x, mean_y = sums_x / sizes, sums_y / sizes
+
+    # Each bucket looks ahead to the next bucket's average (the last to the last point)
+    next_x = np.r_[mean_x[1:], x[-1]]
+    next_y = np.r_[mean_y[1:], y[-1]]
+
+    def select(prev_x, prev_y):
+        area = np.abs(
+            (prev_x[:, None] - next_x[:, None]) * (bucket_y - prev_y[:, None]) -
+            (prev_x[:, None] - bucket_x) * (next_y[:, None] - prev_y[:, None])
+        )
+        area[~valid] = -1.0
+        return index[np.arange(len(starts)), area.argmax(axis=1)]
+
+    selected = select(np.r_[x[0], mean_x[:-1]], np.r_[y[0], mean_y[:-1]])
+    anchors = np.r_[0, selected[:-1]]
+    selected = select(x[anchors], y[anchors])
+
+    return np.r_[0, selected, n - 1]
+
+def downsample(frame, y, x='timestamp', threshold=DEFAULT_THRESHOLD, keep=None):
+    """
+    Reduce a frame to the rows needed to draw its line charts.
+
+    Rows chosen by LTTB for every column in y are kept, together with every
+    row flagged by keep, so anomalies are never dropped from a chart.
+
+    Args:
+        frame (pd.DataFrame): Rows sorted by x
+        y (str | list): Column or columns that will be plotted
+        x (str): x-axis column
+        threshold (int): Points kept per column (before adding flagged rows)
+        keep (str | array-like): Boolean column name or mask of rows that must be kept
+
+    Returns:
+        pd.DataFrame: Subset of frame in the original order
+    """
+    if len(frame) <= threshold:
+        return frame
+
+    columns = [y] if isinstance(y, str) else list(y)
+    x_values = frame[x].to_numpy()
+    rows = [lttb_indices(x_values, frame[column].to_numpy(), threshold) for column in columns]
+
+    if keep is not None:
+        mask = frame[keep] if isinstance(keep, str) else keep
+        rows.append(np.flatnonzero(np.asarray(mask, dtype=bool)))
+
+    return frame.iloc[np.unique(np.concatenate(rows))]
@@ -0,0 +1,295 @@
+import threading
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from utils.anomaly_detection import SYSTEM_METRICS
+from utils.data_source import get_detailed_data
+
+FORECAST_METHODS = ['seasonal_naive', 'holt_winters', 'daily_profile']
+
+# Coefficients of the Abramowitz and Stegun 7.1.26 approximation of erf (absolute error below 1.5e-7)
+_ERF_P = 0.3275911
+_ERF_COEFFICIENTS = np.array([1.061405429, -1.453152027, 1.421413741, -0.284496736, 0.254829592])
+
+def _normal_cdf(x):
+    # Standard normal CDF as 0.5 * (1 + erf(x / sqrt(2))), in array operations
+    z = np.asarray(x, dtype=np.float64) / np.sqrt(2)
+    t = 1 / (1 + _ERF_P * np.abs(z))
+    erf = 1 - np.polyval(_ERF_COEFFICIENTS, t) * t * np.exp(-z ** 2)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+class Forecaster:
+    """
+    Incrementally fitted baseline forecasts for a block of series on a shared time grid.
+
+    Every series (e.g. every metric of every system) is a row of the state
+    arrays, so all of them are updated and forecast together:
+
+    - seasonal naive repeats the value from one day earlier
+    - Holt-Winters is additive, in error-correction form, with fixed smoothing
+    - daily profile is the mean of each time-of-day slot over all days seen
+
+    Samples are addressed by their slot on the grid (timestamp // interval).
+    update() only absorbs slots after the last one seen, so refreshing a
+    rolling history costs O(new samples). Missing samples (NaN) leave a
+    series' state untouched. Prediction intervals come from the running
+    variance of each method's one-step (or one-season) errors.
+    """
+
+    def __init__(self, n_series, season_length, alpha=0.2, beta=0.01, gamma=0.1):
+        """
+        Args:
+            n_series (int): Number of series
+            season_length (int): Samples per season, e.g. per day
+            alpha (float): Holt-Winters level smoothing
+            beta (float): Holt-Winters trend smoothing, relative to alpha
+            gamma (float): Holt-Winters seasonal smoothing
+        """
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.last_slot = None
+
+        shape = (n_series, season_length)
+        # Seasonal naive: latest value per time-of-day slot and squared one-season errors
+        self.recent = np.full(shape, np.nan)
+        self.naive_error = np.zeros(n_series)
+        self.naive_count = np.zeros(n_series)
+        # Daily profile: running sums per time-of-day slot
+        self.profile_sum = np.zeros(shape)
+        self.profile_squares = np.zeros(shape)
+        self.profile_count = np.zeros(shape)
+        # Holt-Winters state and squared one-step errors
+        self.level = np.full(n_series, np.nan)
+        self.trend = np.zeros(n_series)
+        self.season = np.zeros(shape)
+        self.seen = np.zeros(n_series, dtype=np.int64)
+        self.hw_error = np.zeros(n_series)
+        self.hw_count = np.zeros(n_series)
+
+    def update(self, first_slot, values):
+        """
+        Absorb consecutive samples of every series.
+
+        Args:
+            first_slot (int): Grid slot of the first column of values
+            values (np.ndarray): (series, samples) values of consecutive slots; NaN marks a missing sample
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if self.last_slot is not None:
+            skip = self.last_slot + 1 - first_slot
+            if skip >= values.shape[1]:
+                return
+            if skip > 0:
+                values, first_slot = values[:, skip:], first_slot + skip
+            elif skip < 0:
+                # Fill the slots between the last update and these samples as missing
+                gap = np.full((len(values), -skip), np.nan)
+                values, first_slot = np.hstack([gap, values]), self.last_slot + 1
+        slots = (first_slot + np.arange(values.shape[1])) % self.season_length
+        finite = np.isfinite(values)
+        filled = np.where(finite, values, 0.0)
+
+        self._update_profile(slots, filled, finite)
+        self._update_naive(slots, values)
+        self._update_holt_winters(slots, values, finite)
+        self.last_slot = first_slot + values.shape[1] - 1
+
+    def _update_profile(self, slots, filled, finite):
+        np.add.at(self.profile_sum, (slice(None), slots), filled)
+        np.add.at(self.profile_squares, (slice(None), slots), filled ** 2)
+        np.add.at(self.profile_count, (slice(None), slots), finite)
+
+    def _update_naive(self, slots, values):
+        # The value one season before each sample: from this batch when it reaches back that far, else the ring
+        samples = values.shape[1]
+        index = np.arange(samples)
+        earlier = np.where(index >= self.season_length, index - self.season_length, 0)
+        previous = np.where(index >= self.season_length, values[:, earlier], self.recent[:, slots])
+        errors = values - previous
+        valid = np.isfinite(errors)
+        self.naive_error += (np.where(valid, errors, 0.0) ** 2).sum(axis=1)
+        self.naive_count += valid.sum(axis=1)
+
+        # Keep the newest finite value of every slot
+        for start in range(max(0, samples - self.season_length), samples):
+            column = values[:, start]
+            np.copyto(self.recent[:, slots[start]], column, where=np.isfinite(column))
+
+    def _update_holt_winters(self, slots, values, finite):
+        unseen = np.isnan(self.level)
+        if unseen.any():
+            # Start from the first finite value of each new series
+            first = np.where(finite.any(axis=1), values[np.arange(len(values)), finite.argmax(axis=1)], np.nan)
+            self.level[unseen] = first[unseen]
+
+        level, trend, season = self.level, self.trend, self.season
+        for index, slot in enumerate(slots):
+            valid = finite[:, index]
+            # During the first season each slot's seasonal term is its offset from the starting level
+            warm = valid & (self.seen >= self.season_length)
+            error = np.where(warm, values[:, index] - (level + trend + season[:, slot]), 0.0)
+            np.copyto(season[:, slot], values[:, index] - level, where=valid & ~warm)
+            self.hw_error += error ** 2
+            self.hw_count += warm
+            level += trend + self.alpha * error
+            trend += self.alpha * self.beta * error
+            season[:, slot] += self.gamma * error
+            self.seen += valid
+
+    def forecast(self, steps, level=0.95):
+        """
+        Forecast every series with every method.
+
+        Args:
+            steps (int): Samples ahead to forecast
+            level (float): Coverage of the prediction intervals
+
+        Returns:
+            dict: Method name to (mean, lower, upper), each a (series, steps) array
+        """
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+        ahead = np.arange(1, steps + 1)
+        slots = (self.last_slot + ahead) % self.season_length
+        seasons = np.ceil(ahead / self.season_length)
+
+        naive = self.recent[:, slots]
+        naive_sd = np.sqrt(self.naive_error / np.maximum(self.naive_count, 1))[:, None] * np.sqrt(seasons)
+
+        count = np.maximum(self.profile_count[:, slots], 1)
+        profile = self.profile_sum[:, slots] / count
+        # Sample variance of the slot, widened by the uncertainty of its mean
+        variance = np.maximum(self.profile_squares[:, slots] / count - profile ** 2, 0) * count / np.maximum(count - 1, 1)
+        profile_sd = np.sqrt(variance * (1 + 1 / count))
+        profile = np.where(self.profile_count[:, slots] > 0, profile, np.nan)
+
+        hw = self.level[:, None] + ahead * self.trend[:, None] + self.season[:, slots]
+        # Variance multipliers of the h-step error of additive Holt-Winters
+        weights = self.alpha * (1 + np.arange(1, steps) * self.beta) + self.gamma * (np.arange(1, steps) % self.season_length == 0)
+        multiplier = np.sqrt(1 + np.concatenate([[0.0], np.cumsum(weights ** 2)]))
+        hw_sd = np.sqrt(self.hw_error / np.maximum(self.hw_count, 1))[:, None] * multiplier
+
+        return {
+            method: (mean, mean - z * sd, mean + z * sd)
+            for method, mean, sd in (('seasonal_naive', naive, naive_sd), ('holt_winters', hw, hw_sd),
+                                     ('daily_profile', profile, profile_sd))
+        }
+
+# Fitted forecasters per (systems, interval), updated in place as new samples arrive
+_FORECASTERS = {}
+_FORECASTERS_LOCK = threading.Lock()
+
+def _grid(data, metrics, interval):
+    # Every metric of every system as one (series, slots) block over the slots the systems cover
+    step = interval.astype('timedelta64[us]').astype(np.int64)
+    slots = {
+        system: data[system]['timestamp'].to_numpy().astype('datetime64[us]').astype(np.int64) // step
+        for system in metrics
+    }
+    first = min(system_slots[0] for system_slots in slots.values())
+    last = max(system_slots[-1] for system_slots in slots.values())
+    block = np.full((sum(len(columns) for columns in metrics.values()), last - first + 1), np.nan)
+    row = 0
+    for system, columns in metrics.items():
+        values = data[system][columns].to_numpy(dtype=np.float64).T
+        block[row:row + len(columns), slots[system] - first] = values
+        row += len(columns)
+    return int(first), block
+
+def forecast_all_systems(data=None, horizon_hours=6, history_hours=168, interval_minutes=15, metrics=None, level=0.95):
+    """
+    Forecast every metric of every system with every baseline method in one batch.
+
+    The histories of all systems are laid on one time grid and absorbed by a
+    Forecaster. When the data is fetched from the data source, the forecaster
+    is kept between calls and only processes the samples it has not seen, so
+    repeated calls on the rolling history cost little more than the forecast.
+    Explicitly passed data is fitted by a fresh forecaster.
+
+    Args:
+        data (dict): System name to detailed DataFrame; fetched from the data source if None
+        horizon_hours (float): Hours ahead to forecast
+        history_hours (int): Hours of history to fetch when data is not given
+        interval_minutes (int): Sampling interval of the history, in minutes
+        metrics (dict): System name to metric columns, defaults to SYSTEM_METRICS
+        level (float): Coverage of the prediction intervals
+
+    Returns:
+        dict: System name to DataFrame with timestamp, metric, method, forecast, lower and upper columns
+    """
+    metrics = SYSTEM_METRICS if metrics is None else metrics
+    # Only the data source's rolling histories continue from one call to the next
+    incremental = data is None
+    if data is None:
+        data = {system: get_detailed_data(system, hours=history_hours, interval_minutes=interval_minutes)
+                for system in metrics}
+    metrics = {system: columns for system, columns in metrics.items() if len(data.get(system, ())) > 0}
+    if not metrics:
+        return {}
+
+    interval = np.timedelta64(interval_minutes, 'm')
+    first_slot, block = _grid(data, metrics, interval)
+    key = (tuple((system, tuple(columns)) for system, columns in metrics.items()), interval_minutes)
+    season_length = int(np.timedelta64(1, 'D') // interval)
+    steps = max(1, int(round(horizon_hours * 60 / interval_minutes)))
+    if not incremental:
+        # Explicit data is fitted from scratch, so the forecast follows exactly that history
+        forecaster = Forecaster(len(block), season_length)
+        forecaster.update(first_slot, block)
+        forecasts = forecaster.forecast(steps, level)
+        last_slot = forecaster.last_slot
+    else:
+        with _FORECASTERS_LOCK:
+            forecaster = _FORECASTERS.get(key)
+            last_slot = first_slot + block.shape[1] - 1
+            if forecaster is None or forecaster.last_slot < first_slot - 1 or forecaster.last_slot > last_slot:
+                # First use, too long since the last update to carry the state over, or a history that
+                # ends before the state does
+                forecaster = Forecaster(len(block), season_length)
+                _FORECASTERS[key] = forecaster
+            forecaster.update(first_slot, block)
+            forecasts = forecaster.forecast(steps, level)
+            last_slot = forecaster.last_slot
+
+    step = interval.astype('timedelta64[us]')
+    timestamps = (np.arange(last_slot + 1, last_slot + steps + 1) * step.astype(np.int64)).astype('datetime64[us]')
+
+    results = {}
+    row = 0
+    for system, columns in metrics.items():
+        rows = slice(row, row + len(columns))
+        row += len(columns)
+        # Long format: methods, then metrics, then timestamps, built with repeat/tile
+        frame = {
+            'timestamp': np.tile(timestamps, len(FORECAST_METHODS) * len(columns)),
+            'metric': np.tile(np.repeat(columns, steps), len(FORECAST_METHODS)),
+            'method': np.repeat(FORECAST_METHODS, len(columns) * steps)
+        }
+        for position, name in enumerate(('forecast', 'lower', 'upper')):
+            frame[name] = np.concatenate([forecasts[method][position][rows].ravel() for method in FORECAST_METHODS])
+        results[system] = pd.DataFrame(frame)
+    return results
+
+def range_probability(forecast, low, high, level=0.95):
+    """
+    Probability that each forecast value stays within a range.
+
+    The forecast distribution is taken as normal, with the standard deviation
+    implied by the prediction interval.
+
+    Args:
+        forecast (pd.DataFrame): Rows of a forecast_all_systems result
+        low (float): Lower bound of the range
+        high (float): Upper bound of the range
+        level (float): Coverage of the forecast's prediction intervals
+
+    Returns:
+        np.ndarray: Probability per row
+    """
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    mean = forecast['forecast'].to_numpy()
+    sd = np.maximum((forecast['upper'].to_numpy() - mean) / z, np.finfo(np.float64).tiny)
+    return _normal_cdf((high - mean) / sd) - _normal_cdf((low - mean) / sd)
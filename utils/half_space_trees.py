@@ -0,0 +1,201 @@
+import numpy as np
+
+class HalfSpaceTrees:
+    """
+    Online anomaly detector built from an ensemble of Half-Space Trees.
+
+    Each tree recursively halves a randomly shifted work space of the
+    (range-normalized) features down to a fixed depth. Samples are counted in
+    the nodes they pass through: a reference mass profile, learned from the
+    previous window of samples, scores new samples, while the latest window's
+    mass profile is accumulated and replaces the reference once the window is
+    full. Absorbing new data therefore never needs a refit, and scoring a
+    sample takes time proportional to the tree depth.
+
+    The interface follows scikit-learn's IsolationForest: score_samples is
+    higher for normal samples and predict returns -1 for anomalies, using a
+    threshold set from the fit data and the contamination.
+    """
+
+    def __init__(self, n_trees=25, depth=10, window_size=250, contamination=0.05, size_limit=None, random_state=None):
+        """
+        Args:
+            n_trees (int): Number of trees
+            depth (int): Depth of every tree
+            window_size (int): Samples per mass profile window
+            contamination (float): Expected proportion of anomalies, sets the predict threshold
+            size_limit (float): Node mass below which scoring stops descending, defaults to 10% of the window
+            random_state (int): Seed for the tree structure
+        """
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window_size = window_size
+        self.contamination = contamination
+        self.size_limit = 0.1 * window_size if size_limit is None else size_limit
+        self.random_state = random_state
+
+    def _build(self, n_features):
+        rng = np.random.default_rng(self.random_state)
+        n_internal = 2 ** self.depth - 1
+
+        # Randomly shifted work space per tree and feature, in normalized units
+        shift = rng.random((self.n_trees, n_features))
+        extent = 2 * np.maximum(shift, 1 - shift)
+        low, high = shift - extent, shift + extent
+
+        self.split_feature_ = rng.integers(n_features, size=(self.n_trees, n_internal))
+        self.split_value_ = np.zeros((self.n_trees, n_internal))
+        trees = np.arange(self.n_trees)[:, None]
+
+        # Build level by level: each child inherits its parent's bounds with one side halved
+        node_low, node_high = low[:, None, :], high[:, None, :]
+        for level in range(self.depth):
+            nodes = np.arange(2 ** level - 1, 2 ** (level + 1) - 1)
+            features = self.split_feature_[:, nodes]
+            split = (node_low[trees, np.arange(len(nodes)), features] + node_high[trees, np.arange(len(nodes)), features]) / 2
+            self.split_value_[:, nodes] = split
+
+            left_high, right_low = node_high.copy(), node_low.copy()
+            left_high[trees, np.arange(len(nodes)), features] = split
+            right_low[trees, np.arange(len(nodes)), features] = split
+            node_low = np.stack([node_low, right_low], axis=2).reshape(self.n_trees, -1, n_features)
+            node_high = np.stack([left_high, node_high], axis=2).reshape(self.n_trees, -1, n_features)
+
+        n_nodes = 2 ** (self.depth + 1) - 1
+        self.reference_mass_ = np.zeros((self.n_trees, n_nodes))
+        self.latest_mass_ = np.zeros((self.n_trees, n_nodes))
+        self.window_count_ = 0
+
+    def _normalize(self, X):
+        return (np.asarray(X, dtype=np.float64) - self.feature_min_) / self.feature_span_
+
+    def _paths(self, X):
+        # Node index at every level (root included) for every sample and tree: (samples, trees, depth + 1)
+        X = self._normalize(X)
+        trees = np.arange(self.n_trees)[None, :]
+        node = np.zeros((len(X), self.n_trees), dtype=np.int64)
+        paths = np.empty((len(X), self.n_trees, self.depth + 1), dtype=np.int64)
+        paths[:, :, 0] = 0
+        rows = np.arange(len(X))[:, None]
+        for level in range(self.depth):
+            values = X[rows, self.split_feature_[trees, node]]
+            node = 2 * node + 1 + (values >= self.split_value_[trees, node])
+            paths[:, :, level + 1] = node
+        return paths
+
+    def _score_paths(self, paths):
+        mass = self.reference_mass_[np.arange(self.n_trees)[None, :, None], paths]
+        # Descend until a node's reference mass falls to the size limit (or a leaf is reached)
+        small = mass <= self.size_limit
+        stop = np.where(small.any(axis=2), small.argmax(axis=2), self.depth)
+        stop_mass = np.take_along_axis(mass, stop[:, :, None], axis=2)[:, :, 0]
+        return (stop_mass * 2.0 ** stop).sum(axis=1)
+
+    def _count(self, paths):
+        n_nodes = self.latest_mass_.shape[1]
+        flat = (paths + (np.arange(self.n_trees) * n_nodes)[None, :, None]).ravel()
+        if len(paths) == 1:
+            # One sample visits every node at most once
+            self.latest_mass_.reshape(-1)[flat] += 1
+        else:
+            self.latest_mass_ += np.bincount(flat, minlength=self.latest_mass_.size).reshape(self.latest_mass_.shape)
+
+    def fit(self, X):
+        """
+        Build the trees and learn the reference mass profile from X.
+
+        Args:
+            X (array-like): (samples, features) training data
+
+        Returns:
+            HalfSpaceTrees: self
+        """
+        X = np.asarray(X, dtype=np.float64)
+        self.feature_min_ = X.min(axis=0)
+        self.feature_span_ = np.where(X.max(axis=0) > self.feature_min_, X.max(axis=0) - self.feature_min_, 1.0)
+        self._build(X.shape[1])
+
+        # The reference profile covers the training data, scaled to one window
+        paths = self._paths(X)
+        self._count(paths)
+        self.reference_mass_ = self.latest_mass_ * (self.window_size / len(X))
+        self.latest_mass_ = np.zeros_like(self.reference_mass_)
+
+        self.offset_ = np.quantile(self._score_paths(paths), self.contamination)
+        return self
+
+    def _stream(self, X, classify):
+        # Walk the data window by window so every sample is scored against the profile in force when it arrives
+        X = np.asarray(X, dtype=np.float64)
+        predictions = np.empty(len(X), dtype=np.int64) if classify else None
+        start = 0
+        while start < len(X):
+            stop = min(len(X), start + self.window_size - self.window_count_)
+            paths = self._paths(X[start:stop])
+            if classify:
+                predictions[start:stop] = np.where(self._score_paths(paths) < self.offset_, -1, 1)
+            self._count(paths)
+            self.window_count_ += stop - start
+            if self.window_count_ == self.window_size:
+                self.reference_mass_, self.latest_mass_ = self.latest_mass_, self.reference_mass_
+                self.latest_mass_[:] = 0
+                self.window_count_ = 0
+            start = stop
+        return predictions
+
+    def partial_fit(self, X):
+        """
+        Absorb new samples into the latest mass profile, rotating windows as they fill.
+
+        Args:
+            X (array-like): (samples, features) new data, in arrival order
+
+        Returns:
+            HalfSpaceTrees: self
+        """
+        self._stream(X, classify=False)
+        return self
+
+    def score_samples(self, X):
+        """
+        Mass score of each sample; lower means more anomalous.
+
+        Args:
+            X (array-like): (samples, features) data
+
+        Returns:
+            np.ndarray: Score per sample
+        """
+        return self._score_paths(self._paths(X))
+
+    def decision_function(self, X):
+        """Score shifted by the threshold; negative values are anomalies."""
+        return self.score_samples(X) - self.offset_
+
+    def predict(self, X):
+        """
+        Classify samples.
+
+        Returns:
+            np.ndarray: -1 for anomalies, 1 for normal samples
+        """
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+    def fit_predict(self, X):
+        """Fit on X and classify it."""
+        return self.fit(X).predict(X)
+
+    def score_partial_fit(self, X):
+        """
+        Classify streaming samples and then absorb them.
+
+        Samples are scored against the reference profile in force when they
+        arrive, so a batch gives the same result as feeding it one by one.
+
+        Args:
+            X (array-like): (samples, features) new data, in arrival order
+
+        Returns:
+            np.ndarray: -1 for anomalies, 1 for normal samples
+        """
+        return self._stream(X, classify=True)
@@ -0,0 +1,220 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Health rules per system. A rule fires when the aggregate of its metric falls
+# below 'low' or rises above 'high'; the issue text may use {value}.
+HEALTH_RULES = {
+    'electricity': [
+        {'metric': 'frequency', 'aggregate': 'mean', 'low': 49.5, 'high': 50.5,
+         'issue': 'Frequency instability detected', 'recommendation': 'Check grid balancing systems'},
+        {'metric': 'voltage', 'aggregate': 'mean', 'low': 220, 'high': 240,
+         'issue': 'Voltage outside acceptable range', 'recommendation': 'Inspect voltage regulators and transformers'},
+        {'metric': 'power_factor', 'aggregate': 'mean', 'low': 0.9,
+         'issue': 'Low power factor', 'recommendation': 'Consider installing power factor correction capacitors'}
+    ],
+    'water': [
+        {'metric': 'pressure_bar', 'aggregate': 'mean', 'low': 4.5,
+         'issue': 'Low water pressure', 'recommendation': 'Check pump operations and inspect for leaks'},
+        {'metric': 'turbidity_ntu', 'aggregate': 'mean', 'high': 1.0,
+         'issue': 'High water turbidity', 'recommendation': 'Optimize filtration systems'},
+        {'metric': 'ph_level', 'aggregate': 'mean', 'low': 6.5, 'high': 8.5,
+         'issue': 'pH level outside acceptable range', 'recommendation': 'Adjust chemical treatment processes'}
+    ],
+    'sewage': [
+        {'metric': 'treatment_efficiency', 'aggregate': 'mean', 'low': 85,
+         'issue': 'Treatment efficiency below target', 'recommendation': 'Review treatment process and chemical dosing'},
+        {'metric': 'contaminant_level', 'aggregate': 'mean', 'high': 10,
+         'issue': 'High contaminant levels', 'recommendation': 'Investigate potential industrial discharge events'},
+        {'metric': 'dissolved_oxygen', 'aggregate': 'mean', 'low': 5,
+         'issue': 'Low dissolved oxygen levels', 'recommendation': 'Check aeration systems'}
+    ],
+    'banking': [
+        {'metric': 'response_time_ms', 'aggregate': 'mean', 'high': 300,
+         'issue': 'High response times', 'recommendation': 'Optimize database queries and increase server capacity'},
+        {'metric': 'success_rate', 'aggregate': 'mean', 'low': 99,
+         'issue': 'Transaction success rate below target', 'recommendation': 'Investigate failed transactions and implement retry mechanisms'},
+        {'metric': 'error_rate', 'aggregate': 'mean', 'high': 1,
+         'issue': 'High error rate', 'recommendation': 'Review error logs and address common failure points'}
+    ]
+}
+
+# Rules applied to every system, after its own; 'detected' holds the anomaly detector's flags
+GENERAL_RULES = [
+    {'metric': 'detected', 'aggregate': 'mean', 'high': 0.1,
+     'issue': 'High rate of anomalies detected ({value:.1%})', 'recommendation': 'Conduct comprehensive system diagnostic'}
+]
+
+AGGREGATES = ['mean', 'std', 'min', 'max', 'last']
+
+class CompiledRules:
+    """
+    A list of declarative health rules compiled into flat arrays.
+
+    Compiling collects the distinct (metric, aggregate) pairs the rules need
+    and the rule bounds as arrays. Evaluation then computes every aggregate
+    exactly once in one vectorized pass, however many rules share it, and
+    checks all bounds with a single comparison. The same rules can be
+    evaluated over one frame or over thousands of sliding windows at once.
+    """
+
+    def __init__(self, rules):
+        """
+        Args:
+            rules (list): Rule dicts with metric, aggregate, optional low/high bounds, issue and recommendation
+        """
+        self.rules = list(rules)
+        pairs = list(dict.fromkeys((rule['metric'], rule.get('aggregate', 'mean')) for rule in self.rules))
+        unknown = {aggregate for _, aggregate in pairs} - set(AGGREGATES)
+        if unknown:
+            raise ValueError(f"Unsupported aggregates: {sorted(unknown)}")
+
+        self.metrics = list(dict.fromkeys(metric for metric, _ in pairs))
+        # Per aggregate, the metric columns it is computed for
+        self._aggregates = {
+            aggregate: np.array([self.metrics.index(metric) for metric, name in pairs if name == aggregate])
+            for aggregate in AGGREGATES
+            if any(name == aggregate for _, name in pairs)
+        }
+        order = [(aggregate, metric) for aggregate, columns in self._aggregates.items() for metric in columns]
+        self._rule_values = np.array([
+            order.index((rule.get('aggregate', 'mean'), self.metrics.index(rule['metric']))) for rule in self.rules
+        ], dtype=np.int64)
+        self.low = np.array([rule.get('low', -np.inf) for rule in self.rules], dtype=np.float64)
+        self.high = np.array([rule.get('high', np.inf) for rule in self.rules], dtype=np.float64)
+        self.issues = [rule['issue'] for rule in self.rules]
+        self.recommendations = [rule['recommendation'] for rule in self.rules]
+
+    def _matrix(self, data, extra):
+        return np.column_stack([
+            np.asarray(extra[metric] if metric in extra else data[metric], dtype=np.float64) for metric in self.metrics
+        ])
+
+    def aggregate(self, data, **extra):
+        """
+        Compute every aggregate the rules need, once each.
+
+        Args:
+            data (Mapping): Metric name to array of values (e.g. a DataFrame)
+            **extra: Further metric arrays, e.g. detected=<anomaly flags>
+
+        Returns:
+            np.ndarray: Aggregate value per rule
+        """
+        values = self._matrix(data, extra)
+        if len(values) == 0:
+            return np.full(len(self.rules), np.nan)
+        results = []
+        for aggregate, columns in self._aggregates.items():
+            block = values[:, columns]
+            if aggregate == 'last':
+                results.append(block[-1])
+            else:
+                results.append(getattr(np, f'nan{aggregate}')(block, axis=0))
+        return np.concatenate(results)[self._rule_values]
+
+    def evaluate(self, data, **extra):
+        """
+        Evaluate the rules on one block of data.
+
+        Args:
+            data (Mapping): Metric name to array of values (e.g. a DataFrame)
+            **extra: Further metric arrays, e.g. detected=<anomaly flags>
+
+        Returns:
+            tuple: (issues, recommendations) of the rules that fired, in rule order
+        """
+        values = self.aggregate(data, **extra)
+        fired = np.flatnonzero(self.fired(values))
+        issues = [self.issues[index].format(value=values[index]) for index in fired]
+        recommendations = [self.recommendations[index] for index in fired]
+        return issues, recommendations
+
+    def evaluate_windows(self, data, window, step=1, **extra):
+        """
+        Evaluate the rules over every sliding window of the data at once.
+
+        Means and standard deviations come from cumulative sums, so their cost
+        does not grow with the window length.
+
+        Args:
+            data (Mapping): Metric name to array of values (e.g. a DataFrame)
+            window (int): Samples per window
+            step (int): Samples between the starts of consecutive windows
+            **extra: Further metric arrays, e.g. detected=<anomaly flags>
+
+        Returns:
+            np.ndarray: (windows, rules) boolean array of fired rules
+        """
+        values = self._matrix(data, extra)
+        starts = np.arange(0, len(values) - window + 1, step)
+        results = []
+        for aggregate, columns in self._aggregates.items():
+            block = values[:, columns]
+            if aggregate in ('mean', 'std'):
+                sums = np.vstack([np.zeros(len(columns)), np.cumsum(block, axis=0)])
+                mean = (sums[starts + window] - sums[starts]) / window
+                if aggregate == 'mean':
+                    results.append(mean)
+                else:
+                    squares = np.vstack([np.zeros(len(columns)), np.cumsum(block ** 2, axis=0)])
+                    variance = (squares[starts + window] - squares[starts]) / window - mean ** 2
+                    results.append(np.sqrt(np.maximum(variance, 0)))
+            elif aggregate == 'last':
+                results.append(block[starts + window - 1])
+            else:
+                windows = sliding_window_view(block, window, axis=0)[starts]
+                results.append(getattr(np, aggregate)(windows, axis=2))
+        values = np.hstack(results)[:, self._rule_values]
+        return self.fired(values)
+
+    def aggregate_groups(self, data, starts, **extra):
+        """
+        Compute the rule aggregates of consecutive groups of samples at once.
+
+        Groups are contiguous runs of samples, e.g. the samples of each hour,
+        aggregated with one reduceat per aggregate.
+
+        Args:
+            data (Mapping): Metric name to array of values (e.g. a DataFrame)
+            starts (np.ndarray): Ascending index of the first sample of each non-empty group
+            **extra: Further metric arrays, e.g. detected=<anomaly flags>
+
+        Returns:
+            np.ndarray: (groups, rules) aggregate values
+        """
+        values = self._matrix(data, extra)
+        counts = np.diff(np.r_[starts, len(values)])[:, None]
+        results = []
+        for aggregate, columns in self._aggregates.items():
+            block = values[:, columns]
+            if aggregate in ('mean', 'std'):
+                mean = np.add.reduceat(block, starts, axis=0) / counts
+                if aggregate == 'mean':
+                    results.append(mean)
+                else:
+                    variance = np.add.reduceat(block ** 2, starts, axis=0) / counts - mean ** 2
+                    results.append(np.sqrt(np.maximum(variance, 0)))
+            elif aggregate == 'last':
+                results.append(block[np.r_[starts[1:], len(values)] - 1])
+            else:
+                results.append({'min': np.minimum, 'max': np.maximum}[aggregate].reduceat(block, starts, axis=0))
+        return np.hstack(results)[:, self._rule_values]
+
+    def fired(self, values):
+        """Which rules fire for aggregate values of shape (..., rules)."""
+        return (values < self.low) | (values > self.high)
+
+def compile_rules(system):
+    """
+    Compile the rules of a system, followed by the general rules.
+
+    Args:
+        system (str): System name ('electricity', 'water', 'sewage', 'banking')
+
+    Returns:
+        CompiledRules: Compiled rules
+    """
+    return CompiledRules(HEALTH_RULES.get(system, []) + GENERAL_RULES)
+
+# Compiled rules of every known system
+COMPILED_RULES = {system: compile_rules(system) for system in HEALTH_RULES}
@@ -0,0 +1,156 @@
+import fcntl
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+class HistoricalStore:
+    """
+    On-disk columnar store of system history, partitioned by system and day.
+
+    Records live in Parquet files under
+    `<root>/system=<system>/interval=<minutes>/date=<YYYY-MM-DD>/part-<id>.parquet`.
+    Reads only open the day directories overlapping the requested range
+    (partition pruning), push the time-range predicate down to Parquet row
+    groups and read only the requested columns. Requires pyarrow.
+
+    Each day is written exactly once: writers of a system and interval are
+    serialized by a thread lock and a lock file, and a day's directory is
+    built under a temporary name and renamed into place when complete.
+    """
+
+    # Thread locks per partition path, shared by every store in the process
+    _locks = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, root, row_group_size=64 * 1024):
+        """
+        Args:
+            root (str): Directory holding the store
+            row_group_size (int): Rows per Parquet row group
+        """
+        if pa is None:
+            raise ImportError("HistoricalStore requires pyarrow (pip install pyarrow)")
+        self.root = root
+        self.row_group_size = row_group_size
+
+    def _partition(self, system, interval_minutes, day=None):
+        path = os.path.join(self.root, f"system={system}", f"interval={interval_minutes}")
+        if day is not None:
+            path = os.path.join(path, f"date={day.isoformat()}")
+        return path
+
+    @contextmanager
+    def _exclusive(self, system, interval_minutes):
+        # Serialize writers of one partition across threads and processes
+        path = self._partition(system, interval_minutes)
+        os.makedirs(path, exist_ok=True)
+        with self._locks_guard:
+            lock = self._locks.setdefault(os.path.abspath(path), threading.Lock())
+        with lock, open(os.path.join(path, '.lock'), 'a+b') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def days(self, system, interval_minutes):
+        """
+        Get the days stored for a system.
+
+        Args:
+            system (str): The utility system
+            interval_minutes (int): Sampling interval of the stored records
+
+        Returns:
+            set: datetime.date of every stored day
+        """
+        path = self._partition(system, interval_minutes)
+        if not os.path.isdir(path):
+            return set()
+        return {
+            datetime.strptime(name[len('date='):], '%Y-%m-%d').date()
+            for name in os.listdir(path)
+            if name.startswith('date=')
+        }
+
+    def write(self, system, interval_minutes, frame):
+        """
+        Write a batch of records, one Parquet file per day not stored yet.
+
+        Days already in the store are skipped, so concurrent writers of the
+        same days store each of them once.
+
+        Args:
+            system (str): The utility system
+            interval_minutes (int): Sampling interval of the records
+            frame (pd.DataFrame): Records with a 'timestamp' column
+
+        Returns:
+            set: datetime.date of every day written
+        """
+        if frame.empty:
+            return set()
+
+        written = set()
+        days = frame['timestamp'].dt.date
+        with self._exclusive(system, interval_minutes):
+            stored = self.days(system, interval_minutes)
+            for day, records in frame.groupby(days, sort=True):
+                if day in stored:
+                    continue
+                # Build the day under a temporary name, so readers never see a partial day
+                staging = os.path.join(self._partition(system, interval_minutes), f".staging-{uuid.uuid4().hex}")
+                os.makedirs(staging)
+                table = pa.Table.from_pandas(records, preserve_index=False)
+                pq.write_table(table, os.path.join(staging, "part-0.parquet"), row_group_size=self.row_group_size)
+                os.rename(staging, self._partition(system, interval_minutes, day))
+                written.add(day)
+        return written
+
+    def read(self, system, interval_minutes, start, end, columns=None):
+        """
+        Read the records of a system within a time range.
+
+        Args:
+            system (str): The utility system
+            interval_minutes (int): Sampling interval of the stored records
+            start (datetime): Inclusive start of the range
+            end (datetime): Inclusive end of the range
+            columns (list): Columns to read besides 'timestamp'; None reads all
+
+        Returns:
+            pd.DataFrame: Records sorted by timestamp, one per timestamp
+        """
+        files = []
+        day = start.date()
+        while day <= end.date():
+            path = self._partition(system, interval_minutes, day)
+            if os.path.isdir(path):
+                files += [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.parquet')]
+            day += timedelta(days=1)
+
+        if not files:
+            return pd.DataFrame(columns=['timestamp', *(columns or [])])
+
+        dataset = ds.dataset(files, format='parquet')
+        timestamp_type = dataset.schema.field('timestamp').type
+        predicate = (
+            (ds.field('timestamp') >= pa.scalar(pd.Timestamp(start), type=timestamp_type)) &
+            (ds.field('timestamp') <= pa.scalar(pd.Timestamp(end), type=timestamp_type))
+        )
+        projection = None if columns is None else ['timestamp', *[c for c in columns if c != 'timestamp']]
+
+        frame = dataset.to_table(columns=projection, filter=predicate).to_pandas()
+        frame = frame.sort_values('timestamp', kind='stable').drop_duplicates('timestamp')
+        return frame.reset_index(drop=True)
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+
+# Where fitted models are persisted unless QEAIMS_MODEL_DIR says otherwise
+DEFAULT_MODEL_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'qeaims', 'models')
+
+class ModelRegistry:
+    """
+    Process-wide registry of fitted anomaly models.
+
+    Models are keyed by (system, columns, contamination, training window,
+    method, sample size) and kept in an in-memory LRU. They are also written
+    to disk with joblib, so a restarted dashboard process loads them instead
+    of training again. A model older than max_age_seconds is refitted on the
+    next request, keeping it in step with the rolling data it was trained on.
+    """
+
+    def __init__(self, directory=None, max_models=64, max_age_seconds=3600):
+        """
+        Args:
+            directory (str): Directory for persisted models; None keeps models in memory only
+            max_models (int): Maximum number of models kept in memory
+            max_age_seconds (float): Age after which a model is refitted
+        """
+        self.directory = directory
+        self.max_models = max_models
+        self.max_age_seconds = max_age_seconds
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.fits = 0
+        self.loads = 0
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{key[0]}-{digest}.joblib")
+
+    def _fresh(self, fitted_at):
+        return time.time() - fitted_at < self.max_age_seconds
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and self._fresh(entry[0]):
+                self._models.move_to_end(key)
+                return entry[1]
+        return None
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            stored = joblib.load(self._path(key))
+        except (OSError, EOFError, ValueError):
+            return None
+        if stored.get('key') != key or not self._fresh(stored['fitted_at']):
+            return None
+        self.loads += 1
+        return stored['fitted_at'], stored['model']
+
+    def _save(self, key, fitted_at, model):
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            # Write then rename so concurrent readers never see a partial file
+            temporary = f"{path}.{os.getpid()}.tmp"
+            joblib.dump({'key': key, 'fitted_at': fitted_at, 'model': model}, temporary)
+            os.replace(temporary, path)
+        except OSError:
+            pass
+
+    def _store(self, key, fitted_at, model):
+        with self._lock:
+            self._models[key] = (fitted_at, model)
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+
+    def get_or_fit(self, key, fit):
+        """
+        Return the fitted model for key, loading or fitting it if needed.
+
+        Args:
+            key (tuple): (system, columns, contamination, training window, method, sample size)
+            fit (callable): Zero-argument function returning a fitted model
+
+        Returns:
+            object: Fitted model (shared, do not refit it)
+        """
+        model = self._lookup(key)
+        if model is not None:
+            return model
+
+        # Serialize fitting per key so concurrent sessions train one model
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            model = self._lookup(key)
+            if model is None:
+                entry = self._load(key)
+                if entry is None:
+                    entry = (time.time(), fit())
+                    self.fits += 1
+                    self._save(key, *entry)
+                self._store(key, *entry)
+                model = entry[1]
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+        return model
+
+    def clear(self):
+        """Forget every model held in memory (persisted models are kept)."""
+        with self._lock:
+            self._models.clear()
+
+MODEL_REGISTRY = ModelRegistry(os.environ.get('QEAIMS_MODEL_DIR', DEFAULT_MODEL_DIR))
@@ -1,8 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
 import networkx as nx
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 
+# Where computed layouts are persisted unless QEAIMS_LAYOUT_DIR says otherwise
+DEFAULT_LAYOUT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'qeaims', 'layouts')
+
+def graph_structure_hash(G):
+    """
+    Hash the parts of a graph that determine its layout.
+
+    Only node names and weighted edges count, so graphs that differ in node
+    attributes such as status, color or size share a hash.
+
+    Args:
+        G (nx.Graph): NetworkX graph object
+
+    Returns:
+        str: Hex digest of the structure
+    """
+    nodes = sorted(map(str, G.nodes()))
+    edges = sorted(tuple(sorted((str(u), str(v)))) + (data.get('weight', 1),) for u, v, data in G.edges(data=True))
+    return hashlib.blake2b(repr((nodes, edges)).encode(), digest_size=16).hexdigest()
+
+def _neighborhoods(G):
+    return {node: {(neighbor, G.edges[node, neighbor].get('weight', 1)) for neighbor in G.neighbors(node)} for node in G.nodes()}
+
+class LayoutCache:
+    """
+    Process-wide cache of node positions, keyed by the structural hash of a graph.
+
+    A graph whose structure was laid out before gets its positions without any
+    layout work, however its node attributes changed. A graph that differs
+    from a cached one in a few nodes or edges is laid out incrementally: nodes
+    whose neighborhood is unchanged keep their positions and only the others
+    are moved, starting from the cached positions (new nodes start at the
+    centre of their placed neighbors). Layouts are also written to disk, so a
+    restarted dashboard process reuses them.
+    """
+
+    def __init__(self, directory=None, max_layouts=32, k=0.15, seed=42, incremental_iterations=20):
+        """
+        Args:
+            directory (str): Directory for persisted layouts; None keeps layouts in memory only
+            max_layouts (int): Maximum number of layouts kept in memory
+            k (float): Optimal node distance of the spring layout
+            seed (int): Seed of the spring layout
+            incremental_iterations (int): Spring layout iterations when moving only changed nodes
+        """
+        self.directory = directory
+        self.max_layouts = max_layouts
+        self.k = k
+        self.seed = seed
+        self.incremental_iterations = incremental_iterations
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.incremental = 0
+        self.full = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key)) as layout_file:
+                stored = json.load(layout_file)
+        except (OSError, ValueError):
+            return None
+        return {node: np.array(position) for node, position in stored['positions']}, stored['neighborhoods']
+
+    def _save(self, key, positions, neighborhoods):
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            # Write then rename so concurrent readers never see a partial file
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, 'w') as layout_file:
+                json.dump({
+                    'positions': [[node, position.tolist()] for node, position in positions.items()],
+                    'neighborhoods': {node: sorted(map(list, neighbors)) for node, neighbors in neighborhoods.items()}
+                }, layout_file)
+            os.replace(temporary, path)
+        except (OSError, TypeError):
+            pass
+
+    def _store(self, key, positions, neighborhoods):
+        with self._lock:
+            self._layouts[key] = (positions, neighborhoods)
+            self._layouts.move_to_end(key)
+            while len(self._layouts) > self.max_layouts:
+                self._layouts.popitem(last=False)
+
+    def _closest(self, G):
+        # Most recently used cached layout sharing the most nodes with G
+        with self._lock:
+            layouts = list(self._layouts.values())[::-1]
+        nodes = set(G.nodes())
+        return max(layouts, key=lambda layout: len(nodes.intersection(layout[0])), default=None)
+
+    def _incremental(self, G, positions, neighborhoods):
+        current = _neighborhoods(G)
+        unchanged = [
+            node for node in G.nodes()
+            if node in positions and {tuple(neighbor) for neighbor in neighborhoods.get(node, ())} == current[node]
+        ]
+        if len(unchanged) < len(G) / 2:
+            return None
+
+        initial = {node: positions[node] for node in G.nodes() if node in positions}
+        for node in G.nodes():
+            if node not in initial:
+                placed = [initial[neighbor] for neighbor in G.neighbors(node) if neighbor in initial]
+                initial[node] = np.mean(placed, axis=0) if placed else np.zeros(2)
+        # Fixed nodes keep their coordinates; the layout is not rescaled
+        return nx.spring_layout(G, pos=initial, fixed=unchanged or None, k=self.k, seed=self.seed,
+                                iterations=self.incremental_iterations)
+
+    def get_layout(self, G):
+        """
+        Get node positions for a graph, computing as little layout as possible.
+
+        Args:
+            G (nx.Graph): NetworkX graph object
+
+        Returns:
+            dict: Node to (x, y) position array (shared, do not modify)
+        """
+        key = graph_structure_hash(G)
+        with self._lock:
+            entry = self._layouts.get(key)
+            if entry is not None:
+                self._layouts.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        entry = self._load(key)
+        if entry is not None:
+            self.hits += 1
+            self._store(key, *entry)
+            return entry[0]
+
+        closest = self._closest(G)
+        positions = self._incremental(G, *closest) if closest is not None else None
+        if positions is None:
+            positions = nx.spring_layout(G, seed=self.seed, k=self.k)
+            self.full += 1
+        else:
+            self.incremental += 1
+
+        neighborhoods = _neighborhoods(G)
+        self._store(key, positions, neighborhoods)
+        self._save(key, positions, neighborhoods)
+        return positions
+
+    def clear(self):
+        """Forget every layout held in memory (persisted layouts are kept)."""
+        with self._lock:
+            self._layouts.clear()
+
+LAYOUT_CACHE = LayoutCache(os.environ.get('QEAIMS_LAYOUT_DIR', DEFAULT_LAYOUT_DIR))
+
 def create_system_graph():
     """
     Create a network graph representing the integrated QEAIMS system.
@@ -175,69 +343,59 @@ def create_network_visualization(G, title="QEAIMS Integrated System Network"):
     Returns:
         go.Figure: Plotly figure object
     """
-    # Calculate layout using networkx
-    pos = nx.spring_layout(G, seed=42, k=0.15)
-    
-    # Create node traces for each node type
-    node_traces = {}
-    node_types = set(nx.get_node_attributes(G, 'type').values())
-    
-    for node_type in node_types:
-        node_traces[node_type] = go.Scatter(
-            x=[],
-            y=[],
-            text=[],
+    # Node positions depend only on the graph structure, so status updates reuse the cached layout
+    pos = LAYOUT_CACHE.get_layout(G)
+    
+    # Collect node data per type, then build each trace once
+    node_types = dict.fromkeys(nx.get_node_attributes(G, 'type').values())
+    node_data = {node_type: {'x': [], 'y': [], 'text': [], 'size': [], 'color': []} for node_type in node_types}
+    
+    for node in G.nodes():
+        x, y = pos[node]
+        node_type = G.nodes[node]['type']
+        status = G.nodes[node].get('status', 'Normal')
+        
+        data = node_data[node_type]
+        data['x'].append(x)
+        data['y'].append(y)
+        data['size'].append(G.nodes[node]['size'])
+        data['color'].append(G.nodes[node]['color'])
+        data['text'].append(f'Node: {node}<br>Type: {node_type}<br>Status: {status}')
+    
+    node_traces = {
+        node_type: go.Scatter(
+            x=data['x'],
+            y=data['y'],
+            text=data['text'],
             mode='markers',
             name=node_type.capitalize(),
             marker=dict(
                 showscale=False,
-                size=[],
+                size=data['size'],
+                color=data['color'],
                 line=dict(width=2, color='#ffffff')
             ),
             hoverinfo='text'
         )
+        for node_type, data in node_data.items()
+    }
     
-    # Add nodes to traces
-    for node in G.nodes():
-        x, y = pos[node]
-        node_type = G.nodes[node]['type']
-        size = G.nodes[node]['size']
-        color = G.nodes[node]['color']
-        status = G.nodes[node].get('status', 'Normal')
-        
-        node_traces[node_type].x = node_traces[node_type].x + (x,)
-        node_traces[node_type].y = node_traces[node_type].y + (y,)
-        node_traces[node_type].marker.size = node_traces[node_type].marker.size + (size,)
-        
-        node_info = f'Node: {node}<br>Type: {node_type}<br>Status: {status}'
-        node_traces[node_type].text = node_traces[node_type].text + (node_info,)
-        
-        # If the node has a specific color, add it to the marker.color list
-        if not hasattr(node_traces[node_type].marker, 'color') or node_traces[node_type].marker.color is None:
-            node_traces[node_type].marker.color = []
-        
-        # Handle the case where color might be None or already a list
-        if isinstance(node_traces[node_type].marker.color, list):
-            node_traces[node_type].marker.color.append(color)
-        else:
-            node_traces[node_type].marker.color = [color]
+    # Create edge trace, with a None gap after every edge
+    edge_x, edge_y = [], []
+    for edge in G.edges():
+        x0, y0 = pos[edge[0]]
+        x1, y1 = pos[edge[1]]
+        edge_x += [x0, x1, None]
+        edge_y += [y0, y1, None]
     
-    # Create edge traces
     edge_trace = go.Scatter(
-        x=[],
-        y=[],
+        x=edge_x,
+        y=edge_y,
         line=dict(width=1, color='#888'),
         hoverinfo='none',
         mode='lines'
     )
     
-    # Add edges to trace
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_trace.x += (x0, x1, None)
-        edge_trace.y += (y0, y1, None)
-    
     # Create figure
     fig = go.Figure(
         data=[edge_trace] + list(node_traces.values()),
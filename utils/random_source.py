@@ -0,0 +1,95 @@
+import numpy as np
+
+class RandomSource:
+    """
+    Seeded source of independent random streams for synthetic data.
+
+    Wraps a np.random.SeedSequence so that every system and metric draws from
+    its own child stream. Child streams are derived from their position in a
+    fixed list of names, so the same seed always yields the same values for a
+    given system/metric regardless of the order in which they are generated.
+    This makes generated data reproducible (and therefore safe to cache) and
+    lets systems be generated independently, e.g. in separate worker processes,
+    without touching the global np.random state.
+    """
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed (int | np.random.SeedSequence | None): Root seed. None draws fresh entropy.
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+
+    @property
+    def entropy(self):
+        """int: Root entropy, which can be passed back as a seed to reproduce the data."""
+        return self.seed_sequence.entropy
+
+    def child(self, key):
+        """
+        Get the child stream at a fixed spawn position.
+
+        This is equivalent to the key-th stream returned by SeedSequence.spawn,
+        but does not depend on how many children were spawned before.
+
+        Args:
+            key (int): Spawn position of the child stream
+
+        Returns:
+            RandomSource: Independent child source
+        """
+        return RandomSource(np.random.SeedSequence(
+            self.seed_sequence.entropy,
+            spawn_key=self.seed_sequence.spawn_key + (int(key),),
+            pool_size=self.seed_sequence.pool_size
+        ))
+
+    def spawn(self, names):
+        """
+        Split the source into one independent child stream per name.
+
+        Args:
+            names (iterable): Names of the child streams, e.g. systems or metrics
+
+        Returns:
+            dict: Name to RandomSource
+        """
+        return {name: self.child(index) for index, name in enumerate(names)}
+
+    def generator(self):
+        """
+        Create a NumPy Generator drawing from this stream.
+
+        Returns:
+            np.random.Generator: Generator seeded from this source
+        """
+        return np.random.Generator(np.random.PCG64(self.seed_sequence))
+
+    def generators(self, names):
+        """
+        Create one independent Generator per name.
+
+        Args:
+            names (iterable): Names of the streams, e.g. metric columns
+
+        Returns:
+            dict: Name to np.random.Generator
+        """
+        return {name: source.generator() for name, source in self.spawn(names).items()}
+
+def as_random_source(seed=None):
+    """
+    Normalize a seed argument into a RandomSource.
+
+    Args:
+        seed (int | np.random.SeedSequence | RandomSource | None): Seed to normalize
+
+    Returns:
+        RandomSource: The given source, or a new one seeded from seed
+    """
+    if isinstance(seed, RandomSource):
+        return seed
+    return RandomSource(seed)
@@ -0,0 +1,78 @@
+import numpy as np
+
+class RingBuffer:
+    """
+    Fixed-capacity columnar ring buffer with zero-copy contiguous reads.
+
+    Every value is stored twice, at position i and i + capacity, so the most
+    recent `capacity` rows always form one contiguous slice of the storage and
+    can be returned as NumPy views without copying or re-ordering. Appending k
+    rows costs O(k) regardless of the capacity.
+    """
+
+    def __init__(self, capacity, dtypes):
+        """
+        Args:
+            capacity (int): Maximum number of rows held
+            dtypes (dict): Column name to NumPy dtype
+        """
+        self.capacity = int(capacity)
+        self._storage = {name: np.empty(2 * self.capacity, dtype=dtype) for name, dtype in dtypes.items()}
+        self._written = 0
+
+    def __len__(self):
+        return min(self._written, self.capacity)
+
+    def append(self, columns):
+        """
+        Append rows, evicting the oldest ones beyond the capacity.
+
+        Args:
+            columns (dict): Column name to array of new values (same length for all columns)
+        """
+        count = len(next(iter(columns.values())))
+        if count == 0 or self.capacity == 0:
+            return
+
+        # Only the newest `capacity` rows can survive the append
+        skip = max(0, count - self.capacity)
+        positions = (self._written + skip + np.arange(count - skip)) % self.capacity
+
+        for name, values in columns.items():
+            storage = self._storage[name]
+            storage[positions] = values[skip:]
+            storage[positions + self.capacity] = values[skip:]
+
+        self._written += count
+
+    def replace_last(self, row):
+        """
+        Overwrite the newest row in place.
+
+        Args:
+            row (dict): Column name to new scalar value
+        """
+        position = (self._written - 1) % self.capacity
+        for name, value in row.items():
+            storage = self._storage[name]
+            storage[position] = value
+            storage[position + self.capacity] = value
+
+    def view(self):
+        """
+        Get read-only views of the buffered rows, oldest first.
+
+        The views share memory with the buffer: they are valid until the next
+        append, which overwrites the slots of the evicted rows.
+
+        Returns:
+            dict: Column name to array view
+        """
+        size = len(self)
+        start = (self._written - size) % self.capacity if self.capacity else 0
+        views = {}
+        for name, storage in self._storage.items():
+            view = storage[start:start + size]
+            view.flags.writeable = False
+            views[name] = view
+        return views
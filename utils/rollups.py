@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from utils.ring_buffer import RingBuffer
+
+# Rollup tiers as (name, bucket width in seconds), finest first
+ROLLUP_TIERS = [
+    ('1m', 60),
+    ('15m', 15 * 60),
+    ('1h', 60 * 60),
+    ('1d', 24 * 60 * 60)
+]
+
+# Buckets kept per tier when the covered span is not bounded
+DEFAULT_RETENTION = {
+    '1m': 7 * 24 * 60,
+    '15m': 90 * 24 * 4,
+    '1h': 2 * 365 * 24,
+    '1d': 10 * 365
+}
+
+# Number of points a full-width chart can usefully show
+DEFAULT_CHART_WIDTH = 1000
+
+class RollupTier:
+    """
+    One aggregation level: count, sum, min and max per column and time bucket.
+
+    Buckets are kept in a RingBuffer. Ingesting a batch aggregates it with one
+    reduceat per statistic and merges its first bucket into the open (newest)
+    bucket, so the cost is proportional to the batch, not to the history.
+    """
+
+    def __init__(self, name, seconds, columns, capacity):
+        """
+        Args:
+            name (str): Tier name, e.g. '1h'
+            seconds (int): Bucket width in seconds
+            columns (list): Aggregated columns
+            capacity (int): Number of buckets kept
+        """
+        self.name = name
+        self.width = np.int64(seconds * 1_000_000)
+        self.columns = list(columns)
+        dtypes = {'timestamp': 'datetime64[us]', 'count': np.int64}
+        for column in self.columns:
+            dtypes.update({f'{column}_sum': np.float64, f'{column}_min': np.float64, f'{column}_max': np.float64})
+        self._buffer = RingBuffer(capacity, dtypes)
+
+    def ingest(self, timestamps, values):
+        """
+        Add samples, which must not be older than the newest bucket.
+
+        Args:
+            timestamps (np.ndarray): int64 microsecond timestamps in ascending order
+            values (dict): Column name to float array
+        """
+        buckets = timestamps // self.width * self.width
+        view = self._buffer.view()
+        if len(view['timestamp']):
+            # Late samples cannot be merged into closed buckets
+            keep = buckets >= view['timestamp'][-1].astype(np.int64)
+            if not keep.all():
+                buckets = buckets[keep]
+                values = {column: column_values[keep] for column, column_values in values.items()}
+        if len(buckets) == 0:
+            return
+
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        batch = {
+            'timestamp': buckets[starts].astype('datetime64[us]'),
+            'count': np.diff(np.r_[starts, len(buckets)])
+        }
+        for column in self.columns:
+            column_values = np.asarray(values[column], dtype=np.float64)
+            batch[f'{column}_sum'] = np.add.reduceat(column_values, starts)
+            batch[f'{column}_min'] = np.minimum.reduceat(column_values, starts)
+            batch[f'{column}_max'] = np.maximum.reduceat(column_values, starts)
+
+        # Merge the first bucket of the batch into the open bucket
+        if len(view['timestamp']) and view['timestamp'][-1] == batch['timestamp'][0]:
+            merged = {'count': view['count'][-1] + batch['count'][0]}
+            for column in self.columns:
+                merged[f'{column}_sum'] = view[f'{column}_sum'][-1] + batch[f'{column}_sum'][0]
+                merged[f'{column}_min'] = min(view[f'{column}_min'][-1], batch[f'{column}_min'][0])
+                merged[f'{column}_max'] = max(view[f'{column}_max'][-1], batch[f'{column}_max'][0])
+            self._buffer.replace_last(merged)
+            batch = {name: batch_values[1:] for name, batch_values in batch.items()}
+
+        self._buffer.append(batch)
+
+    def count_between(self, start, end):
+        """Number of buckets starting within [start, end]."""
+        timestamps = self._buffer.view()['timestamp']
+        return int(np.searchsorted(timestamps, end, side='right') - np.searchsorted(timestamps, start, side='left'))
+
+    def frame(self, start, end):
+        """
+        Get the buckets starting within [start, end].
+
+        Returns:
+            pd.DataFrame: timestamp, count and, per column, mean, min and max
+        """
+        view = self._buffer.view()
+        lo = np.searchsorted(view['timestamp'], start, side='left')
+        hi = np.searchsorted(view['timestamp'], end, side='right')
+        count = view['count'][lo:hi]
+        data = {'timestamp': view['timestamp'][lo:hi].copy(), 'count': count.copy()}
+        for column in self.columns:
+            data[column] = view[f'{column}_sum'][lo:hi] / count
+            data[f'{column}_min'] = view[f'{column}_min'][lo:hi].copy()
+            data[f'{column}_max'] = view[f'{column}_max'][lo:hi].copy()
+        return pd.DataFrame(data)
+
+class RollupSet:
+    """
+    Multi-tier rollups (1m, 15m, 1h, 1d) of a stream of samples.
+
+    Every tier is maintained incrementally as samples arrive. Queries pick the
+    finest tier whose number of buckets in the requested range fits the chart
+    width, so e.g. a 30-day chart reads about 720 hourly rows instead of every
+    raw sample.
+    """
+
+    def __init__(self, columns, span_seconds=None, tiers=ROLLUP_TIERS, interval_seconds=None):
+        """
+        Args:
+            columns (list): Aggregated columns
+            span_seconds (float): Longest span ever queried, bounding the buckets kept; None uses DEFAULT_RETENTION
+            tiers (list): (name, seconds) tiers, finest first
+            interval_seconds (float): Sampling interval of the stream; tiers finer than it are skipped
+        """
+        self.columns = list(columns)
+        if interval_seconds is not None:
+            # A tier finer than the samples holds at most one sample per bucket; keep at least the coarsest
+            tiers = [tier for tier in tiers if tier[1] >= interval_seconds] or list(tiers)[-1:]
+        self.tiers = []
+        for name, seconds in tiers:
+            if span_seconds is None:
+                capacity = DEFAULT_RETENTION.get(name, 10_000)
+            else:
+                capacity = int(span_seconds // seconds) + 2
+            self.tiers.append(RollupTier(name, seconds, self.columns, capacity))
+
+    def ingest(self, timestamps, values):
+        """
+        Add samples in ascending time order.
+
+        Args:
+            timestamps (np.ndarray): datetime64 timestamps
+            values (dict): Column name to array; must contain every aggregated column
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[us]').astype(np.int64)
+        for tier in self.tiers:
+            tier.ingest(timestamps, values)
+
+    def select_tier(self, start, end, width_px=DEFAULT_CHART_WIDTH):
+        """
+        Pick the finest tier with at most width_px buckets in [start, end].
+
+        Args:
+            start (np.datetime64): Start of the range
+            end (np.datetime64): End of the range
+            width_px (int): Chart width in points
+
+        Returns:
+            RollupTier: Selected tier (the coarsest one if none fits)
+        """
+        for tier in self.tiers:
+            if tier.count_between(start, end) <= width_px:
+                return tier
+        return self.tiers[-1]
+
+    def query(self, start, end, width_px=DEFAULT_CHART_WIDTH):
+        """
+        Read rollups for a chart of the given range and width.
+
+        Args:
+            start (np.datetime64): Start of the range
+            end (np.datetime64): End of the range
+            width_px (int): Chart width in points
+
+        Returns:
+            pd.DataFrame: timestamp, count and per-column mean (named like the column), min and max;
+                an 'anomaly' column is turned into a flag set when any sample in the bucket was anomalous
+        """
+        start = np.datetime64(start, 'us')
+        end = np.datetime64(end, 'us')
+        tier = self.select_tier(start, end, width_px)
+        frame = tier.frame(start, end)
+        frame.attrs['tier'] = tier.name
+        if 'anomaly' in self.columns:
+            frame['anomaly'] = frame['anomaly_max'] > 0
+        return frame
@@ -0,0 +1,154 @@
+import fcntl
+import mmap
+import os
+import zlib
+
+import numpy as np
+
+MAGIC = b'QEAIMSLS'
+VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('n_fields', '<u4'),
+    ('n_slots', '<u4'),
+    ('layout_crc', '<u4'),
+    ('write_seq', '<u8'),
+    ('reserved', 'V32')
+])
+
+class SharedLatestState:
+    """
+    Fixed-width ring of latest-metric snapshots in a memory-mapped file.
+
+    One producer process publishes snapshots and any number of dashboard
+    processes read them straight from the shared mapping, so every process
+    shows the same numbers at the cost of a few memory reads. Each slot holds
+    a sequence number, a timestamp and one float64 per field. Writes follow a
+    seqlock protocol: a slot's sequence is odd while it is being written and
+    even once complete, and readers retry if it changed while they copied.
+    The producer builds the file under a temporary name and renames it into
+    place once the header is written, and holds a lock on `<path>.lock`.
+    """
+
+    def __init__(self, path, fields, slots=64, writer=False):
+        """
+        Args:
+            path (str): Path of the ring file
+            fields (list): Names of the stored values, in a fixed order
+            slots (int): Number of snapshots kept in the ring (writer only)
+            writer (bool): Open as the single producer; creates the file and locks it
+        """
+        self.path = path
+        self.fields = list(fields)
+        self.writer = writer
+        layout_crc = zlib.crc32(','.join(self.fields).encode())
+        self._slot_dtype = np.dtype([
+            ('seq', '<u8'),
+            ('timestamp', '<i8'),
+            ('values', '<f8', (len(self.fields),))
+        ])
+
+        if writer:
+            self._lock_file = open(f"{path}.lock", 'a+b')
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock_file.close()
+                raise RuntimeError(f"Another producer is already writing {path}")
+            # Build the ring under a temporary name, so readers never open one without a header
+            staging = f"{path}.{os.getpid()}.tmp"
+            self._file = open(staging, 'w+b')
+            size = HEADER_DTYPE.itemsize + slots * self._slot_dtype.itemsize
+            self._file.truncate(size)
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+        else:
+            self._lock_file = None
+            self._file = open(path, 'rb')
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._file.close()
+                raise ValueError(f"{path} does not hold a compatible latest-state ring")
+        self._inode = os.fstat(self._file.fileno()).st_ino
+
+        if len(self._mmap) < HEADER_DTYPE.itemsize:
+            self.close()
+            raise ValueError(f"{path} does not hold a compatible latest-state ring")
+        self._header = np.frombuffer(self._mmap, dtype=HEADER_DTYPE, count=1)
+
+        if writer:
+            self._header[0] = (MAGIC, VERSION, len(self.fields), slots, layout_crc, 0, b'')
+            os.replace(staging, path)
+        elif (self._header['magic'][0] != MAGIC or self._header['version'][0] != VERSION
+              or self._header['layout_crc'][0] != layout_crc):
+            self.close()
+            raise ValueError(f"{path} does not hold a compatible latest-state ring")
+
+        self.slots = int(self._header['n_slots'][0])
+        self._slots = np.frombuffer(self._mmap, dtype=self._slot_dtype, count=self.slots, offset=HEADER_DTYPE.itemsize)
+
+    def publish(self, values, timestamp):
+        """
+        Write a snapshot into the next slot (producer only).
+
+        Args:
+            values (array-like): One value per field, in field order
+            timestamp (np.datetime64): Time of the snapshot
+        """
+        sequence = int(self._header['write_seq'][0]) + 1
+        slot = self._slots[sequence % self.slots]
+
+        slot['seq'] = 2 * sequence - 1
+        slot['timestamp'] = np.datetime64(timestamp, 'us').astype(np.int64)
+        slot['values'] = values
+        slot['seq'] = 2 * sequence
+        self._header['write_seq'] = sequence
+
+    def read(self, retries=100):
+        """
+        Read the newest complete snapshot.
+
+        Args:
+            retries (int): Attempts before giving up when the producer keeps overwriting the slot
+
+        Returns:
+            tuple: (sequence, np.datetime64 timestamp, values array), or None if nothing was published
+        """
+        for _ in range(retries):
+            sequence = int(self._header['write_seq'][0])
+            if sequence == 0:
+                return None
+
+            slot = self._slots[sequence % self.slots]
+            before = int(slot['seq'])
+            if before != 2 * sequence:
+                continue
+            timestamp = int(slot['timestamp'])
+            values = slot['values'].copy()
+            if int(slot['seq']) == before:
+                return sequence, np.datetime64(timestamp, 'us'), values
+
+        raise RuntimeError(f"Could not read a consistent snapshot from {self.path}")
+
+    def close(self):
+        """Release the mapping and the file (and the producer lock)."""
+        self._header = None
+        self._slots = None
+        self._mmap.close()
+        self._file.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+    def replaced(self):
+        """Whether another ring has been moved into place at path since this one was opened."""
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def exists(path):
+        """Whether a ring file has been created at path."""
+        return os.path.exists(path)
@@ -0,0 +1,214 @@
+import numpy as np
+
+# Scale of the median absolute deviation relative to the standard deviation of a normal distribution
+MAD_SCALE = 1.4826
+
+class _SystemState:
+    """Views of one system's slice of the detector's state arrays."""
+
+    def __init__(self, detector, columns, start):
+        stop = start + len(columns)
+        self.columns = list(columns)
+        self.count = detector.count[start:stop]
+        self.mean = detector.mean[start:stop]
+        self.var = detector.var[start:stop]
+        self.median = detector.median[start:stop]
+        self.mad = detector.mad[start:stop]
+        self.z = detector.z[start:stop]
+        self.robust_z = detector.robust_z[start:stop]
+        self.alarm = detector.alarm[start:stop]
+        self.alarms = detector.alarms[start:stop]
+        # Scratch space for the in-place update
+        self.a = np.zeros(len(columns))
+        self.b = np.zeros(len(columns))
+        self.c = np.zeros(len(columns))
+        self.flag = np.zeros(len(columns), dtype=bool)
+        self.ready = False
+
+class StreamingDetector:
+    """
+    Per-sample anomaly detector for every metric of every system.
+
+    Each metric keeps an exponentially weighted mean and variance and
+    stochastic approximations of its median and median absolute deviation.
+    Every sample is scored against the state before it: a metric alarms when
+    both its EWMA z-score and its robust (median/MAD) z-score exceed the
+    threshold. The state of all metrics lives in a few flat arrays, with one
+    contiguous slice per system, and an update is a fixed number of in-place
+    array operations, so each sample costs O(1) with no allocation.
+    """
+
+    def __init__(self, metrics, alpha=0.02, threshold=4.0, warmup=50, median_rate=0.02, min_scale=1e-9):
+        """
+        Args:
+            metrics (dict): System name to list of metric columns
+            alpha (float): EWMA smoothing factor
+            threshold (float): z-score above which a metric alarms
+            warmup (int): Samples per metric before alarms are raised
+            median_rate (float): Step of the median/MAD approximations, relative to the current spread
+            min_scale (float): Lower bound of the spread, avoiding division by zero
+        """
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.median_rate = median_rate
+        self.min_scale = min_scale
+
+        size = sum(len(columns) for columns in metrics.values())
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.var = np.zeros(size)
+        self.median = np.zeros(size)
+        self.mad = np.zeros(size)
+        self.z = np.zeros(size)
+        self.robust_z = np.zeros(size)
+        self.alarm = np.zeros(size, dtype=bool)
+        self.alarms = np.zeros(size, dtype=np.int64)
+
+        self._systems = {}
+        start = 0
+        for system, columns in metrics.items():
+            self._systems[system] = _SystemState(self, columns, start)
+            start += len(columns)
+
+    def columns(self, system):
+        """Metric columns of a system, in the order update() expects."""
+        return self._systems[system].columns
+
+    def update(self, system, values):
+        """
+        Score one sample of a system and fold it into the state.
+
+        Args:
+            system (str): The utility system
+            values (np.ndarray): float64 value per metric, in columns(system) order; NaN marks a missing value
+
+        Returns:
+            np.ndarray: Per-metric alarm flags for this sample (a view, overwritten by the next update)
+        """
+        state = self._systems[system]
+
+        if not np.isfinite(values.sum()):
+            return self._update_partial(state, values)
+
+        if not state.ready:
+            # First sample of a metric seeds its mean and median
+            unseen = state.count == 0
+            np.copyto(state.mean, values, where=unseen)
+            np.copyto(state.median, values, where=unseen)
+            state.ready = True
+
+        self._update(state, values)
+        return state.alarm
+
+    def update_batch(self, system, rows):
+        """
+        Score a batch of samples of a system, one sample at a time.
+
+        Args:
+            system (str): The utility system
+            rows (np.ndarray): (samples, metrics) float64 array in columns(system) order
+
+        Returns:
+            np.ndarray: Whether any metric alarmed, per sample
+        """
+        flagged = np.zeros(len(rows), dtype=bool)
+        for index in range(len(rows)):
+            flagged[index] = self.update(system, rows[index]).any()
+        return flagged
+
+    def alarming(self, system):
+        """Whether any metric of a system alarmed on its latest sample."""
+        return bool(self._systems[system].alarm.any())
+
+    def status(self, system):
+        """
+        Get the current per-metric state of a system.
+
+        Returns:
+            dict: Metric column to dict of mean, std, median, mad, z, robust_z, alarm and alarms
+        """
+        state = self._systems[system]
+        return {
+            column: {
+                'mean': float(state.mean[index]),
+                'std': float(np.sqrt(state.var[index])),
+                'median': float(state.median[index]),
+                'mad': float(state.mad[index]),
+                'z': float(state.z[index]),
+                'robust_z': float(state.robust_z[index]),
+                'alarm': bool(state.alarm[index]),
+                'alarms': int(state.alarms[index])
+            }
+            for index, column in enumerate(state.columns)
+        }
+
+    def _update(self, state, x):
+        a, b, c, flag = state.a, state.b, state.c, state.flag
+
+        # Score against the state before this sample
+        np.subtract(x, state.mean, out=a)
+        np.sqrt(state.var, out=b)
+        np.maximum(b, self.min_scale, out=b)
+        np.divide(a, b, out=state.z)
+
+        np.subtract(x, state.median, out=b)
+        np.maximum(state.mad, self.min_scale, out=c)
+        c *= MAD_SCALE
+        np.divide(b, c, out=state.robust_z)
+
+        np.abs(state.z, out=c)
+        np.greater(c, self.threshold, out=state.alarm)
+        np.abs(state.robust_z, out=c)
+        np.greater(c, self.threshold, out=flag)
+        np.logical_and(state.alarm, flag, out=state.alarm)
+        np.greater_equal(state.count, self.warmup, out=flag)
+        np.logical_and(state.alarm, flag, out=state.alarm)
+        state.alarms += state.alarm
+
+        # Step of the median/MAD approximations, proportional to the current spread
+        np.sqrt(state.var, out=c)
+        c /= MAD_SCALE
+        np.maximum(c, state.mad, out=c)
+        np.maximum(c, self.min_scale, out=c)
+        c *= self.median_rate
+
+        # Median and MAD move one step towards the sample (b = x - median)
+        np.abs(b, out=b)
+        b -= state.mad
+        np.sign(b, out=b)
+        b *= c
+        state.mad += b
+        np.maximum(state.mad, 0, out=state.mad)
+
+        np.subtract(x, state.median, out=b)
+        np.sign(b, out=b)
+        b *= c
+        state.median += b
+
+        # EWMA mean and variance (a = x - mean)
+        np.multiply(a, self.alpha, out=b)
+        state.mean += b
+        a *= b
+        state.var += a
+        state.var *= 1 - self.alpha
+
+        state.count += 1
+
+    def _update_partial(self, state, values):
+        # Rare path: leave the state of missing metrics untouched
+        missing = ~np.isfinite(values)
+        saved = [array[missing] for array in (state.count, state.mean, state.var, state.median, state.mad, state.alarms)]
+        filled = np.where(missing, np.where(state.count == 0, 0.0, state.median), values)
+        unseen = (state.count == 0) & ~missing
+        np.copyto(state.mean, filled, where=unseen)
+        np.copyto(state.median, filled, where=unseen)
+
+        self._update(state, filled)
+
+        for array, value in zip((state.count, state.mean, state.var, state.median, state.mad, state.alarms), saved):
+            array[missing] = value
+        state.z[missing] = 0
+        state.robust_z[missing] = 0
+        state.alarm[missing] = False
+        return state.alarm
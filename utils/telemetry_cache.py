@@ -0,0 +1,195 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+class TelemetryCache:
+    """
+    Process-wide LRU cache for telemetry query results.
+
+    Entries are keyed by the query (e.g. system, hours, interval) plus the time
+    bucket it was computed in, so every Streamlit session asking for the same
+    window within a bucket shares one computation. The cache is bounded by
+    entry count and approximate size in bytes, and entries expire after a TTL.
+    Concurrent misses on the same key wait for the first computation instead
+    of computing it again.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=256 * 1024 * 1024, ttl_seconds=900):
+        """
+        Args:
+            max_entries (int): Maximum number of cached results
+            max_bytes (int): Maximum approximate total size of cached results
+            ttl_seconds (float): Time after which an entry is evicted
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute, ttl_seconds=None):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key (tuple): Hashable cache key, including the time bucket
+            compute (callable): Zero-argument function producing the value
+            ttl_seconds (float): Lifetime of a new entry, defaults to the cache TTL
+
+        Returns:
+            object: Cached or freshly computed value (shared, treat as read-only)
+        """
+        found, value = self._lookup(key, count_miss=False)
+        if found:
+            return value
+
+        # Serialize computation per key so one window is computed once per bucket
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            found, value = self._lookup(key)
+            if not found:
+                value = compute()
+                self._store(key, value, self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+
+        with self._lock:
+            self._key_locks.pop(key, None)
+
+        return value
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, approximate bytes, hits and misses
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _lookup(self, key, count_miss=True):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] < now:
+                del self._entries[key]
+                self._bytes -= entry[1]
+                entry = None
+
+            if entry is None:
+                self.misses += count_miss
+                return False, None
+
+            value = entry[0]
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def _store(self, key, value, ttl_seconds):
+        size = _approximate_size(value)
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+
+            # Drop expired entries first, then least recently used ones
+            for stale_key in [k for k, (_, _, expires) in self._entries.items() if expires < now]:
+                self._bytes -= self._entries.pop(stale_key)[1]
+
+            while self._entries and (len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes):
+                self._bytes -= self._entries.popitem(last=False)[1][1]
+
+            if size <= self.max_bytes:
+                self._entries[key] = (value, size, now + ttl_seconds)
+                self._bytes += size
+
+def _approximate_size(value):
+    """Estimate the memory held by a cached telemetry value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, (np.ndarray, pd.Index)):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(_approximate_size(v) for v in value.values())
+    return 64
+
+def _freeze(value):
+    """Make cached arrays read-only so a shared result cannot be modified in place."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    return value
+
+def _copy_result(value):
+    """Give each caller its own container so shared results are never mutated."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    return value
+
+# Shared by every session of the Streamlit server process
+TELEMETRY_CACHE = TelemetryCache()
+
+def cached_telemetry(bucket_seconds, cache=TELEMETRY_CACHE):
+    """
+    Memoize a telemetry query per time bucket in the shared cache.
+
+    The cache key is the function name, its bound arguments and the index of
+    the current time bucket. Calls with an explicit seed are not cached, since
+    they are reproducible on their own and often unique.
+
+    Args:
+        bucket_seconds (float | callable): Bucket width in seconds, or a function of
+            the bound arguments returning it (e.g. the query's sampling interval)
+        cache (TelemetryCache): Cache to store results in
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if bound.arguments.get('seed') is not None:
+                return func(*args, **kwargs)
+
+            width = bucket_seconds(bound.arguments) if callable(bucket_seconds) else bucket_seconds
+            bucket = int(time.time() // width)
+            key = (func.__name__, tuple(bound.arguments.items()), bucket)
+
+            # An entry is never hit again once its bucket has passed
+            value = cache.get_or_compute(key, lambda: _freeze(func(*args, **kwargs)), ttl_seconds=width)
+            return _copy_result(value)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,145 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from utils.random_source import as_random_source
+from utils.ring_buffer import RingBuffer
+from utils.rollups import DEFAULT_CHART_WIDTH, RollupSet
+from utils.training_sample import StreamReservoir
+
+def hours_of_day(timestamps):
+    """
+    Get the wall-clock hour of day (hour + minute / 60) of datetime64 timestamps.
+
+    Args:
+        timestamps (np.ndarray): datetime64 array
+
+    Returns:
+        np.ndarray: Fractional hours of day
+    """
+    minutes_of_day = (timestamps - timestamps.astype('datetime64[D]')).astype('timedelta64[m]').astype(np.int64)
+    return minutes_of_day / 60
+
+class TelemetryWindow:
+    """
+    Rolling history window of one system, refreshed incrementally.
+
+    The window keeps the last `hours` of samples on a fixed interval grid in a
+    RingBuffer. Each refresh generates only the samples that became due since
+    the previous refresh and evicts the oldest ones, so its cost scales with
+    the number of new samples rather than with the window length. New samples
+    are also folded into the window's rollups and its training reservoir,
+    which anomaly models of the window's data are fitted on.
+    """
+
+    def __init__(self, generate, hours=24, interval_minutes=15, anomaly_count=0, seed=None):
+        """
+        Args:
+            generate (callable): Function (hours_of_day, anomaly_count, seed) -> dict of columns
+            hours (int): Length of the window in hours
+            interval_minutes (int): Interval between samples in minutes
+            anomaly_count (int): Expected number of anomalies over a full window
+            seed (int | RandomSource | None): Seed for the window's random streams
+        """
+        self.generate = generate
+        self.capacity = int((hours * 60) / interval_minutes)
+        self.step = np.timedelta64(int(interval_minutes * 60 * 1_000_000), 'us')
+        self.anomaly_count = anomaly_count
+        self._source = as_random_source(seed)
+        self._anomaly_rng = self._source.child(0).generator()
+        self._chunks = 0
+        self._buffer = None
+        self._last = None
+        self._lock = threading.Lock()
+        self.rollups = None
+        self.reservoir = StreamReservoir()
+
+    def refresh(self, now=None):
+        """
+        Append the samples due since the last refresh.
+
+        Args:
+            now (datetime): Current time, defaults to datetime.now()
+
+        Returns:
+            int: Number of samples appended
+        """
+        now = np.datetime64(now or datetime.now(), 'us')
+        step = int(self.step.astype(np.int64))
+
+        with self._lock:
+            # Samples sit on multiples of the interval
+            end = np.datetime64(int(now.astype(np.int64)) // step * step, 'us')
+            first = end - (self.capacity - 1) * self.step
+            if self._last is not None:
+                first = max(first, self._last + self.step)
+
+            count = int((end - first) // self.step) + 1
+            if count <= 0 or self.capacity == 0:
+                return 0
+
+            timestamps = first + np.arange(count) * self.step
+
+            # A fresh window gets the full anomaly budget, refreshes a proportional share
+            if self._last is None:
+                anomaly_count = min(self.anomaly_count, count)
+            else:
+                anomaly_count = self._anomaly_rng.binomial(count, self.anomaly_count / self.capacity)
+
+            self._chunks += 1
+            columns = self.generate(hours_of_day(timestamps), anomaly_count, self._source.child(self._chunks))
+            columns = {'timestamp': timestamps, **columns}
+
+            if self._buffer is None:
+                self._buffer = RingBuffer(self.capacity, {name: values.dtype for name, values in columns.items()})
+                interval_seconds = self.step.astype('timedelta64[s]').astype(np.int64)
+                self.rollups = RollupSet([name for name in columns if name != 'timestamp'],
+                                         span_seconds=self.capacity * interval_seconds, interval_seconds=interval_seconds)
+            self._buffer.append(columns)
+            self.rollups.ingest(timestamps, columns)
+            self.reservoir.add(timestamps, columns)
+            self._last = end
+
+            return count
+
+    def rollup(self, width_px=DEFAULT_CHART_WIDTH):
+        """
+        Read the window's rollups at the tier fitting a chart width.
+
+        Args:
+            width_px (int): Chart width in points
+
+        Returns:
+            pd.DataFrame: Rollup rows covering the window (see RollupSet.query)
+        """
+        with self._lock:
+            start = self._last - (self.capacity - 1) * self.step
+            return self.rollups.query(start, self._last, width_px)
+
+    def view(self):
+        """
+        Get zero-copy, read-only views of the window, oldest sample first.
+
+        Returns:
+            dict: Column name to array view, including 'timestamp'
+        """
+        with self._lock:
+            if self._buffer is None:
+                return {}
+            return self._buffer.view()
+
+    def snapshot(self):
+        """
+        Get a copy of the window, oldest sample first.
+
+        The columns are copied while the window is locked, so they stay
+        consistent with each other and are unaffected by later refreshes.
+
+        Returns:
+            dict: Column name to array, including 'timestamp'
+        """
+        with self._lock:
+            if self._buffer is None:
+                return {}
+            return {name: view.copy() for name, view in self._buffer.view().items()}
@@ -0,0 +1,179 @@
+import threading
+
+import numpy as np
+
+# Rows a model is trained on at most, however long the analyzed horizon
+DEFAULT_SAMPLE_SIZE = 8192
+
+class StratifiedReservoir:
+    """
+    Bounded, uniformly random sample of a stream of rows, stratified by time of day.
+
+    Each time-of-day bucket keeps its own reservoir (Algorithm R) of an equal
+    share of the capacity, so every part of the daily cycle is represented
+    however the stream is distributed over the day. Rows are added in batches:
+    the reservoir positions of a whole batch are drawn in one vectorized pass,
+    and memory stays fixed at the capacity no matter how many rows are seen.
+    """
+
+    def __init__(self, n_features, capacity=DEFAULT_SAMPLE_SIZE, buckets=24, random_state=None):
+        """
+        Args:
+            n_features (int): Columns per row
+            capacity (int): Maximum rows kept over all buckets
+            buckets (int): Time-of-day buckets, e.g. 24 for hourly strata
+            random_state (int): Seed of the sampling
+        """
+        self.buckets = buckets
+        self.capacity = capacity
+        self.bucket_capacity = max(1, capacity // buckets)
+        self.rows = np.empty((buckets, self.bucket_capacity, n_features))
+        self.seen = np.zeros(buckets, dtype=np.int64)
+        self._rng = np.random.default_rng(random_state)
+
+    def bucket_of(self, timestamps):
+        """Time-of-day bucket of each timestamp."""
+        timestamps = np.asarray(timestamps, dtype='datetime64[s]')
+        seconds = (timestamps - timestamps.astype('datetime64[D]')).astype(np.int64)
+        return seconds * self.buckets // 86400
+
+    def add(self, values, timestamps=None):
+        """
+        Offer a batch of rows to the reservoir.
+
+        Args:
+            values (np.ndarray): (rows, features) values, in stream order
+            timestamps (array-like): Timestamp per row; None puts every row in the first bucket
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        buckets = np.zeros(len(values), dtype=np.int64) if timestamps is None else self.bucket_of(timestamps)
+
+        order = np.argsort(buckets, kind='stable')
+        starts = np.flatnonzero(np.r_[True, np.diff(buckets[order]) != 0])
+        stops = np.r_[starts[1:], len(order)]
+        for start, stop in zip(starts, stops):
+            rows = order[start:stop]
+            bucket = buckets[rows[0]]
+            # Stream position of each row in its bucket; row i survives at a random slot below i
+            position = self.seen[bucket] + np.arange(len(rows))
+            slot = np.where(position < self.bucket_capacity, position, self._rng.integers(0, position + 1))
+            kept = slot < self.bucket_capacity
+            # Later rows win slots drawn more than once, as in the sequential algorithm
+            self.rows[bucket, slot[kept]] = values[rows[kept]]
+            self.seen[bucket] += len(rows)
+
+    def __len__(self):
+        return int(np.minimum(self.seen, self.bucket_capacity).sum())
+
+    def sample(self):
+        """
+        Get the sampled rows.
+
+        Returns:
+            np.ndarray: (rows, features) sampled rows, grouped by bucket
+        """
+        filled = np.minimum(self.seen, self.bucket_capacity)
+        return np.concatenate([self.rows[bucket, :count] for bucket, count in enumerate(filled)])
+
+def training_sample(values, timestamps=None, size=DEFAULT_SAMPLE_SIZE, buckets=24, random_state=42):
+    """
+    Draw a time-of-day stratified training sample from a block of rows.
+
+    Args:
+        values (np.ndarray): (rows, features) values
+        timestamps (array-like): Timestamp per row; None samples uniformly
+        size (int): Maximum rows in the sample
+        buckets (int): Time-of-day buckets
+        random_state (int): Seed of the sampling
+
+    Returns:
+        np.ndarray: The rows themselves if there are no more than size, else a sample of them
+    """
+    values = np.asarray(values)
+    if len(values) <= size:
+        return values
+    reservoir = StratifiedReservoir(values.shape[1], size, buckets if timestamps is not None else 1, random_state)
+    reservoir.add(values, timestamps)
+    return reservoir.sample()
+
+class StreamReservoir:
+    """
+    Training reservoir of one stream of records, fed as the records arrive.
+
+    The owner of a stream (e.g. a TelemetryWindow) adds each new batch, so
+    fitting a model on that stream's data reads a ready sample instead of
+    sampling the whole history again. The reservoir keeps a
+    StratifiedReservoir over all numeric columns of the records and the time
+    range it has seen; rows not newer than the newest one added are skipped.
+    """
+
+    def __init__(self, capacity=DEFAULT_SAMPLE_SIZE, buckets=24, random_state=42):
+        """
+        Args:
+            capacity (int): Maximum rows kept
+            buckets (int): Time-of-day buckets
+            random_state (int): Seed of the sampling
+        """
+        self.capacity = capacity
+        self.buckets = buckets
+        self.random_state = random_state
+        self.columns = None
+        self.first = None
+        self.newest = None
+        self._reservoir = None
+        self._lock = threading.Lock()
+
+    def add(self, timestamps, columns):
+        """
+        Offer a batch of records.
+
+        Args:
+            timestamps (array-like): Record timestamps, in ascending order
+            columns (dict): Column name to array of values; non-numeric columns are ignored
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[us]')
+        with self._lock:
+            if self._reservoir is None:
+                self.columns = [name for name, values in columns.items()
+                                if np.asarray(values).dtype.kind in 'biuf' and len(values) == len(timestamps)]
+                self._reservoir = StratifiedReservoir(len(self.columns), self.capacity, self.buckets, self.random_state)
+
+            fresh = slice(None) if self.newest is None else slice(np.searchsorted(timestamps, self.newest, side='right'), None)
+            timestamps = timestamps[fresh]
+            if len(timestamps) == 0:
+                return
+            values = np.column_stack([
+                np.asarray(columns[name], dtype=np.float64)[fresh] if name in columns else np.full(len(timestamps), np.nan)
+                for name in self.columns
+            ])
+            self._reservoir.add(values, timestamps)
+            if self.first is None:
+                self.first = timestamps[0]
+            self.newest = timestamps[-1]
+
+    def sample(self, columns, timestamps, size=DEFAULT_SAMPLE_SIZE):
+        """
+        Get sampled records, if the reservoir has seen a time range.
+
+        Args:
+            columns (list): Columns to return
+            timestamps (array-like): Timestamps of the data to be modelled, in ascending order
+            size (int): Maximum rows returned
+
+        Returns:
+            np.ndarray: (rows, columns) complete sampled rows, or None if the reservoir does not hold
+                every column or has not seen the whole range of timestamps
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[us]')
+        with self._lock:
+            if self._reservoir is None or len(timestamps) == 0:
+                return None
+            if not set(columns) <= set(self.columns) or timestamps[0] < self.first or timestamps[-1] > self.newest:
+                return None
+            rows = self._reservoir.sample()[:, [self.columns.index(column) for column in columns]]
+        rows = rows[np.isfinite(rows).all(axis=1)]
+        if len(rows) > size:
+            rows = np.random.default_rng(self.random_state).choice(rows, size, replace=False, axis=0)
+        return rows
@@ -0,0 +1,31 @@
+import plotly.graph_objects as go
+
+from utils.anomaly_detection import analyze_health_timeline
+
+def create_health_timeline_chart(data, system, window='1h', reservoir=None):
+    """
+    Create a heat strip of a system's health, one cell per time window.
+
+    Args:
+        data (pd.DataFrame): System data with a 'timestamp' column, sorted by time
+        system (str): System name ('electricity', 'water', 'sewage', 'banking')
+        window (str): Cell length as a pandas frequency, e.g. '1h' or '1D'
+        reservoir (StreamReservoir): Training reservoir of the stream the data was read from
+
+    Returns:
+        go.Figure: Plotly figure object
+    """
+    health_timeline = analyze_health_timeline(data, system, window, reservoir)
+
+    fig = go.Figure(go.Heatmap(
+        x=health_timeline['timestamp'],
+        y=['Health'],
+        z=[health_timeline['health_score']],
+        customdata=[health_timeline['status']],
+        hovertemplate='%{x}<br>Health Score: %{z:.1f}<br>%{customdata}<extra></extra>',
+        colorscale='RdYlGn',
+        zmin=0,
+        zmax=100
+    ))
+    fig.update_layout(height=180, margin=dict(t=20, b=20))
+    return fig